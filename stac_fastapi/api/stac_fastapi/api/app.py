@@ -1,6 +1,6 @@
 """Fastapi app creation."""
 
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
 
 import attr
 from brotli_asgi import BrotliMiddleware
@@ -12,28 +12,48 @@ from stac_pydantic import Catalog, Collection, Item, ItemCollection
 from stac_pydantic.api import ConformanceClasses, LandingPage
 from stac_pydantic.api.collections import Collections
 from stac_pydantic.version import STAC_VERSION
+from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 
+from stac_fastapi.api.conditional import PrerenderedResponse, conditional_response
 from stac_fastapi.api.errors import DEFAULT_STATUS_CODES, add_exception_handlers
 from stac_fastapi.api.middleware import CORSMiddleware, ProxyHeaderMiddleware
 from stac_fastapi.api.models import (
     CatalogUri,
     CollectionUri,
+    CountedItemCollection,
     EmptyRequest,
     GeoJSONResponse,
     ItemCollectionUri,
     ItemUri,
     create_request_model,
 )
-from stac_fastapi.api.openapi import update_openapi
-from stac_fastapi.api.routes import Scope, add_route_dependencies, create_async_endpoint
+from stac_fastapi.api.openapi import prerender_openapi, update_openapi
+from stac_fastapi.api.response_cache import ResponseCache, ResponseCacheMiddleware
+from stac_fastapi.api.routes import (
+    Scope,
+    add_route_dependencies,
+    create_async_endpoint,
+    project_fields,
+    resolve_catalog_path,
+    resolve_count_mode,
+)
+from stac_fastapi.api.singleflight import SingleFlight, single_flight
+from stac_fastapi.api.streaming import feature_sequence_negotiation
+from stac_fastapi.api.validation import (
+    ValidationStats,
+    sampled_validation,
+    sampled_validator,
+)
 
 # TODO: make this module not depend on `stac_fastapi.extensions`
 from stac_fastapi.extensions.core import (
     CollectionSearchExtension,
+    CountExtension,
     FieldsExtension,
     TokenPaginationExtension,
 )
+from stac_fastapi.types.cache import TTLCache
 from stac_fastapi.types.config import ApiSettings, Settings
 from stac_fastapi.types.core import AsyncBaseCoreClient, BaseCoreClient
 from stac_fastapi.types.extension import ApiExtension
@@ -45,7 +65,7 @@ from stac_fastapi.types.search import (  # only includes search query fields not
     BaseSearchPostRequest,
     CatalogSearchPostRequest,
 )
-from stac_fastapi.types.stac import Catalogs
+from stac_fastapi.types.stac import Catalogs, Conformance
 
 
 @attr.s
@@ -78,6 +98,15 @@ class StacApi:
             specified routes. This is useful
             for applying custom auth requirements to routes defined elsewhere in
             the application.
+        response_cache:
+            Optional response cache, served by `ResponseCacheMiddleware` for the
+            routes covered by its policies and purged by transactions.
+        response_validation:
+            Counters of the responses validated when
+            `settings.response_validation_sample_rate` is set.
+        single_flight:
+            Coalescing of concurrent identical searches, with its counters in
+            `single_flight.stats`, when `settings.search_single_flight` is set.
     """
 
     settings: ApiSettings = attr.ib()
@@ -137,6 +166,12 @@ class StacApi:
         )
     )
     route_dependencies: List[Tuple[List[Scope], List[Depends]]] = attr.ib(default=[])
+    response_cache: Optional[ResponseCache] = attr.ib(default=None)
+    response_validation: ValidationStats = attr.ib(factory=ValidationStats, init=False)
+    single_flight: SingleFlight = attr.ib(factory=SingleFlight, init=False)
+    _conformance_response: Optional[PrerenderedResponse] = attr.ib(
+        default=None, init=False
+    )
 
     def get_extension(self, extension: Type[ApiExtension]) -> Optional[ApiExtension]:
         """Get an extension.
@@ -168,7 +203,9 @@ class StacApi:
             response_model_exclude_unset=False,
             response_model_exclude_none=True,
             methods=["GET"],
-            endpoint=create_async_endpoint(self.client.landing_page, EmptyRequest),
+            endpoint=create_async_endpoint(
+                self._validated(self.client.landing_page, LandingPage), EmptyRequest
+            ),
         )
 
     def register_conformance_classes(self):
@@ -187,9 +224,40 @@ class StacApi:
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["GET"],
-            endpoint=create_async_endpoint(self.client.conformance, EmptyRequest),
+            endpoint=(
+                create_async_endpoint(
+                    self._validated(self.client.conformance, ConformanceClasses),
+                    EmptyRequest,
+                )
+                if self._client_overrides_conformance()
+                else self._prerendered_conformance
+            ),
+        )
+
+    def _client_overrides_conformance(self) -> bool:
+        """Check whether the client customizes the `/conformance` response."""
+        conformance = getattr(type(self.client), "conformance", None)
+        return conformance not in (
+            BaseCoreClient.conformance,
+            AsyncBaseCoreClient.conformance,
         )
 
+    async def _prerendered_conformance(self, request: Request) -> Response:
+        """Serve the conformance classes rendered at startup."""
+        return self._conformance_response.response(request)
+
+    def freeze_conformance_classes(self) -> None:
+        """Compute the conformance classes and prerender the `/conformance` body.
+
+        Called once all extensions are registered. Must be called again if
+        extensions are added to the application afterwards.
+        """
+        conformance_classes = self.client.freeze_conformance_classes()
+        if not self._client_overrides_conformance():
+            self._conformance_response = PrerenderedResponse.from_response(
+                self.response_class(Conformance(conformsTo=conformance_classes))
+            )
+
     def register_get_item(self):
         """Register get item endpoint (GET /collections/{collection_id}/items/{item_id}).
 
@@ -204,7 +272,111 @@ class StacApi:
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["GET"],
-            endpoint=create_async_endpoint(self.client.get_item, ItemUri),
+            endpoint=create_async_endpoint(
+                self._conditional(
+                    self._resolved(self.client.get_item),
+                    GeoJSONResponse,
+                    Item,
+                ),
+                ItemUri,
+            ),
+        )
+
+    def _conditional(
+        self, func: Callable, response_class: Type[Response], model: Type[BaseModel]
+    ) -> Callable:
+        """Answer conditional requests (`If-None-Match`, `If-Modified-Since`).
+
+        Bodies sent are sample-validated as by `_validated`, once unwrapped from
+        their `Versioned`.
+        """
+        if self.settings.enable_response_models:
+            return conditional_response(func, response_class, model)
+        validate = None
+        sample_rate = self.settings.response_validation_sample_rate
+        if sample_rate > 0:
+            validate = sampled_validator(
+                model,
+                sample_rate,
+                self.response_validation,
+                getattr(func, "__name__", str(func)),
+            )
+        return conditional_response(func, response_class, validate=validate)
+
+    def _resolved(self, func: Callable) -> Callable:
+        """Resolve catalog paths with the client's `catalog_resolver`, if any."""
+        resolver = getattr(self.client, "catalog_resolver", None)
+        if resolver is None:
+            return func
+        return resolve_catalog_path(func, resolver)
+
+    def _projected(self, func: Callable) -> Callable:
+        """Pass the fields projection of searches to a search client method.
+
+        Only applies when the fields extension is registered.
+        """
+        fields_ext = self.get_extension(FieldsExtension)
+        if fields_ext is None:
+            return func
+        return project_fields(func, fields_ext.default_includes)
+
+    def _counted(self, func: Callable) -> Callable:
+        """Pass the count mode of searches to a search client method.
+
+        Only applies when the count extension is registered.
+        """
+        count_ext = self.get_extension(CountExtension)
+        if count_ext is None:
+            return func
+        return resolve_count_mode(func, count_ext.default_mode)
+
+    def _extended(self, func: Callable) -> Callable:
+        """Pass the keywords of the registered search extensions to a search client
+        method: the fields `projection` and the `count_mode`.
+        """
+        return self._counted(self._projected(func))
+
+    def _validated(self, func: Callable, model: Optional[Type[BaseModel]]) -> Callable:
+        """Validate a sample of the responses of a client method against `model`.
+
+        Only applies when response models are disabled and
+        `response_validation_sample_rate` is set.
+        """
+        sample_rate = self.settings.response_validation_sample_rate
+        if model is None or self.settings.enable_response_models or sample_rate <= 0:
+            return func
+        return sampled_validation(func, model, sample_rate, self.response_validation)
+
+    def _search_model(self) -> Optional[Type[BaseModel]]:
+        """Return the model of search responses, None when the fields extension
+        is registered, as projected items do not follow any model.
+        """
+        if self.get_extension(FieldsExtension):
+            return None
+        if self.get_extension(CountExtension):
+            return CountedItemCollection
+        return ItemCollection
+
+    def _search_endpoint(
+        self, func: Callable, model: Optional[Type[BaseModel]]
+    ) -> Callable:
+        """Wrap a search client method with response content negotiation.
+
+        Concurrent identical searches are coalesced when
+        `search_single_flight` is set.
+        """
+        func = feature_sequence_negotiation(
+            func,
+            auto_paginate=self.settings.feature_sequence_auto_paginate,
+            max_pages=self.settings.feature_sequence_max_pages,
+        )
+        if not self.settings.search_single_flight:
+            return func
+        return single_flight(
+            func,
+            self.single_flight,
+            GeoJSONResponse,
+            model if self.settings.enable_response_models else None,
         )
 
     def register_post_global_search(self):
@@ -213,21 +385,24 @@ class StacApi:
         Returns:
             None
         """
-        fields_ext = self.get_extension(FieldsExtension)
+        model = self._search_model()
         self.router.add_api_route(
             name="Search",
             path="/search",
-            response_model=(
-                (ItemCollection if not fields_ext else None)
-                if self.settings.enable_response_models
-                else None
-            ),
+            response_model=model if self.settings.enable_response_models else None,
             response_class=GeoJSONResponse,
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["POST"],
             endpoint=create_async_endpoint(
-                self.client.post_global_search, self.search_post_request_model
+                self._search_endpoint(
+                    self._validated(
+                        self._extended(self.client.post_global_search),
+                        model,
+                    ),
+                    model,
+                ),
+                self.search_post_request_model,
             ),
         )
 
@@ -237,21 +412,24 @@ class StacApi:
         Returns:
             None
         """
-        fields_ext = self.get_extension(FieldsExtension)
+        model = self._search_model()
         self.router.add_api_route(
             name="Search",
             path="/search",
-            response_model=(
-                (ItemCollection if not fields_ext else None)
-                if self.settings.enable_response_models
-                else None
-            ),
+            response_model=model if self.settings.enable_response_models else None,
             response_class=GeoJSONResponse,
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["GET"],
             endpoint=create_async_endpoint(
-                self.client.get_global_search, self.search_get_request_model
+                self._search_endpoint(
+                    self._validated(
+                        self._extended(self.client.get_global_search),
+                        model,
+                    ),
+                    model,
+                ),
+                self.search_get_request_model,
             ),
         )
 
@@ -263,21 +441,24 @@ class StacApi:
         Returns:
             None
         """
-        fields_ext = self.get_extension(FieldsExtension)
+        model = self._search_model()
         self.router.add_api_route(
             name="Catalog Item Search",
             path="/catalogs/{catalog_path:path}/search",
-            response_model=(
-                (ItemCollection if not fields_ext else None)
-                if self.settings.enable_response_models
-                else None
-            ),
+            response_model=model if self.settings.enable_response_models else None,
             response_class=GeoJSONResponse,
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["POST"],
             endpoint=create_async_endpoint(
-                self.client.post_search, self.search_catalog_post_request_model
+                self._search_endpoint(
+                    self._validated(
+                        self._resolved(self._extended(self.client.post_search)),
+                        model,
+                    ),
+                    model,
+                ),
+                self.search_catalog_post_request_model,
             ),
         )
 
@@ -289,21 +470,24 @@ class StacApi:
         Returns:
             None
         """
-        fields_ext = self.get_extension(FieldsExtension)
+        model = self._search_model()
         self.router.add_api_route(
             name="Catalog Item Search",
             path="/catalogs/{catalog_path:path}/search",
-            response_model=(
-                (ItemCollection if not fields_ext else None)
-                if self.settings.enable_response_models
-                else None
-            ),
+            response_model=model if self.settings.enable_response_models else None,
             response_class=GeoJSONResponse,
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["GET"],
             endpoint=create_async_endpoint(
-                self.client.get_search, self.search_catalog_get_request_model
+                self._search_endpoint(
+                    self._validated(
+                        self._resolved(self._extended(self.client.get_search)),
+                        model,
+                    ),
+                    model,
+                ),
+                self.search_catalog_get_request_model,
             ),
         )
 
@@ -328,7 +512,8 @@ class StacApi:
                 response_model_exclude_none=True,
                 methods=["GET"],
                 endpoint=create_async_endpoint(
-                    self.client.all_collections, EmptyRequest
+                    self._validated(self.client.all_collections, Collections),
+                    EmptyRequest,
                 ),
             )
 
@@ -346,7 +531,10 @@ class StacApi:
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["GET"],
-            endpoint=create_async_endpoint(self.client.all_catalogs, CatalogUri),
+            endpoint=create_async_endpoint(
+                self._validated(self._resolved(self.client.all_catalogs), Catalogs),
+                CatalogUri,
+            ),
         )
 
     def register_get_all_catalogs(self):
@@ -363,7 +551,9 @@ class StacApi:
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["GET"],
-            endpoint=create_async_endpoint(self.client.all_catalogs, EmptyRequest),
+            endpoint=create_async_endpoint(
+                self._validated(self.client.all_catalogs, Catalogs), EmptyRequest
+            ),
         )
 
     def register_get_catalog_collections(self):
@@ -383,7 +573,10 @@ class StacApi:
             response_model_exclude_none=True,
             methods=["GET"],
             endpoint=create_async_endpoint(
-                self.client.get_catalog_collections, CatalogUri
+                self._validated(
+                    self._resolved(self.client.get_catalog_collections), Collections
+                ),
+                CatalogUri,
             ),
         )
 
@@ -403,7 +596,14 @@ class StacApi:
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["GET"],
-            endpoint=create_async_endpoint(self.client.get_collection, CollectionUri),
+            endpoint=create_async_endpoint(
+                self._conditional(
+                    self._resolved(self.client.get_collection),
+                    self.response_class,
+                    Collection,
+                ),
+                CollectionUri,
+            ),
         )
 
     def register_get_catalog(self):
@@ -420,7 +620,14 @@ class StacApi:
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["GET"],
-            endpoint=create_async_endpoint(self.client.get_catalog, CatalogUri),
+            endpoint=create_async_endpoint(
+                self._conditional(
+                    self._resolved(self.client.get_catalog),
+                    self.response_class,
+                    Catalog,
+                ),
+                CatalogUri,
+            ),
         )
 
     def register_get_item_collection(self):
@@ -449,7 +656,12 @@ class StacApi:
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["GET"],
-            endpoint=create_async_endpoint(self.client.item_collection, request_model),
+            endpoint=create_async_endpoint(
+                self._validated(
+                    self._resolved(self.client.item_collection), ItemCollection
+                ),
+                request_model,
+            ),
         )
 
     def register_core(self):
@@ -500,6 +712,11 @@ class StacApi:
         self.app.openapi_schema = openapi_schema
         return self.app.openapi_schema
 
+    def prerender_openapi(self) -> None:
+        """Generate and serialize the OpenAPI document served at `openapi_url`."""
+        if self.app.openapi_url:
+            prerender_openapi(self.app)
+
     def add_health_check(self):
         """Add a health check."""
         mgmt_router = APIRouter(prefix=self.app.state.router_prefix)
@@ -541,6 +758,10 @@ class StacApi:
         self.client.stac_version = self.stac_version
         self.client.title = self.title
         self.client.description = self.description
+        if getattr(self.client, "landing_page_cache", None) is None:
+            self.client.landing_page_cache = TTLCache(
+                ttl=self.settings.landing_page_cache_ttl
+            )
 
         fields_ext = self.get_extension(FieldsExtension)
         if fields_ext:
@@ -548,6 +769,11 @@ class StacApi:
 
         Settings.set(self.settings)
         self.app.state.settings = self.settings
+        self.app.state.landing_page_cache = self.client.landing_page_cache
+        self.app.state.response_validation = self.response_validation
+        self.app.state.single_flight = self.single_flight
+        self.app.state.response_cache = self.response_cache
+        self.app.state.catalog_resolver = getattr(self.client, "catalog_resolver", None)
 
         # Register core STAC endpoints
         self.register_core()
@@ -561,16 +787,23 @@ class StacApi:
         for ext in self.extensions:
             ext.register(self.app)
 
+        # conformance classes only depend on the registered extensions
+        self.freeze_conformance_classes()
+
         # add health check
         self.add_health_check()
 
         # register exception handlers
         add_exception_handlers(self.app, status_codes=self.exceptions)
 
-        # customize openapi
+        # customize openapi, rendered at startup rather than on the first request
         self.app.openapi = self.customize_openapi
+        self.app.add_event_handler("startup", self.prerender_openapi)
 
-        # add middlewares
+        # add middlewares, the response cache being the innermost one so that it
+        # stores uncompressed bodies and sees the host rewritten for proxies
+        if self.response_cache is not None:
+            self.app.add_middleware(ResponseCacheMiddleware, cache=self.response_cache)
         for middleware in self.middlewares:
             self.app.add_middleware(middleware)
 
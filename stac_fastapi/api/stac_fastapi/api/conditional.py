@@ -0,0 +1,211 @@
+"""Conditional request (ETag) helpers."""
+
+import hashlib
+import inspect
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+import attr
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.status import HTTP_304_NOT_MODIFIED
+
+from stac_fastapi.types.conditional import Versioned
+
+
+def make_etag(body: bytes) -> str:
+    """Return a strong, quoted entity tag for a response body."""
+    return '"{}"'.format(hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's `If-None-Match` header against `etag`.
+
+    Uses the weak comparison function, as required for `If-None-Match`
+    (https://www.rfc-editor.org/rfc/rfc9110#section-13.1.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def quote_etag(etag: str) -> str:
+    """Quote an entity tag, unless it already is."""
+    if etag.startswith('"') or etag.startswith('W/"'):
+        return etag
+    return f'"{etag}"'
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def not_modified_since(request: Request, last_modified: datetime) -> bool:
+    """Check the request's `If-Modified-Since` header against `last_modified`.
+
+    The header is ignored when `If-None-Match` is also sent
+    (https://www.rfc-editor.org/rfc/rfc9110#section-13.1.3).
+    """
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or "if-none-match" in request.headers:
+        return False
+    try:
+        since = _utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have a resolution of one second
+    return _utc(last_modified).replace(microsecond=0) <= since
+
+
+def not_modified(
+    etag: Optional[str], headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Create an empty `304 Not Modified` response."""
+    headers = dict(headers or {})
+    if etag is not None:
+        headers["ETag"] = etag
+    return Response(status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+@attr.s(frozen=True)
+class PrerenderedResponse:
+    """A response body serialized once and served as-is on every request.
+
+    Attributes:
+        body: the serialized response body.
+        media_type: value of the `Content-Type` header.
+        etag: strong entity tag of `body`.
+    """
+
+    body: bytes = attr.ib()
+    media_type: str = attr.ib()
+    etag: str = attr.ib(
+        default=attr.Factory(lambda self: make_etag(self.body), takes_self=True)
+    )
+
+    @classmethod
+    def from_response(cls, response: Response) -> "PrerenderedResponse":
+        """Capture the rendered body and media type of a Starlette response."""
+        return cls(body=response.body, media_type=response.media_type)
+
+    def response(self, request: Request) -> Response:
+        """Return the prerendered body, or `304 Not Modified` if the client has it."""
+        if etag_matches(request, self.etag):
+            return not_modified(self.etag)
+        return Response(
+            content=self.body, media_type=self.media_type, headers={"ETag": self.etag}
+        )
+
+
+def _version_headers(versioned: Versioned) -> Tuple[Optional[str], Dict[str, str]]:
+    """Return the quoted entity tag and the validator headers of a body."""
+    headers = {}
+    etag = quote_etag(versioned.etag) if versioned.etag is not None else None
+    if etag is not None:
+        headers["ETag"] = etag
+    if versioned.last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            _utc(versioned.last_modified), usegmt=True
+        )
+    return etag, headers
+
+
+def _versioned_not_modified(
+    request: Request, versioned: Versioned, etag: Optional[str]
+) -> bool:
+    if etag is not None and etag_matches(request, etag):
+        return True
+    return versioned.last_modified is not None and not_modified_since(
+        request, versioned.last_modified
+    )
+
+
+async def _get_body(versioned: Versioned) -> Any:
+    if not callable(versioned.body):
+        return versioned.body
+    if inspect.iscoroutinefunction(versioned.body):
+        return await versioned.body()
+    return await run_in_threadpool(versioned.body)
+
+
+def render_response(
+    body: Any,
+    response_class: Type[Response],
+    response_model: Optional[Type[BaseModel]],
+) -> Response:
+    """Serialize a client response body, as FastAPI does with or without
+    `response_model`."""
+    if response_model is not None:
+        body = jsonable_encoder(
+            response_model.validate(body), exclude_unset=True, exclude_none=True
+        )
+    else:
+        body = jsonable_encoder(body)
+    return response_class(body)
+
+
+def conditional_response(
+    func: Callable,
+    response_class: Type[Response],
+    response_model: Optional[Type[BaseModel]] = None,
+    validate: Optional[Callable[[Any], Awaitable[None]]] = None,
+) -> Callable:
+    """Wrap a client method to answer conditional `GET` requests.
+
+    Responses get an `ETag`, and a `Last-Modified` header when the client returns
+    a `Versioned` body with `last_modified`. If the client supplies the version,
+    `304 Not Modified` is returned before the body is serialized; otherwise the
+    strong entity tag of the serialized body is compared.
+
+    With a `response_model`, bodies are validated and serialized with it, as
+    FastAPI does for the route's response model. Otherwise, bodies sent are
+    passed to `validate`, e.g. a `sampled_validator`, once unwrapped from their
+    `Versioned`.
+    """
+    if inspect.iscoroutinefunction(func):
+        call = func
+    else:
+
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(func, *args, **kwargs)
+
+    async def _wrapper(*args, **kwargs):
+        request: Request = kwargs["request"]
+        resp = await call(*args, **kwargs)
+        if resp is None or isinstance(resp, Response):
+            return resp
+
+        etag, headers = None, {}
+        if isinstance(resp, Versioned):
+            etag, headers = _version_headers(resp)
+            if _versioned_not_modified(request, resp, etag):
+                return not_modified(etag, headers)
+            resp = await _get_body(resp)
+
+        if validate is not None:
+            await validate(resp)
+        response = render_response(resp, response_class, response_model)
+        if etag is None:
+            etag = make_etag(response.body)
+            if etag_matches(request, etag):
+                return not_modified(etag, headers)
+        response.headers.update({**headers, "ETag": etag})
+        return response
+
+    return _wrapper
@@ -1,13 +1,26 @@
 """Api middleware."""
 
-import re
+import functools
 import typing
 from http.client import HTTP_PORT, HTTPS_PORT
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from starlette.middleware.cors import CORSMiddleware as _CORSMiddleware
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+# Headers read by ProxyHeaderMiddleware
+FORWARDED_HEADERS = frozenset(
+    (
+        b"host",
+        b"forwarded",
+        b"x-forwarded-host",
+        b"x-forwarded-proto",
+        b"x-forwarded-port",
+    )
+)
+# Marks a header sent more than once, which is ignored as ambiguous
+_DUPLICATE = b""
+
 
 class CORSMiddleware(_CORSMiddleware):
     """Subclass of Starlette's standard CORS middleware with default values set to those
@@ -50,6 +63,9 @@ class ProxyHeaderMiddleware:
     Prioritise standard Forwarded header, look for non-standard X-Forwarded-* if missing.
     Default to what can be derived from the URL if no headers provided. Middleware updates
     the host header that is interpreted by starlette when deriving Request.base_url.
+
+    Request headers are scanned once per request, and parsed `Forwarded` values are
+    cached per distinct raw header value.
     """
 
     def __init__(self, app: ASGIApp):
@@ -59,7 +75,8 @@ class ProxyHeaderMiddleware:
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Call from stac-fastapi framework."""
         if scope["type"] == "http":
-            proto, domain, port = self._get_forwarded_url_parts(scope)
+            headers = _scan_headers(scope["headers"])
+            proto, domain, port = self._url_parts(scope, headers)
             scope["scheme"] = proto
             if domain is not None:
                 port_suffix = ""
@@ -68,45 +85,49 @@ class ProxyHeaderMiddleware:
                         proto == "https" and port != HTTPS_PORT
                     ):
                         port_suffix = f":{port}"
-                scope["headers"] = self._replace_header_value_by_name(
-                    scope,
-                    "host",
-                    f"{domain}{port_suffix}",
-                )
+                host = f"{domain}{port_suffix}".encode("latin-1")
+                if headers.get(b"host") != host:
+                    scope["headers"] = [
+                        (name, value)
+                        for name, value in scope["headers"]
+                        if name != b"host"
+                    ] + [(b"host", host)]
         await self.app(scope, receive, send)
 
     def _get_forwarded_url_parts(self, scope: Scope) -> Tuple[str]:
+        return self._url_parts(scope, _scan_headers(scope["headers"]))
+
+    @staticmethod
+    def _url_parts(scope: Scope, headers: Dict[bytes, bytes]) -> Tuple[str]:
         proto = scope.get("scheme", "http")
-        header_host = self._get_header_value_by_name(scope, "host")
-        if header_host is None:
+        header_host = headers.get(b"host")
+        if not header_host:
             domain, port = scope.get("server")
         else:
-            header_host_parts = header_host.split(":")
+            header_host_parts = header_host.decode("latin-1").split(":")
             if len(header_host_parts) == 2:
                 domain, port = header_host_parts
             else:
                 domain = header_host_parts[0]
                 port = None
-        forwarded = self._get_header_value_by_name(scope, "forwarded")
-        if forwarded is not None:
-            parts = forwarded.split(";")
-            for part in parts:
-                if len(part) > 0 and re.search("=", part):
-                    key, value = part.split("=")
-                    if key == "proto":
-                        proto = value
-                    elif key == "host":
-                        host_parts = value.split(":")
-                        domain = host_parts[0]
-                        try:
-                            port = int(host_parts[1]) if len(host_parts) == 2 else None
-                        except ValueError:
-                            # ignore ports that are not valid integers
-                            pass
+        forwarded = headers.get(b"forwarded")
+        if forwarded:
+            forwarded_proto, forwarded_host = _parse_forwarded(forwarded)
+            if forwarded_proto is not None:
+                proto = forwarded_proto
+            if forwarded_host is not None:
+                domain, forwarded_port, valid_port = forwarded_host
+                if valid_port:
+                    port = forwarded_port
         else:
-            domain = self._get_header_value_by_name(scope, "x-forwarded-host", domain)
-            proto = self._get_header_value_by_name(scope, "x-forwarded-proto", proto)
-            port_str = self._get_header_value_by_name(scope, "x-forwarded-port", port)
+            forwarded_host = headers.get(b"x-forwarded-host")
+            if forwarded_host:
+                domain = forwarded_host.decode("latin-1")
+            forwarded_proto = headers.get(b"x-forwarded-proto")
+            if forwarded_proto:
+                proto = forwarded_proto.decode("latin-1")
+            forwarded_port = headers.get(b"x-forwarded-port")
+            port_str = forwarded_port.decode("latin-1") if forwarded_port else port
             try:
                 port = int(port_str) if port_str is not None else None
             except ValueError:
@@ -118,18 +139,59 @@ class ProxyHeaderMiddleware:
     def _get_header_value_by_name(
         self, scope: Scope, header_name: str, default_value: str = None
     ) -> str:
-        headers = scope["headers"]
-        candidates = [
-            value.decode() for key, value in headers if key.decode() == header_name
-        ]
-        return candidates[0] if len(candidates) == 1 else default_value
+        name = header_name.encode("latin-1")
+        candidates = [value for key, value in scope["headers"] if key == name]
+        return candidates[0].decode() if len(candidates) == 1 else default_value
 
     @staticmethod
     def _replace_header_value_by_name(
         scope: Scope, header_name: str, new_value: str
     ) -> List[Tuple[str]]:
-        return [
-            (name, value)
-            for name, value in scope["headers"]
-            if name.decode() != header_name
-        ] + [(str.encode(header_name), str.encode(new_value))]
+        name = header_name.encode("latin-1")
+        return [(key, value) for key, value in scope["headers"] if key != name] + [
+            (name, new_value.encode("latin-1"))
+        ]
+
+
+def _scan_headers(raw_headers: List[Tuple[bytes, bytes]]) -> Dict[bytes, bytes]:
+    """Collect the forwarding related headers in a single pass.
+
+    Header names are lower-cased bytes in ASGI, so no decoding is needed. Headers
+    sent more than once are mapped to an empty value and ignored.
+    """
+    headers: Dict[bytes, bytes] = {}
+    for name, value in raw_headers:
+        if name in FORWARDED_HEADERS:
+            headers[name] = _DUPLICATE if name in headers else value
+    return headers
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_forwarded(
+    value: bytes,
+) -> Tuple[Optional[str], Optional[Tuple[str, Optional[int], bool]]]:
+    """Parse the proto and host of a `Forwarded` header value.
+
+    Only the first (client facing) forwarded element is considered. The host is
+    returned as `(domain, port, valid_port)`; `valid_port` is false when the port
+    is not an integer, in which case it should be ignored.
+    """
+    proto = None
+    host = None
+    element = value.decode("latin-1").split(",", 1)[0]
+    for pair in element.split(";"):
+        key, sep, pair_value = pair.partition("=")
+        if not sep:
+            continue
+        key = key.strip().lower()
+        pair_value = pair_value.strip().strip('"')
+        if key == "proto":
+            proto = pair_value
+        elif key == "host":
+            host_parts = pair_value.split(":")
+            try:
+                port = int(host_parts[1]) if len(host_parts) == 2 else None
+                host = (host_parts[0], port, True)
+            except ValueError:
+                host = (host_parts[0], None, False)
+    return proto, host
@@ -5,10 +5,13 @@ from typing import Optional, Type, Union
 
 import attr
 from fastapi import Body, Path
-from pydantic import BaseModel, create_model
+from pydantic import BaseModel, create_model, validator
 from pydantic.fields import UndefinedType
+from stac_pydantic import ItemCollection
+from stac_pydantic.api.extensions.context import ContextExtension
 from stac_pydantic.shared import BBox
 
+from stac_fastapi.types.count import CountMode
 from stac_fastapi.types.extension import ApiExtension
 from stac_fastapi.types.rfc3339 import DateTimeType, str_to_interval
 from stac_fastapi.types.search import (
@@ -272,6 +275,28 @@ class ItemCollectionUri(CollectionUri):
     datetime: Optional[DateTimeType] = attr.ib(default=None, converter=str_to_interval)
 
 
+class CountedContext(ContextExtension):
+    """Search context, with the count mode of the count extension."""
+
+    count: Optional[CountMode]
+
+    @validator("limit")
+    def validate_limit(cls, v, values):
+        """Check the items returned are within the limit, keeping the limit."""
+        if v is not None and values.get("returned", 0) > v:
+            raise ValueError(
+                "Number of returned items must be less than or equal to the limit"
+            )
+        return v
+
+
+class CountedItemCollection(ItemCollection):
+    """Item collection, with the counts of matched items of the count extension."""
+
+    numberMatched: Optional[int]
+    context: Optional[CountedContext]
+
+
 class POSTTokenPagination(BaseModel):
     """Token pagination model for POST requests."""
 
@@ -1,16 +1,114 @@
 """openapi."""
 
+import gzip
 import warnings
 
+import attr
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 from starlette.routing import Route, request_response
 
+from stac_fastapi.api.conditional import (
+    PrerenderedResponse,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
 from stac_fastapi.api.config import ApiExtensions
 from stac_fastapi.types.config import ApiSettings
 
+OPENAPI_MEDIA_TYPE = "application/vnd.oai.openapi+json;version=3.0"
+
+# Maximum number of documents kept for distinct request root paths
+MAX_OPENAPI_DOCUMENTS = 16
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Check whether the request's `Accept-Encoding` header allows gzip."""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+@attr.s(frozen=True)
+class OpenAPIDocument(PrerenderedResponse):
+    """The OpenAPI document, serialized and gzip compressed once.
+
+    The weak `etag` is shared by the identity and gzip encoded representations.
+    """
+
+    media_type: str = attr.ib(default=OPENAPI_MEDIA_TYPE)
+    etag: str = attr.ib(
+        default=attr.Factory(lambda self: "W/" + make_etag(self.body), takes_self=True)
+    )
+    gzip_body: bytes = attr.ib(
+        default=attr.Factory(
+            lambda self: gzip.compress(self.body, mtime=0), takes_self=True
+        )
+    )
+
+    def response(self, request: Request) -> Response:
+        """Return the document, gzip encoded if accepted by the client."""
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding"}
+        if etag_matches(request, self.etag):
+            return not_modified(self.etag, headers)
+        if accepts_gzip(request):
+            headers["Content-Encoding"] = "gzip"
+            return Response(self.gzip_body, media_type=self.media_type, headers=headers)
+        return Response(self.body, media_type=self.media_type, headers=headers)
+
+
+def render_openapi(app: FastAPI, root_path: str = "") -> OpenAPIDocument:
+    """Serialize the OpenAPI document of `app`, as served under `root_path`.
+
+    Like FastAPI, the root path is listed first in the document `servers` unless
+    `root_path_in_servers` is false or it is listed already.
+    """
+    schema = app.openapi()
+    root_path = root_path.rstrip("/")
+    servers = schema.get("servers") or []
+    if (
+        root_path
+        and app.root_path_in_servers
+        and root_path not in {server.get("url") for server in servers}
+    ):
+        schema = {**schema, "servers": [{"url": root_path}, *servers]}
+    return OpenAPIDocument(body=JSONResponse(schema).body)
+
+
+def prerender_openapi(app: FastAPI) -> OpenAPIDocument:
+    """Generate and serialize the OpenAPI document of `app` ahead of requests.
+
+    The document, for `app.root_path`, is stored on `app.state.openapi_document`
+    and served as-is by the route patched with `update_openapi`. Documents for
+    other per-request root paths (e.g. set by the ASGI server or a proxy) are
+    rendered on their first request.
+    """
+    root_path = app.root_path.rstrip("/")
+    app.state.openapi_document = render_openapi(app, root_path)
+    app.state.openapi_documents = {root_path: app.state.openapi_document}
+    return app.state.openapi_document
+
+
+def _openapi_document(app: FastAPI, root_path: str) -> OpenAPIDocument:
+    """Return the document served under a request's root path, rendering it once."""
+    root_path = root_path.rstrip("/")
+    documents = getattr(app.state, "openapi_documents", None)
+    if documents is None:
+        prerender_openapi(app)
+        documents = app.state.openapi_documents
+    document = documents.get(root_path)
+    if document is None:
+        document = render_openapi(app, root_path)
+        # root paths may come from request headers, keep a bounded number
+        if len(documents) < MAX_OPENAPI_DOCUMENTS:
+            documents[root_path] = document
+    return document
+
 
 class VndOaiResponse(JSONResponse):
     """JSON with custom, vendor content-type."""
@@ -30,25 +128,19 @@ def update_openapi(app: FastAPI) -> FastAPI:
     """Update OpenAPI response content-type.
 
     This function modifies the openapi route to comply with the STAC API spec's required
-    content-type response header.
+    content-type response header. The route serves the document prerendered by
+    `prerender_openapi` for the request's root path, rendering it on the first
+    request if it was not.
     """
     # Find the route for the openapi_url in the app
     openapi_route: Route = next(
         route for route in app.router.routes if route.path == app.openapi_url
     )
-    # Store the old endpoint function so we can call it from the patched function
-    old_endpoint = openapi_route.endpoint
 
-    # Create a patched endpoint function that modifies the content type of the response
+    # Create a patched endpoint function that serves the prerendered document with the
+    # STAC content type
     async def patched_openapi_endpoint(req: Request) -> Response:
-        # Get the response from the old endpoint function
-        response: JSONResponse = await old_endpoint(req)
-        # Update the content type header in place
-        response.headers["content-type"] = (
-            "application/vnd.oai.openapi+json;version=3.0"
-        )
-        # Return the updated response
-        return response
+        return _openapi_document(app, req.scope.get("root_path", "")).response(req)
 
     # When a Route is accessed the `handle` function calls `self.app`. Which is
     # the endpoint function wrapped with `request_response`. So we need to wrap
@@ -0,0 +1,486 @@
+"""Response cache middleware."""
+
+import abc
+import functools
+import hashlib
+import inspect
+import mmap
+import os
+import tempfile
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, Union
+from urllib.parse import parse_qsl, urlencode
+
+import attr
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from stac_fastapi.api.conditional import etag_matches, not_modified
+from stac_fastapi.api.routes import Scope as RouteScope
+from stac_fastapi.types.cache import TTLCache
+from stac_fastapi.types.resolver import split_catalog_path
+
+# Request headers which select a different representation of the same resource
+VARY_HEADERS = ("accept",)
+
+# Request headers of authenticated requests, which are never cached
+CREDENTIAL_HEADERS = ("authorization", "cookie")
+
+# Methods cached by the scopes of policies which do not give a method
+SAFE_METHODS = ("GET", "HEAD")
+
+# Methods scopes may give: POST is only cached for scopes listing it, e.g. searches
+CACHEABLE_METHODS = (*SAFE_METHODS, "POST")
+
+CacheKey = Tuple[str, str]
+
+
+@attr.s
+class CachedResponse:
+    """A cached response.
+
+    Attributes:
+        status: HTTP status code.
+        headers: raw ASGI response headers.
+        body: response body, as bytes or a read-only memory map.
+    """
+
+    status: int = attr.ib()
+    headers: List[Tuple[bytes, bytes]] = attr.ib()
+    body: Union[bytes, mmap.mmap] = attr.ib(default=b"")
+
+    def release(self) -> None:
+        """Release the resources held by the body."""
+        if isinstance(self.body, mmap.mmap):
+            self.body.close()
+
+
+class ResponseCacheBackend(abc.ABC):
+    """Storage of cached responses.
+
+    Keys are `(path, digest)` tuples, so that entries can be purged by path.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Return the response cached under `key`, if any and not expired."""
+        ...
+
+    @abc.abstractmethod
+    def set(self, key: CacheKey, response: CachedResponse, ttl: float) -> None:
+        """Cache `response` under `key` for `ttl` seconds."""
+        ...
+
+    @abc.abstractmethod
+    def purge(self, predicate: Callable[[str], bool]) -> int:
+        """Remove the responses whose path matches `predicate`.
+
+        Returns:
+            The number of removed responses.
+        """
+        ...
+
+
+@attr.s
+class MemoryCacheBackend(ResponseCacheBackend):
+    """Keep cached responses in an in-process LRU cache.
+
+    Attributes:
+        maxsize: maximum number of cached responses.
+    """
+
+    maxsize: int = attr.ib(default=1024)
+    _cache: TTLCache = attr.ib(init=False)
+
+    @_cache.default
+    def _cache_factory(self) -> TTLCache:
+        # entries always get an explicit ttl, the default only enables the cache
+        return TTLCache(ttl=1, maxsize=self.maxsize)
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Return the response cached under `key`, if any and not expired."""
+        return self._cache.get(key)
+
+    def set(self, key: CacheKey, response: CachedResponse, ttl: float) -> None:
+        """Cache `response` under `key` for `ttl` seconds."""
+        self._cache.set(key, response, ttl=ttl)
+
+    def purge(self, predicate: Callable[[str], bool]) -> int:
+        """Remove the responses whose path matches `predicate`."""
+        return self._cache.prune(lambda key: predicate(key[0]))
+
+
+@attr.s
+class FileCacheBackend(ResponseCacheBackend):
+    """Keep cached response bodies in local files, served through memory maps.
+
+    Only the status and headers of each response are held in memory, so large
+    responses do not grow the process memory; bodies are paged in by the OS on
+    demand. Files are removed when their entry is evicted, expires or is purged.
+
+    Attributes:
+        directory: directory holding the body files, a new temporary directory by
+            default.
+        maxsize: maximum number of cached responses.
+    """
+
+    directory: str = attr.ib(factory=lambda: tempfile.mkdtemp(prefix="stac-cache-"))
+    maxsize: int = attr.ib(default=1024)
+    _cache: TTLCache = attr.ib(init=False)
+
+    @_cache.default
+    def _cache_factory(self) -> TTLCache:
+        return TTLCache(ttl=1, maxsize=self.maxsize, on_remove=self._remove_file)
+
+    def __attrs_post_init__(self):
+        """Create the cache directory."""
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def _remove_file(key: CacheKey, entry: Tuple[str, CachedResponse]) -> None:
+        try:
+            os.remove(entry[0])
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Return the response cached under `key`, if any and not expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        filename, response = entry
+        try:
+            with open(filename, "rb") as f:
+                body = (
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    if os.fstat(f.fileno()).st_size
+                    else b""
+                )
+        except FileNotFoundError:
+            self._cache.pop(key)
+            return None
+        return CachedResponse(
+            status=response.status, headers=response.headers, body=body
+        )
+
+    def set(self, key: CacheKey, response: CachedResponse, ttl: float) -> None:
+        """Cache `response` under `key` for `ttl` seconds."""
+        filename = os.path.join(self.directory, uuid.uuid4().hex)
+        with open(filename + ".tmp", "wb") as f:
+            f.write(response.body)
+        os.replace(filename + ".tmp", filename)
+        self._cache.set(
+            key,
+            (
+                filename,
+                CachedResponse(status=response.status, headers=response.headers),
+            ),
+            ttl=ttl,
+        )
+
+    def purge(self, predicate: Callable[[str], bool]) -> int:
+        """Remove the responses whose path matches `predicate`."""
+        return self._cache.prune(lambda key: predicate(key[0]))
+
+
+@attr.s
+class CachePolicy:
+    """Cache the responses of the routes matching `scopes` for `ttl` seconds.
+
+    Cached responses are served before routing, so the route dependencies, e.g.
+    authentication, do not run for them: policies must not cover routes whose
+    responses depend on the client. Requests with credentials are never cached.
+
+    Attributes:
+        scopes: route scopes, as for `StacApi.route_dependencies`. Paths may be
+            route templates, e.g. `/catalogs/{catalog_path:path}/search`. Scopes
+            without a method cover GET and HEAD requests; POST requests are only
+            cached for scopes giving it, e.g. `{"path": "/search", "method":
+            "POST"}`.
+        ttl: time to live of the cached responses, in seconds.
+
+    Raises:
+        ValueError: if a scope gives a method other than GET, HEAD or POST.
+    """
+
+    scopes: List[RouteScope] = attr.ib()
+    ttl: float = attr.ib(default=60)
+    _patterns: List[Tuple[Pattern, Tuple[str, ...]]] = attr.ib(init=False)
+
+    @_patterns.default
+    def _compile(self) -> List[Tuple[Pattern, Tuple[str, ...]]]:
+        patterns = []
+        for scope in self.scopes:
+            method = scope.get("method")
+            if method is not None and method.upper() not in CACHEABLE_METHODS:
+                raise ValueError(f"{method} responses cannot be cached")
+            methods = SAFE_METHODS if method is None else (method.upper(),)
+            patterns.append((compile_path(scope["path"])[0], methods))
+        return patterns
+
+    def matches(self, method: str, path: str) -> bool:
+        """Check whether a request is covered by the policy."""
+        return any(
+            method in methods and pattern.match(path)
+            for pattern, methods in self._patterns
+        )
+
+
+@attr.s
+class ResponseCache:
+    """Configuration of the response cache.
+
+    Attributes:
+        policies: cache policies; the first matching policy applies. Requests
+            matching none are not cached.
+        backend: storage of the cached responses.
+        max_body_size: responses with larger bodies are not cached.
+    """
+
+    policies: List[CachePolicy] = attr.ib(factory=list)
+    backend: ResponseCacheBackend = attr.ib(factory=MemoryCacheBackend)
+    max_body_size: int = attr.ib(default=8 * 1024 * 1024)
+
+    def policy(self, method: str, path: str) -> Optional[CachePolicy]:
+        """Return the policy applying to a request, if any."""
+        for policy in self.policies:
+            if policy.matches(method, path):
+                return policy
+        return None
+
+    @staticmethod
+    def key(scope: Scope, body: bytes = b"") -> CacheKey:
+        """Compute the cache key of a request.
+
+        Query parameters are sorted, so their order does not matter, and request
+        bodies are hashed.
+        """
+        headers = Headers(scope=scope)
+        query = urlencode(
+            sorted(parse_qsl(scope["query_string"].decode("latin-1"), True))
+        )
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (
+            scope["method"],
+            scope.get("scheme", "http"),
+            headers.get("host", ""),
+            scope.get("root_path", ""),
+            query,
+            *(headers.get(name, "") for name in VARY_HEADERS),
+        ):
+            digest.update(part.encode("latin-1") + b"\0")
+        digest.update(hashlib.blake2b(body, digest_size=16).digest())
+        return scope["path"], digest.hexdigest()
+
+    def purge_catalog(
+        self, catalog_path: Optional[str], router_prefix: str = ""
+    ) -> int:
+        """Purge the responses which may depend on a catalog.
+
+        Removes the responses of routes outside `/catalogs/` (landing page,
+        global search, ...), of the catalog listing, and of every route under the
+        top-level catalog containing `catalog_path`.
+
+        Returns:
+            The number of removed responses.
+        """
+        catalogs = router_prefix + "/catalogs/"
+        segments = split_catalog_path(catalog_path or "")
+        top_level = catalogs + segments[0] if segments else None
+
+        def _affected(path: str) -> bool:
+            if not path.startswith(catalogs):
+                return True
+            return top_level is not None and (
+                path == top_level or path.startswith(top_level + "/")
+            )
+
+        return self.backend.purge(_affected)
+
+
+def _bypass(scope: Scope) -> bool:
+    """Check whether a request must neither be served from nor stored in the cache."""
+    headers = Headers(scope=scope)
+    if any(name in headers for name in CREDENTIAL_HEADERS):
+        return True
+    cache_control = headers.get("cache-control", "")
+    return "no-cache" in cache_control or "no-store" in cache_control
+
+
+def _storable(status: int, headers: List[Tuple[bytes, bytes]]) -> bool:
+    if status != 200:
+        return False
+    for name, value in headers:
+        if name.lower() == b"set-cookie":
+            return False
+        if name.lower() == b"cache-control" and (
+            b"no-store" in value or b"private" in value
+        ):
+            return False
+    return True
+
+
+async def _read_body(receive: Receive) -> Tuple[bytes, Receive]:
+    """Read the request body, returning it with a `receive` replaying it."""
+    body = bytearray()
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] != "http.request":
+            return bytes(body), receive
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+    replayed = False
+
+    async def _receive() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": bytes(body), "more_body": False}
+        return await receive()
+
+    return bytes(body), _receive
+
+
+class ResponseCacheMiddleware:
+    """Serve cached responses for the routes covered by a `ResponseCache` policy.
+
+    Only complete `200` responses without cookies or `no-store` are cached.
+    Requests sending `Cache-Control: no-cache` or `no-store`, and requests with
+    credentials (`Authorization` or `Cookie` headers), bypass the cache.
+    Responses get an `X-Cache: HIT` or `X-Cache: MISS` header, and cached responses
+    with an `ETag` answer matching `If-None-Match` requests with `304`.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, app: ASGIApp, cache: ResponseCache):
+        """Create the response cache middleware."""
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Call from stac-fastapi framework."""
+        policy = (
+            self.cache.policy(scope["method"], scope["path"])
+            if scope["type"] == "http"
+            else None
+        )
+        if policy is None or _bypass(scope):
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        if scope["method"] not in ("GET", "HEAD"):
+            body, receive = await _read_body(receive)
+        key = self.cache.key(scope, body)
+
+        cached = self.cache.backend.get(key)
+        if cached is not None:
+            try:
+                await self._send_cached(cached, scope, send)
+            finally:
+                cached.release()
+            return
+
+        await self.app(scope, receive, self._recording_send(send, key, policy.ttl))
+
+    def _recording_send(self, send: Send, key: CacheKey, ttl: float) -> Send:
+        response: Dict[str, Any] = {}
+        body = bytearray()
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = list(message.get("headers", []))
+                response["storable"] = _storable(
+                    response["status"], response["headers"]
+                )
+                message = {
+                    **message,
+                    "headers": [*response["headers"], (b"x-cache", b"MISS")],
+                }
+            elif message["type"] == "http.response.body" and response.get("storable"):
+                body.extend(message.get("body", b""))
+                if len(body) > self.cache.max_body_size:
+                    response["storable"] = False
+                    body.clear()
+                elif not message.get("more_body", False):
+                    self.cache.backend.set(
+                        key,
+                        CachedResponse(
+                            status=response["status"],
+                            headers=response["headers"],
+                            body=bytes(body),
+                        ),
+                        ttl,
+                    )
+            await send(message)
+
+        return _send
+
+    async def _send_cached(
+        self, cached: CachedResponse, scope: Scope, send: Send
+    ) -> None:
+        etag = Headers(raw=cached.headers).get("etag")
+        if etag is not None and etag_matches(Request(scope), etag):
+            await not_modified(etag)(scope, None, send)
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": cached.status,
+                "headers": [*cached.headers, (b"x-cache", b"HIT")],
+            }
+        )
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b""})
+            return
+        size = len(cached.body)
+        for start in range(0, max(size, 1), self.chunk_size):
+            end = start + self.chunk_size
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": bytes(cached.body[start:end]),
+                    "more_body": end < size,
+                }
+            )
+
+
+def _purge(request: Request) -> None:
+    cache: Optional[ResponseCache] = getattr(request.app.state, "response_cache", None)
+    if cache is not None:
+        cache.purge_catalog(
+            request.path_params.get("catalog_path"),
+            getattr(request.app.state, "router_prefix", ""),
+        )
+
+
+def purge_response_cache(func: Callable) -> Callable:
+    """Purge the cached responses affected by a write once `func` has succeeded.
+
+    The affected catalog is taken from the `catalog_path` path parameter of the
+    request; see `ResponseCache.purge_catalog`.
+    """
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def _async_wrapper(*args, **kwargs):
+            resp = await func(*args, **kwargs)
+            _purge(kwargs["request"])
+            return resp
+
+        return _async_wrapper
+
+    @functools.wraps(func)
+    def _wrapper(*args, **kwargs):
+        resp = func(*args, **kwargs)
+        _purge(kwargs["request"])
+        return resp
+
+    return _wrapper
@@ -3,7 +3,18 @@
 import functools
 import inspect
 import warnings
-from typing import Any, Callable, Dict, List, Optional, Type, TypedDict, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypedDict,
+    Union,
+)
 
 from fastapi import Depends, params
 from fastapi.dependencies.utils import get_parameterless_sub_dependant
@@ -15,13 +26,22 @@ from starlette.routing import BaseRoute, Match
 from starlette.status import HTTP_204_NO_CONTENT
 
 from stac_fastapi.api.models import APIRequest
+from stac_fastapi.api.streaming import GeoJSONStreamingResponse
+from stac_fastapi.types.count import CountMode
+from stac_fastapi.types.projection import compile_fields, split_fields
+from stac_fastapi.types.resolver import CatalogPathResolver
+from stac_fastapi.types.streaming import StreamingItemCollection
+
+_UNRESOLVED = object()
 
 
 def _wrap_response(resp: Any) -> Any:
-    if resp is not None:
-        return resp
-    else:  # None is returned as 204 No Content
+    if resp is None:  # None is returned as 204 No Content
         return Response(status_code=HTTP_204_NO_CONTENT)
+    elif isinstance(resp, StreamingItemCollection):
+        return GeoJSONStreamingResponse(resp)
+    else:
+        return resp
 
 
 def sync_to_async(func):
@@ -34,6 +54,116 @@ def sync_to_async(func):
     return run
 
 
+def resolve_catalog_path(func: Callable, resolver: CatalogPathResolver) -> Callable:
+    """Resolve the `catalog_path` argument of a client method with `resolver`.
+
+    The handle is passed to `func` as the `resolved_catalog` keyword argument.
+    Synchronous resolvers only run in a background thread on cache misses.
+    Methods accepting neither `resolved_catalog` nor `**kwargs` are returned
+    unchanged.
+    """
+    if not _accepts_keyword(func, "resolved_catalog"):
+        return func
+    wrapped = func
+    if not inspect.iscoroutinefunction(func):
+        func = sync_to_async(func)
+
+    async def _resolve(catalog_path: str) -> Any:
+        if inspect.iscoroutinefunction(resolver.resolve):
+            return await resolver.resolve(catalog_path)
+        handle = resolver.peek(catalog_path, _UNRESOLVED)
+        if handle is _UNRESOLVED:
+            handle = await run_in_threadpool(resolver.resolve, catalog_path)
+        return handle
+
+    @functools.wraps(wrapped)
+    async def _wrapper(*args, **kwargs):
+        catalog_path = kwargs.get("catalog_path")
+        if catalog_path is not None:
+            kwargs["resolved_catalog"] = await _resolve(catalog_path)
+        return await func(*args, **kwargs)
+
+    return _wrapper
+
+
+def _accepts_keyword(func: Callable, name: str) -> bool:
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        parameter.name == name or parameter.kind == parameter.VAR_KEYWORD
+        for parameter in parameters
+    )
+
+
+def _requested_fields(
+    args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> Optional[Tuple[Iterable[str], Iterable[str]]]:
+    """Return the include and exclude fields of a search, if any."""
+    if "fields" in kwargs:
+        # GET search, with `+`/`-` prefixed fields
+        return split_fields(kwargs["fields"]) if kwargs["fields"] else None
+    search = args[0] if args else kwargs.get("search_request")
+    fields = getattr(search, "fields", None)
+    if fields is None or not (fields.include or fields.exclude):
+        return None
+    return fields.include, fields.exclude
+
+
+def project_fields(
+    func: Callable, default_includes: Optional[Iterable[str]] = None
+) -> Callable:
+    """Pass the compiled projection of the requested fields to a search method.
+
+    The `FieldsProjection`, including `default_includes`, is passed as the
+    `projection` keyword argument, None when no fields are requested. Methods
+    accepting neither `projection` nor `**kwargs` are returned unchanged.
+    """
+    if not _accepts_keyword(func, "projection"):
+        return func
+    wrapped = func
+    if not inspect.iscoroutinefunction(func):
+        func = sync_to_async(func)
+
+    # keeps the name of the method, and its keywords visible to other wrappers
+    @functools.wraps(wrapped)
+    async def _wrapper(*args, **kwargs):
+        fields = _requested_fields(args, kwargs)
+        kwargs["projection"] = (
+            None if fields is None else compile_fields(*fields, default_includes)
+        )
+        return await func(*args, **kwargs)
+
+    return _wrapper
+
+
+def resolve_count_mode(func: Callable, default_mode: CountMode) -> Callable:
+    """Pass the count mode requested by a search, or `default_mode`, to a search
+    method as the `count_mode` keyword argument.
+
+    Methods accepting neither `count_mode` nor `**kwargs` are returned unchanged.
+    """
+    if not _accepts_keyword(func, "count_mode"):
+        return func
+    wrapped = func
+    if not inspect.iscoroutinefunction(func):
+        func = sync_to_async(func)
+
+    @functools.wraps(wrapped)
+    async def _wrapper(*args, **kwargs):
+        if "count" in kwargs:
+            # GET search
+            count = kwargs["count"]
+        else:
+            search = args[0] if args else kwargs.get("search_request")
+            count = getattr(search, "count", None)
+        kwargs["count_mode"] = CountMode(count or default_mode)
+        return await func(*args, **kwargs)
+
+    return _wrapper
+
+
 def create_async_endpoint(
     func: Callable,
     request_model: Union[Type[APIRequest], Type[BaseModel], Dict],
@@ -0,0 +1,156 @@
+"""Coalescing of concurrent identical search requests."""
+
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+import attr
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from stac_fastapi.api.conditional import render_response
+from stac_fastapi.api.response_cache import CREDENTIAL_HEADERS
+from stac_fastapi.api.streaming import negotiate_feature_sequence
+from stac_fastapi.types.canonical import search_hash
+
+# Arguments of the client methods which are not search parameters
+NON_SEARCH_ARGUMENTS = ("request", "resolved_catalog")
+
+
+@attr.s
+class SingleFlightStats:
+    """Counters of coalesced requests.
+
+    Attributes:
+        calls: number of requests which went through the single-flight layer.
+        executions: number of backend calls made for them.
+        coalesced: number of requests served by another request's backend call.
+    """
+
+    calls: int = attr.ib(default=0)
+    executions: int = attr.ib(default=0)
+    coalesced: int = attr.ib(default=0)
+
+    @property
+    def ratio(self) -> float:
+        """Fraction of the requests which were coalesced."""
+        return self.coalesced / self.calls if self.calls else 0.0
+
+
+@attr.s(frozen=True)
+class SharedResponse:
+    """A serialized response shared by coalesced requests."""
+
+    status_code: int = attr.ib()
+    headers: List[Tuple[bytes, bytes]] = attr.ib()
+    body: bytes = attr.ib()
+
+    @classmethod
+    def from_response(cls, response: Response) -> Optional["SharedResponse"]:
+        """Capture a response, or return None if its body is streamed."""
+        if isinstance(response, StreamingResponse) or not hasattr(response, "body"):
+            return None
+        return cls(response.status_code, list(response.raw_headers), response.body)
+
+    def response(self) -> Response:
+        """Return a new response with the shared body."""
+        response = Response(self.body, status_code=self.status_code)
+        response.raw_headers = list(self.headers)
+        return response
+
+
+@attr.s
+class SingleFlight:
+    """Run at most one call at a time per key, sharing its result.
+
+    Calls made with a key while a call with the same key is in flight wait for
+    it instead of starting another one. The call runs in its own task so that a
+    cancelled (e.g. disconnected) caller does not cancel it for the others.
+
+    Attributes:
+        stats: coalescing counters.
+    """
+
+    stats: SingleFlightStats = attr.ib(factory=SingleFlightStats)
+    _flights: Dict[Any, "asyncio.Future[Any]"] = attr.ib(init=False, factory=dict)
+
+    async def do(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return the result of `fn()`, or of the in-flight call for `key`.
+
+        Returns:
+            The result, and whether it was produced by another caller's call.
+        """
+        self.stats.calls += 1
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(flight), True
+
+        self.stats.executions += 1
+        flight = asyncio.ensure_future(fn())
+        self._flights[key] = flight
+        flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        return await asyncio.shield(flight), False
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._flights)
+
+
+def _search_key(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    request: Request = kwargs["request"]
+    parameters = {k: v for k, v in kwargs.items() if k not in NON_SEARCH_ARGUMENTS}
+    if args and isinstance(args[0], BaseModel):
+        parameters.update(args[0].dict(by_alias=True))
+    # the URL (without query) covers the route, the catalog path and the base URL
+    # used in links; the hash covers the search, whichever the verb
+    return str(request.url.replace(query="")), search_hash(parameters)
+
+
+def single_flight(
+    func: Callable,
+    flights: SingleFlight,
+    response_class: Type[Response],
+    response_model: Optional[Type[BaseModel]] = None,
+) -> Callable:
+    """Wrap a search client method to coalesce concurrent identical searches.
+
+    Identical searches, keyed on their canonical form, which arrive while one is
+    being processed wait for it and share its serialized response body. Requests
+    carrying credentials, whose results may depend on who asks, and requests for
+    feature sequences are never coalesced, and neither are responses which stream
+    their body: waiting requests then call the backend themselves.
+    """
+    if inspect.iscoroutinefunction(func):
+        call = func
+    else:
+
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(func, *args, **kwargs)
+
+    async def _execute(args, kwargs) -> Tuple[Any, Optional[SharedResponse]]:
+        resp = await call(*args, **kwargs)
+        if isinstance(resp, dict):
+            resp = render_response(resp, response_class, response_model)
+        if isinstance(resp, Response):
+            return resp, SharedResponse.from_response(resp)
+        return resp, None
+
+    async def _wrapper(*args, **kwargs):
+        request: Request = kwargs["request"]
+        if negotiate_feature_sequence(request) is not None or any(
+            name in request.headers for name in CREDENTIAL_HEADERS
+        ):
+            return await call(*args, **kwargs)
+        (resp, shared), coalesced = await flights.do(
+            _search_key(args, kwargs), lambda: _execute(args, kwargs)
+        )
+        if not coalesced:
+            return resp
+        if shared is None:
+            return await call(*args, **kwargs)
+        return shared.response()
+
+    return _wrapper
@@ -0,0 +1,307 @@
+"""Incremental GeoJSON writers."""
+
+import importlib.util
+import inspect
+import json
+import logging
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+from stac_fastapi.types import stac as stac_types
+from stac_fastapi.types.stac import Item
+from stac_fastapi.types.streaming import StreamingItemCollection
+
+logger = logging.getLogger(__name__)
+
+Page = Union[stac_types.ItemCollection, StreamingItemCollection]
+
+# RFC 8142 GeoJSON text sequences: each feature is prefixed with a record separator
+GEOJSON_SEQ = "application/geo+json-seq"
+# Newline-delimited JSON: one feature per line
+NDJSON = "application/x-ndjson"
+FEATURE_SEQUENCE_MEDIA_TYPES = {
+    GEOJSON_SEQ: GEOJSON_SEQ,
+    NDJSON: NDJSON,
+    "application/ndjson": NDJSON,
+}
+FEATURE_COLLECTION_MEDIA_TYPES = (
+    "application/geo+json",
+    "application/json",
+    "application/*",
+    "*/*",
+)
+
+# Members written by the writer itself, ignored in headers and footers
+RESERVED_MEMBERS = ("type", "features")
+
+# Features pulled at once from synchronous iterators, which run in a thread
+SYNC_BATCH_SIZE = 100
+
+# Pages streamed at most by an auto-paginated response
+MAX_AUTO_PAGES = 1000
+
+# Test for ORJSON and use it rather than stdlib JSON where supported
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize `obj` to compact JSON bytes."""
+        return orjson.dumps(
+            obj,
+            default=jsonable_encoder,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+else:
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize `obj` to compact JSON bytes."""
+        return json.dumps(
+            jsonable_encoder(obj),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+async def iter_features(collection: StreamingItemCollection) -> AsyncIterator[Item]:
+    """Iterate the features of a collection, whether produced sync or async.
+
+    Synchronous iterators are advanced in a worker thread, in batches, so that a
+    blocking backend does not block the event loop.
+    """
+    features = collection.features
+    if hasattr(features, "__aiter__"):
+        async for feature in features:
+            yield feature
+        return
+
+    iterator = iter(features)
+    while True:
+        batch: List[Item] = await run_in_threadpool(
+            lambda: list(islice(iterator, SYNC_BATCH_SIZE))
+        )
+        if not batch:
+            return
+        for feature in batch:
+            yield feature
+
+
+def _members(members: Dict[str, Any]) -> bytes:
+    return b"".join(
+        b',"' + key.encode("utf-8") + b'":' + dumps(value)
+        for key, value in members.items()
+        if key not in RESERVED_MEMBERS and value is not None
+    )
+
+
+async def iter_feature_collection(
+    collection: StreamingItemCollection, chunk_size: int = 64 * 1024
+) -> AsyncIterator[bytes]:
+    """Write a FeatureCollection chunk by chunk.
+
+    Serialized features are buffered until `chunk_size` bytes are available, then
+    flushed, so at most one chunk plus one feature is held in memory.
+    """
+    buffer = bytearray(b'{"type":"FeatureCollection"')
+    buffer += _members(collection.header)
+    buffer += b',"features":['
+
+    first = True
+    async for feature in iter_features(collection):
+        if not first:
+            buffer += b","
+        first = False
+        buffer += dumps(feature)
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    buffer += b"]"
+    buffer += _members(collection.get_footer())
+    buffer += b"}"
+    yield bytes(buffer)
+
+
+class GeoJSONStreamingResponse(StreamingResponse):
+    """Stream a `StreamingItemCollection` as a GeoJSON FeatureCollection."""
+
+    media_type = "application/geo+json"
+
+    def __init__(self, collection: StreamingItemCollection, **kwargs):
+        """Create a streaming response for the collection."""
+        super().__init__(iter_feature_collection(collection), **kwargs)
+
+
+def _accepted_media_types(accept: str) -> List[str]:
+    """Parse an `Accept` header into media types ordered by preference."""
+    media_types: List[Tuple[float, int, str]] = []
+    for position, media_range in enumerate(accept.split(",")):
+        media_type, *params = (part.strip() for part in media_range.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            media_types.append((-quality, position, media_type.lower()))
+    return [media_type for _, _, media_type in sorted(media_types)]
+
+
+def negotiate_feature_sequence(request: Request) -> Optional[str]:
+    """Return the feature sequence media type preferred by the client, if any.
+
+    `None` means the client prefers (or only accepts) a FeatureCollection.
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return None
+    for media_type in _accepted_media_types(accept):
+        if media_type in FEATURE_SEQUENCE_MEDIA_TYPES:
+            return FEATURE_SEQUENCE_MEDIA_TYPES[media_type]
+        if media_type in FEATURE_COLLECTION_MEDIA_TYPES:
+            return None
+    return None
+
+
+async def _iter_page_features(page: Page) -> AsyncIterator[Item]:
+    if isinstance(page, StreamingItemCollection):
+        async for feature in iter_features(page):
+            yield feature
+    else:
+        for feature in page.get("features") or []:
+            yield feature
+
+
+def _page_links(page: Page) -> List[Dict[str, Any]]:
+    if isinstance(page, StreamingItemCollection):
+        return page.get_footer().get("links") or page.header.get("links") or []
+    return page.get("links") or []
+
+
+def next_token(links: List[Dict[str, Any]]) -> Optional[str]:
+    """Extract the pagination token from a page's `next` link.
+
+    Looks at the link `body` (POST pagination) first, then at the `token` query
+    parameter of the link `href` (GET pagination).
+    """
+    for link in links:
+        if link.get("rel") != "next":
+            continue
+        body = link.get("body")
+        if isinstance(body, dict) and body.get("token"):
+            return body["token"]
+        tokens = parse_qs(urlsplit(link.get("href", "")).query).get("token")
+        if tokens:
+            return tokens[0]
+    return None
+
+
+def _with_token(
+    args: Tuple[Any, ...], kwargs: Dict[str, Any], token: str
+) -> Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]]:
+    """Return the endpoint arguments for the next page, or None if not paginated."""
+    if "token" in kwargs:
+        return args, {**kwargs, "token": token}
+    if isinstance(kwargs.get("search_request"), BaseModel):
+        search_request = kwargs["search_request"].copy(update={"token": token})
+        return args, {**kwargs, "search_request": search_request}
+    if args and isinstance(args[0], BaseModel):
+        return (args[0].copy(update={"token": token}), *args[1:]), kwargs
+    return None
+
+
+class FeatureSequenceResponse(StreamingResponse):
+    """Stream the features of one or more pages as a feature sequence.
+
+    Each feature is serialized and flushed on its own line, prefixed with an
+    ASCII record separator for `application/geo+json-seq`.
+    """
+
+    def __init__(self, pages: AsyncIterator[Page], media_type: str, **kwargs):
+        """Create a streaming response for the pages."""
+        super().__init__(
+            self._iter_lines(pages, record_separator=media_type == GEOJSON_SEQ),
+            media_type=media_type,
+            **kwargs,
+        )
+
+    @staticmethod
+    async def _iter_lines(
+        pages: AsyncIterator[Page], record_separator: bool
+    ) -> AsyncIterator[bytes]:
+        prefix = b"\x1e" if record_separator else b""
+        async for page in pages:
+            async for feature in _iter_page_features(page):
+                yield prefix + dumps(feature) + b"\n"
+
+
+async def _single_page(page: Page) -> AsyncIterator[Page]:
+    yield page
+
+
+async def _follow_pages(
+    call: Callable, first: Page, args, kwargs, max_pages: int
+) -> AsyncIterator[Page]:
+    """Yield a page and the pages of its `next` links, up to `max_pages` pages
+    and stopping at a token already followed."""
+    page, pages, seen = first, 1, set()
+    while True:
+        yield page
+        token = next_token(_page_links(page))
+        next_arguments = _with_token(args, kwargs, token) if token else None
+        if next_arguments is None:
+            return
+        if token in seen:
+            logger.warning("Auto-pagination stopped at repeated token %s", token)
+            return
+        if pages >= max_pages:
+            logger.warning("Auto-pagination stopped after %d pages", max_pages)
+            return
+        seen.add(token)
+        pages += 1
+        args, kwargs = next_arguments
+        page = await call(*args, **kwargs)
+        if not isinstance(page, (dict, StreamingItemCollection)):
+            return
+
+
+def feature_sequence_negotiation(
+    func: Callable, auto_paginate: bool = False, max_pages: int = MAX_AUTO_PAGES
+) -> Callable:
+    """Wrap a search client method to honour feature sequence `Accept` headers.
+
+    Requests accepting `application/geo+json-seq` or NDJSON get the features
+    streamed one per line. With `auto_paginate`, the `next` link of each page is
+    followed server-side, so a single response drains the whole result set, up
+    to `max_pages` pages. Pagination stops at a token already followed, so that
+    a backend returning cyclic tokens does not stream forever.
+    """
+    if inspect.iscoroutinefunction(func):
+        call = func
+    else:
+
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(func, *args, **kwargs)
+
+    async def _wrapper(*args, **kwargs):
+        media_type = negotiate_feature_sequence(kwargs["request"])
+        resp = await call(*args, **kwargs)
+        if media_type is None or not isinstance(resp, (dict, StreamingItemCollection)):
+            return resp
+        if not auto_paginate:
+            return FeatureSequenceResponse(_single_page(resp), media_type)
+        pages = _follow_pages(call, resp, args, kwargs, max_pages)
+        return FeatureSequenceResponse(pages, media_type)
+
+    return _wrapper
@@ -0,0 +1,103 @@
+"""Sampled response validation."""
+
+import inspect
+import logging
+import random
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, Type
+
+import attr
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s
+class ValidationStats:
+    """Counters of sampled response validation, safe to update from threads.
+
+    Attributes:
+        sampled: number of responses validated.
+        violations: number of validated responses which did not match their model.
+        violations_by_model: violations, keyed by response model name.
+    """
+
+    sampled: int = attr.ib(default=0)
+    violations: int = attr.ib(default=0)
+    violations_by_model: Counter = attr.ib(factory=Counter)
+    _lock: threading.Lock = attr.ib(
+        init=False, factory=threading.Lock, repr=False, eq=False
+    )
+
+    def record(self, model: Type[BaseModel], error: ValidationError = None) -> None:
+        """Record the outcome of one validation."""
+        with self._lock:
+            self.sampled += 1
+            if error is not None:
+                self.violations += 1
+                self.violations_by_model[model.__name__] += 1
+
+
+def sampled_validator(
+    model: Type[BaseModel],
+    sample_rate: float,
+    stats: ValidationStats,
+    name: str,
+    sampler: Callable[[], float] = random.random,
+) -> Callable[[Any], Awaitable[None]]:
+    """Return a coroutine function validating a sample of bodies against `model`.
+
+    Violations are logged, as responses of `name`, and counted in `stats`. Only
+    `dict` bodies are sampled.
+    """
+
+    def _validate(body: dict) -> None:
+        try:
+            model.validate(body)
+        except ValidationError as e:
+            stats.record(model, e)
+            logger.warning(
+                "Response of %s does not match %s: %s", name, model.__name__, e
+            )
+        else:
+            stats.record(model)
+
+    async def validate(body: Any) -> None:
+        if isinstance(body, dict) and sampler() < sample_rate:
+            await run_in_threadpool(_validate, body)
+
+    return validate
+
+
+def sampled_validation(
+    func: Callable,
+    model: Type[BaseModel],
+    sample_rate: float,
+    stats: ValidationStats,
+    sampler: Callable[[], float] = random.random,
+) -> Callable:
+    """Wrap a client method to validate a sample of its responses against `model`.
+
+    Responses are returned unchanged, whether they validate or not; violations are
+    logged and counted in `stats`. Only `dict` responses are sampled, so streamed
+    collections and `Response` objects are never validated.
+    """
+    if inspect.iscoroutinefunction(func):
+        call = func
+    else:
+
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(func, *args, **kwargs)
+
+    validate = sampled_validator(
+        model, sample_rate, stats, getattr(func, "__name__", str(func)), sampler
+    )
+
+    async def _wrapper(*args, **kwargs):
+        resp = await call(*args, **kwargs)
+        await validate(resp)
+        return resp
+
+    return _wrapper
@@ -1,11 +1,15 @@
-from datetime import datetime
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Union
 
 import pytest
+from stac_pydantic import Item
 from stac_pydantic.api.utils import link_factory
 from starlette.testclient import TestClient
 
 from stac_fastapi.api.app import StacApi
+from stac_fastapi.api.middleware import ProxyHeaderMiddleware
 from stac_fastapi.types import stac as stac_types
 from stac_fastapi.types.config import ApiSettings
 from stac_fastapi.types.core import (
@@ -14,6 +18,21 @@ from stac_fastapi.types.core import (
     BaseSearchPostRequest,
     NumType,
 )
+from stac_fastapi.types.links import (
+    ItemLinks,
+    LinkTemplates,
+    resolve_features_links,
+    resolve_links,
+)
+from stac_fastapi.types.memory import ItemStore
+from stac_fastapi.types.projection import compile_fields
+from stac_fastapi.types.rfc3339 import (
+    RFC33339_PATTERN,
+    rfc3339_str_to_datetime,
+    rfc3339_strs_to_epoch_us,
+    str_to_interval,
+)
+from stac_fastapi.types.spatial import compile_spatial_filter
 
 collection_links = link_factory.CollectionLinks("/", "test").create_links()
 item_links = link_factory.ItemLinks("/", "test", "test").create_links()
@@ -246,3 +265,221 @@ def test_benchmark_collections(
 
     response = benchmark(f)
     assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        [(b"host", b"testserver")],
+        [(b"host", b"testserver"), (b"forwarded", b"proto=https;host=test:1234")],
+        [
+            (b"host", b"testserver"),
+            (b"x-forwarded-host", b"test"),
+            (b"x-forwarded-proto", b"https"),
+            (b"x-forwarded-port", b"1234"),
+        ],
+    ],
+    ids=["host", "forwarded", "x-forwarded"],
+)
+def test_benchmark_proxy_header_middleware(benchmark, headers):
+    async def app(scope, receive, send): ...
+
+    middleware = ProxyHeaderMiddleware(app)
+    headers = headers + [
+        (b"accept", b"application/json"),
+        (b"accept-encoding", b"gzip, deflate, br"),
+        (b"user-agent", b"benchmark"),
+    ]
+    scope = {"type": "http", "scheme": "http", "server": ["testserver", 80]}
+    loop = asyncio.new_event_loop()
+
+    def f():
+        loop.run_until_complete(middleware({**scope, "headers": headers}, None, None))
+
+    benchmark.group = "ProxyHeaderMiddleware"
+    benchmark(f)
+    loop.close()
+
+
+@pytest.mark.parametrize("engine", ["classes", "templates"])
+def test_benchmark_item_links(benchmark, engine):
+    base_url = "http://testserver/"
+    triples = [
+        ("test_catalog", "test_collection", f"test_item_{n}") for n in range(1000)
+    ]
+
+    def classes():
+        return [
+            ItemLinks(catalog_path, collection_id, base_url, item_id).create_links()
+            for catalog_path, collection_id, item_id in triples
+        ]
+
+    def templates():
+        return LinkTemplates(base_url).items_links(triples)
+
+    benchmark.group = "Item links"
+    links = benchmark(classes if engine == "classes" else templates)
+    assert len(links) == len(triples)
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_benchmark_resolve_links(benchmark, batch):
+    base_url = "http://testserver/"
+    stored_links = [
+        {"rel": "self", "href": "http://stored/item"},
+        {"rel": "license", "href": "https://stored/license.html"},
+        {"rel": "alternate", "href": "http://stored/alternate.html"},
+    ]
+
+    def setup():
+        features = [
+            {"links": [dict(link) for link in stored_links]} for _ in range(1000)
+        ]
+        return (features,), {}
+
+    def per_item(features):
+        for feature in features:
+            feature["links"] = resolve_links(feature["links"], base_url)
+
+    def per_page(features):
+        resolve_features_links(features, base_url)
+
+    benchmark.group = "Resolve links"
+    benchmark.pedantic(per_page if batch else per_item, setup=setup, rounds=100)
+
+
+# Valid datetimes of test_rfc3339.py
+rfc3339_datetimes = [
+    "1985-04-12T23:20:50.52Z",
+    "1996-12-19T16:39:57-00:00",
+    "1996-12-19T16:39:57+00:00",
+    "1996-12-19T16:39:57-08:00",
+    "1996-12-19T16:39:57+08:00",
+    "1937-01-01T12:00:27.87+01:00",
+    "1937-01-01T12:00:27.8710+01:00",
+    "1937-01-01T12:00:27.8+01:00",
+    "1937-01-01T12:00:27.8Z",
+    "2020-07-23T00:00:00.000+03:00",
+    "2020-07-23T00:00:00+03:00",
+    "1985-04-12t23:20:50.000z",
+    "2020-07-23T00:00:00Z",
+    "2020-07-23T00:00:00.012345Z",
+    "2020-07-23T00:00:00.012345678Z",
+]
+
+
+@pytest.mark.parametrize("parser", ["iso8601", "fromisoformat"])
+def test_benchmark_rfc3339_str_to_datetime(benchmark, parser):
+    if parser == "iso8601":
+        iso8601 = pytest.importorskip("iso8601")
+
+        def parse(s):
+            s = s.upper()
+            if not re.match(RFC33339_PATTERN, s):
+                raise ValueError("Invalid RFC3339 datetime.")
+            return iso8601.parse_date(s)
+
+    else:
+        parse = rfc3339_str_to_datetime
+
+    def f():
+        return [parse(s) for s in rfc3339_datetimes]
+
+    benchmark.group = "RFC 3339 datetimes"
+    assert benchmark(f) == [rfc3339_str_to_datetime(s) for s in rfc3339_datetimes]
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_benchmark_str_to_interval(benchmark, cached):
+    intervals = [f"{start}/.." for start in rfc3339_datetimes]
+    parse = str_to_interval if cached else str_to_interval.__wrapped__
+
+    def f():
+        return [parse(interval) for interval in intervals]
+
+    benchmark.group = "Datetime intervals"
+    benchmark(f)
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_benchmark_item_datetimes_to_epoch(benchmark, batch):
+    # a page of items, many of them sharing their acquisition time
+    values = [rfc3339_datetimes[n % 5] for n in range(1000)]
+
+    def per_item():
+        return [
+            (rfc3339_str_to_datetime(v) - datetime(1970, 1, 1, tzinfo=timezone.utc))
+            // timedelta(microseconds=1)
+            for v in values
+        ]
+
+    def per_page():
+        return rfc3339_strs_to_epoch_us(values)
+
+    benchmark.group = "Item datetimes to epoch"
+    benchmark(per_page if batch else per_item)
+
+
+@pytest.mark.parametrize("engine", ["scan", "indexed"])
+def test_benchmark_memory_search(benchmark, engine):
+    items = [
+        {
+            "type": "Feature",
+            "id": f"item_{n}",
+            "collection": "test_collection",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [n % 360 - 180, n // 360 - 90],
+            },
+            "properties": {"datetime": f"2020-01-{n % 28 + 1:02d}T00:00:00Z"},
+        }
+        for n in range(10000)
+    ]
+    store = ItemStore()
+    store.add_items("test_catalog", items)
+    bbox = [0, -80, 10, -70]
+    predicate = compile_spatial_filter(bbox)
+
+    def scan():
+        return [item for item in items if predicate(item)][:100]
+
+    def indexed():
+        return store.search(bbox=bbox, limit=100)[0]
+
+    benchmark.group = "In-memory search"
+    assert len(benchmark(scan if engine == "scan" else indexed)) == len(scan())
+
+
+@pytest.mark.parametrize("engine", ["pydantic", "projection"])
+def test_benchmark_fields_projection(benchmark, engine):
+    item = {
+        "type": "Feature",
+        "stac_version": "1.0.0",
+        "id": "test_item",
+        "collection": "test_collection",
+        "geometry": {"type": "Point", "coordinates": [0, 0]},
+        "bbox": [0, 0, 0, 0],
+        "properties": {
+            "datetime": "2020-01-01T00:00:00Z",
+            "eo:cloud_cover": 10,
+            **{f"property_{n}": n for n in range(30)},
+        },
+        "links": [{"rel": "self", "href": "http://test/item"}],
+        "assets": {
+            f"asset_{n}": {"href": f"http://test/{n}", "roles": ["data"]}
+            for n in range(20)
+        },
+    }
+    projection = compile_fields(
+        {"id", "properties.datetime", "properties.eo:cloud_cover"}, {"assets"}
+    )
+
+    def pydantic():
+        return Item(**item).dict(**projection.pydantic_fields)
+
+    def project():
+        return projection(item)
+
+    benchmark.group = "Fields projection"
+    projected = benchmark(pydantic if engine == "pydantic" else project)
+    assert set(projected["properties"]) == {"datetime", "eo:cloud_cover"}
@@ -0,0 +1,118 @@
+import inspect
+
+from starlette.testclient import TestClient
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.api.routes import resolve_catalog_path
+from stac_fastapi.extensions.core import TransactionExtension
+from stac_fastapi.types import config, core
+from stac_fastapi.types.resolver import CatalogPathResolver
+
+
+class ResolvedCoreClient(core.BaseCoreClient):
+    def get_catalog(self, catalog_path: str, resolved_catalog=None, **kwargs):
+        return {"id": catalog_path, "handle": resolved_catalog}
+
+    def get_collection(self, collection_id, resolved_catalog=None, **kwargs):
+        return {"id": collection_id, "handle": resolved_catalog}
+
+    def all_collections(self, *args, **kwargs): ...
+
+    def all_catalogs(self, *args, **kwargs): ...
+
+    def get_catalog_collections(self, *args, **kwargs): ...
+
+    def get_item(self, *args, **kwargs): ...
+
+    def get_global_search(self, *args, **kwargs): ...
+
+    def post_global_search(self, *args, **kwargs): ...
+
+    def get_search(self, *args, **kwargs): ...
+
+    def post_search(self, *args, **kwargs): ...
+
+    def item_collection(self, *args, **kwargs): ...
+
+
+class DummyTransactionsClient(core.BaseTransactionsClient):
+    def create_item(self, *args, **kwargs): ...
+
+    def update_item(self, *args, **kwargs): ...
+
+    def delete_item(self, *args, **kwargs): ...
+
+    def create_collection(self, *args, **kwargs): ...
+
+    def update_collection(self, *args, **kwargs): ...
+
+    def delete_collection(self, *args, **kwargs): ...
+
+    def create_catalog(self, *args, **kwargs): ...
+
+    def create_super_catalog(self, *args, **kwargs): ...
+
+    def update_catalog(self, *args, **kwargs): ...
+
+    def delete_catalog(self, *args, **kwargs): ...
+
+
+def _build_api(lookups) -> StacApi:
+    def lookup(parent, catalog_id):
+        lookups.append(catalog_id)
+        return f"{parent}/{catalog_id}" if parent else catalog_id
+
+    settings = config.ApiSettings()
+    return StacApi(
+        settings=settings,
+        client=ResolvedCoreClient(catalog_resolver=CatalogPathResolver(lookup)),
+        extensions=[
+            TransactionExtension(client=DummyTransactionsClient(), settings=settings)
+        ],
+    )
+
+
+def test_resolved_catalog_is_passed_to_client():
+    lookups = []
+    with TestClient(_build_api(lookups).app) as client:
+        response = client.get("/catalogs/cat1/cat2/cat3")
+        assert response.json() == {"id": "cat1/cat2/cat3", "handle": "cat1/cat2/cat3"}
+
+        response = client.get("/catalogs/cat1/cat2/cat3/collections/col")
+        assert response.json() == {"id": "col", "handle": "cat1/cat2/cat3"}
+    assert lookups == ["cat1", "cat2", "cat3"]
+
+
+def test_methods_without_resolved_catalog_are_not_wrapped():
+    resolver = CatalogPathResolver(lambda parent, catalog_id: catalog_id)
+
+    def get_catalog(catalog_path: str, request=None):
+        return catalog_path
+
+    assert resolve_catalog_path(get_catalog, resolver) is get_catalog
+
+    wrapped = resolve_catalog_path(ResolvedCoreClient().get_catalog, resolver)
+    assert wrapped.__name__ == "get_catalog"
+    assert "resolved_catalog" in inspect.signature(wrapped).parameters
+
+
+def test_transactions_invalidate_resolved_paths():
+    lookups = []
+    api = _build_api(lookups)
+    resolver = api.client.catalog_resolver
+    with TestClient(api.app) as client:
+        client.get("/catalogs/cat1/cat2/cat3")
+        client.get("/catalogs/cat1/other")
+
+        client.delete("/catalogs/cat1/cat2")
+        assert resolver.peek("cat1/cat2/cat3") is None
+        assert resolver.peek("cat1/cat2") is None
+        assert resolver.peek("cat1/other") == "cat1/other"
+
+        client.get("/catalogs/cat1/new")
+        client.post("/catalogs/cat1", json={"id": "new"})
+        assert resolver.peek("cat1/new") is None
+        assert resolver.peek("cat1") == "cat1"
+
+        client.put("/catalogs/cat1", json={"id": "cat1"})
+        assert len(resolver.cache) == 0
@@ -0,0 +1,159 @@
+from datetime import datetime, timezone
+
+import pytest
+from starlette.testclient import TestClient
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.types import config, core
+from stac_fastapi.types.conditional import Versioned
+
+ITEM = {
+    "type": "Feature",
+    "stac_version": "1.0.0",
+    "id": "test_item",
+    "geometry": {"type": "Point", "coordinates": [0, 0]},
+    "bbox": [0, 0, 0, 0],
+    "properties": {"datetime": "2000-01-01T00:00:00Z"},
+    "links": [],
+    "assets": {},
+}
+UPDATED = datetime(2024, 1, 1, 12, 30, 15, 500, tzinfo=timezone.utc)
+
+
+class VersionedCoreClient(core.BaseCoreClient):
+    bodies_built = 0
+
+    def get_item(self, item_id: str, *args, **kwargs):
+        return ITEM
+
+    def _build_collection(self):
+        self.bodies_built += 1
+        return {"id": "test_collection", "links": []}
+
+    def get_collection(self, *args, **kwargs):
+        return Versioned(self._build_collection, etag="v1", last_modified=UPDATED)
+
+    def get_catalog(self, *args, **kwargs):
+        return Versioned({"id": "test_catalog", "links": []}, last_modified=UPDATED)
+
+    def all_collections(self, *args, **kwargs): ...
+
+    def all_catalogs(self, *args, **kwargs): ...
+
+    def get_catalog_collections(self, *args, **kwargs): ...
+
+    def get_global_search(self, *args, **kwargs): ...
+
+    def post_global_search(self, *args, **kwargs): ...
+
+    def get_search(self, *args, **kwargs): ...
+
+    def post_search(self, *args, **kwargs): ...
+
+    def item_collection(self, *args, **kwargs): ...
+
+
+@pytest.fixture
+def api():
+    return StacApi(settings=config.ApiSettings(), client=VersionedCoreClient())
+
+
+def test_etag_computed_from_body(api):
+    with TestClient(api.app) as client:
+        url = "/catalogs/cat/collections/col/items/test_item"
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/geo+json"
+        assert response.json() == ITEM
+        etag = response.headers["etag"]
+        assert etag.startswith('"')
+
+        response = client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+
+def test_client_supplied_etag_skips_body(api):
+    with TestClient(api.app) as client:
+        url = "/catalogs/cat/collections/test_collection"
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"v1"'
+        assert response.headers["last-modified"] == "Mon, 01 Jan 2024 12:30:15 GMT"
+        assert api.client.bodies_built == 1
+
+        response = client.get(url, headers={"If-None-Match": '"v1"'})
+        assert response.status_code == 304
+        assert response.headers["last-modified"] == "Mon, 01 Jan 2024 12:30:15 GMT"
+        assert api.client.bodies_built == 1
+
+        # If-Modified-Since is ignored when If-None-Match is sent
+        response = client.get(
+            url,
+            headers={
+                "If-None-Match": '"v0"',
+                "If-Modified-Since": "Mon, 01 Jan 2024 12:30:15 GMT",
+            },
+        )
+        assert response.status_code == 200
+        assert api.client.bodies_built == 2
+
+
+@pytest.mark.parametrize(
+    "if_modified_since,status_code",
+    [
+        ("Mon, 01 Jan 2024 12:30:15 GMT", 304),
+        ("Tue, 02 Jan 2024 00:00:00 GMT", 304),
+        ("Mon, 01 Jan 2024 12:30:14 GMT", 200),
+        ("not a date", 200),
+    ],
+)
+def test_if_modified_since(api, if_modified_since, status_code):
+    with TestClient(api.app) as client:
+        response = client.get(
+            "/catalogs/test_catalog", headers={"If-Modified-Since": if_modified_since}
+        )
+    assert response.status_code == status_code
+    assert response.headers["last-modified"] == "Mon, 01 Jan 2024 12:30:15 GMT"
+    # the entity tag is computed from the body, which is not serialized for a 304
+    assert ("etag" in response.headers) == (status_code == 200)
+
+
+def test_conditional_with_response_models():
+    api = StacApi(
+        settings=config.ApiSettings(enable_response_models=True),
+        client=VersionedCoreClient(),
+    )
+    with TestClient(api.app) as client:
+        response = client.get("/catalogs/cat/collections/col/items/test_item")
+    assert response.status_code == 200
+    assert response.json()["id"] == "test_item"
+    assert "etag" in response.headers
+
+
+class EncodedCoreClient(VersionedCoreClient):
+    def get_catalog(self, *args, **kwargs):
+        return {"id": "test_catalog", "links": [], "updated": UPDATED}
+
+
+def test_bodies_are_json_encoded():
+    api = StacApi(settings=config.ApiSettings(), client=EncodedCoreClient())
+    with TestClient(api.app) as client:
+        response = client.get("/catalogs/test_catalog")
+        assert response.status_code == 200
+        assert response.json()["updated"] == UPDATED.isoformat()
+
+
+def test_versioned_bodies_are_sample_validated():
+    api = StacApi(
+        settings=config.ApiSettings(response_validation_sample_rate=1),
+        client=VersionedCoreClient(),
+    )
+    with TestClient(api.app) as client:
+        url = "/catalogs/cat/collections/test_collection"
+        assert client.get(url).status_code == 200
+        assert client.get(url, headers={"If-None-Match": '"v1"'}).status_code == 304
+    # only the body sent is validated, and it is not a valid collection
+    assert api.response_validation.sampled == 1
+    assert api.response_validation.violations_by_model["Collection"] == 1
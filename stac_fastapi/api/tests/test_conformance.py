@@ -0,0 +1,85 @@
+from starlette.testclient import TestClient
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.extensions.core import FieldsExtension, SortExtension
+from stac_fastapi.types import config, core
+from stac_fastapi.types.conformance import BASE_CONFORMANCE_CLASSES
+
+
+class DummyCoreClient(core.BaseCoreClient):
+    def all_collections(self, *args, **kwargs):
+        return {"collections": [], "links": []}
+
+    def all_catalogs(self, *args, **kwargs): ...
+
+    def get_catalog(self, *args, **kwargs): ...
+
+    def get_catalog_collections(self, *args, **kwargs): ...
+
+    def get_collection(self, *args, **kwargs): ...
+
+    def get_item(self, *args, **kwargs): ...
+
+    def get_global_search(self, *args, **kwargs): ...
+
+    def post_global_search(self, *args, **kwargs): ...
+
+    def get_search(self, *args, **kwargs): ...
+
+    def post_search(self, *args, **kwargs): ...
+
+    def item_collection(self, *args, **kwargs): ...
+
+
+class CustomConformanceClient(DummyCoreClient):
+    def conformance(self, **kwargs):
+        return {"conformsTo": ["https://example.com/custom"]}
+
+
+def _build_api(client: core.BaseCoreClient) -> StacApi:
+    return StacApi(
+        settings=config.ApiSettings(),
+        client=client,
+        extensions=[FieldsExtension(), SortExtension(), SortExtension()],
+    )
+
+
+def test_conformance_is_prerendered_with_etag():
+    api = _build_api(DummyCoreClient())
+    with TestClient(api.app) as client:
+        response = client.get("/conformance")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        etag = response.headers["etag"]
+
+        conforms_to = response.json()["conformsTo"]
+        assert len(conforms_to) == len(set(conforms_to))
+        assert "https://api.stacspec.org/v1.0.0/item-search#fields" in conforms_to
+        assert "https://api.stacspec.org/v1.0.0/item-search#sort" in conforms_to
+
+        landing_page = client.get("/").json()
+        assert landing_page["conformsTo"] == conforms_to
+
+        response = client.get("/conformance", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        response = client.get("/conformance", headers={"If-None-Match": '"other"'})
+        assert response.status_code == 200
+
+
+def test_conformance_does_not_mutate_base_classes():
+    base_conformance_classes = list(BASE_CONFORMANCE_CLASSES)
+    api = _build_api(DummyCoreClient())
+    api.client.list_conformance_classes()
+    api.client.list_conformance_classes()
+    assert BASE_CONFORMANCE_CLASSES == base_conformance_classes
+
+
+def test_custom_conformance_is_not_prerendered():
+    api = _build_api(CustomConformanceClient())
+    with TestClient(api.app) as client:
+        response = client.get("/conformance")
+        assert response.status_code == 200
+        assert response.json() == {"conformsTo": ["https://example.com/custom"]}
+        assert "etag" not in response.headers
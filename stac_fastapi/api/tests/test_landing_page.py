@@ -0,0 +1,133 @@
+import pytest
+from starlette.testclient import TestClient
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.extensions.core import TransactionExtension
+from stac_fastapi.types import config, core
+from stac_fastapi.types.cache import TTLCache
+
+
+class CountingCoreClient(core.BaseCoreClient):
+    all_collections_calls = 0
+
+    def all_collections(self, *args, **kwargs):
+        self.all_collections_calls += 1
+        return {"collections": [{"id": "test_collection"}], "links": []}
+
+    def all_catalogs(self, *args, **kwargs): ...
+
+    def get_catalog(self, *args, **kwargs): ...
+
+    def get_catalog_collections(self, *args, **kwargs): ...
+
+    def get_collection(self, *args, **kwargs): ...
+
+    def get_item(self, *args, **kwargs): ...
+
+    def get_global_search(self, *args, **kwargs): ...
+
+    def post_global_search(self, *args, **kwargs): ...
+
+    def get_search(self, *args, **kwargs): ...
+
+    def post_search(self, *args, **kwargs): ...
+
+    def item_collection(self, *args, **kwargs): ...
+
+
+class DummyTransactionsClient(core.BaseTransactionsClient):
+    def create_item(self, *args, **kwargs):
+        return "dummy response"
+
+    def update_item(self, *args, **kwargs):
+        return "dummy response"
+
+    def delete_item(self, *args, **kwargs):
+        return "dummy response"
+
+    def create_collection(self, *args, **kwargs):
+        return "dummy response"
+
+    def update_collection(self, *args, **kwargs):
+        return "dummy response"
+
+    def delete_collection(self, *args, **kwargs):
+        return "dummy response"
+
+    def create_catalog(self, *args, **kwargs):
+        return "dummy response"
+
+    def create_super_catalog(self, *args, **kwargs):
+        return "dummy response"
+
+    def update_catalog(self, *args, **kwargs):
+        return "dummy response"
+
+    def delete_catalog(self, *args, **kwargs):
+        return "dummy response"
+
+
+def _build_api(landing_page_cache_ttl: float, **client_kwargs) -> StacApi:
+    settings = config.ApiSettings(landing_page_cache_ttl=landing_page_cache_ttl)
+    return StacApi(
+        settings=settings,
+        client=CountingCoreClient(**client_kwargs),
+        extensions=[
+            TransactionExtension(client=DummyTransactionsClient(), settings=settings)
+        ],
+    )
+
+
+@pytest.mark.parametrize("ttl,expected_calls", [(0, 2), (60, 1)])
+def test_landing_page_cache(ttl, expected_calls):
+    api = _build_api(ttl)
+    with TestClient(api.app) as client:
+        first = client.get("/")
+        second = client.get("/")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert api.client.all_collections_calls == expected_calls
+
+
+def test_client_landing_page_cache_is_kept():
+    cache = TTLCache(ttl=60)
+    api = _build_api(0, landing_page_cache=cache)
+    assert api.client.landing_page_cache is cache
+    with TestClient(api.app) as client:
+        client.get("/")
+        client.get("/")
+
+    assert api.client.all_collections_calls == 1
+    assert len(cache) == 1
+
+
+def test_landing_page_cache_keyed_by_base_url():
+    api = _build_api(60)
+    with TestClient(api.app) as client:
+        client.get("/")
+        response = client.get("/", headers={"host": "another-host"})
+
+    assert api.client.all_collections_calls == 2
+    assert all(
+        link["href"].startswith("http://another-host/")
+        for link in response.json()["links"]
+    )
+
+
+def test_landing_page_cache_invalidated_by_transactions():
+    api = _build_api(60)
+    with TestClient(api.app) as client:
+        client.get("/")
+        client.get("/")
+        assert api.client.all_collections_calls == 1
+
+        # Item transactions do not change the landing page
+        client.post("/catalogs/cat/collections/test_collection/items", json={})
+        client.get("/")
+        assert api.client.all_collections_calls == 1
+
+        response = client.post("/catalogs/cat/collections", json={})
+        assert response.status_code == 200
+        client.get("/")
+        assert api.client.all_collections_calls == 2
@@ -0,0 +1,290 @@
+import inspect
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.api.models import (
+    create_get_catalog_request_model,
+    create_post_catalog_full_request_model,
+)
+from stac_fastapi.api.routes import project_fields, resolve_count_mode
+from stac_fastapi.extensions.core import (
+    CountExtension,
+    FieldsExtension,
+    TokenPaginationExtension,
+)
+from stac_fastapi.types import config
+from stac_fastapi.types.count import CountMode, set_matched
+from stac_fastapi.types.memory import (
+    AsyncInMemoryCoreClient,
+    InMemoryCoreClient,
+    ItemStore,
+)
+from stac_fastapi.types.search import BaseCatalogSearchGetRequest
+
+
+def _item(n: int, collection: str = "col"):
+    x = n % 20 * 10 - 95
+    return {
+        "type": "Feature",
+        "stac_version": "1.0.0",
+        "id": f"item_{n}",
+        "collection": collection,
+        "geometry": {"type": "Point", "coordinates": [x, 0]},
+        "bbox": [x, 0, x, 0],
+        "properties": {"datetime": f"2020-01-{n % 28 + 1:02d}T00:00:00Z"},
+        "links": [{"rel": "license", "href": "/license.html"}],
+        "assets": {},
+    }
+
+
+def _store() -> ItemStore:
+    store = ItemStore()
+    store.add_catalog("cat", {"type": "Catalog", "id": "cat", "links": []})
+    store.add_catalog("cat/sub", {"type": "Catalog", "id": "sub", "links": []})
+    for catalog_path, collection_id in [("cat", "col"), ("cat/sub", "other")]:
+        store.add_collection(
+            catalog_path, {"type": "Collection", "id": collection_id, "links": []}
+        )
+    store.add_items("cat", [_item(n) for n in range(100)])
+    store.add_items("cat/sub", [_item(n, "other") for n in range(10)])
+    return store
+
+
+def _api(client, extensions, **settings) -> StacApi:
+    return StacApi(
+        settings=config.ApiSettings(**settings),
+        client=client,
+        extensions=extensions,
+        search_catalog_get_request_model=create_get_catalog_request_model(
+            extensions, base_model=BaseCatalogSearchGetRequest
+        ),
+        search_catalog_post_request_model=create_post_catalog_full_request_model(
+            extensions
+        ),
+    )
+
+
+@pytest.fixture(params=[InMemoryCoreClient, AsyncInMemoryCoreClient])
+def client(request):
+    api = _api(request.param(store=_store()), [TokenPaginationExtension()])
+    with TestClient(api.app) as client:
+        yield client
+
+
+def _ids(response):
+    assert response.status_code == 200, response.text
+    return [feature["id"] for feature in response.json()["features"]]
+
+
+def test_get_item(client):
+    response = client.get("/catalogs/cat/collections/col/items/item_1")
+    assert response.status_code == 200
+    links = {link["rel"]: link["href"] for link in response.json()["links"]}
+    assert (
+        links["self"] == "http://testserver/catalogs/cat/collections/col/items/item_1"
+    )
+    assert links["license"] == "http://testserver/license.html"
+
+    response = client.get("/catalogs/cat/collections/col/items/missing")
+    assert response.status_code == 404
+
+
+def test_catalogs_and_collections(client):
+    assert client.get("/catalogs/cat").json()["id"] == "cat"
+    assert client.get("/catalogs/missing").status_code == 404
+    collections = client.get("/catalogs/cat/collections").json()["collections"]
+    assert [c["id"] for c in collections] == ["col"]
+    assert client.get("/catalogs/cat/sub/collections/other").status_code == 200
+    assert len(client.get("/collections").json()["collections"]) == 2
+
+
+def test_search_filters(client):
+    assert _ids(
+        client.get("/catalogs/cat/search", params={"ids": "item_3,item_5"})
+    ) == [
+        "item_3",
+        "item_5",
+        "item_3",
+        "item_5",
+    ]
+    assert _ids(
+        client.get(
+            "/catalogs/cat/search", params={"ids": "item_3", "collections": "other"}
+        )
+    ) == ["item_3"]
+    assert _ids(
+        client.get(
+            "/catalogs/cat/search",
+            params={
+                "bbox": "-96,-1,-94,1",
+                "datetime": "2020-01-01T00:00:00Z/..",
+                "limit": 100,
+            },
+        )
+    ) == ["item_0", "item_20", "item_40", "item_60", "item_80", "item_0"]
+    assert _ids(
+        client.get(
+            "/catalogs/cat/search",
+            params={"bbox": "-96,-1,-94,1", "datetime": "2020-01-02T00:00:00Z/.."},
+        )
+    ) == ["item_20", "item_40", "item_60", "item_80"]
+    intersects = {"type": "Point", "coordinates": [-95, 0]}
+    assert _ids(
+        client.post(
+            "/catalogs/cat/sub/search",
+            json={"intersects": intersects, "datetime": "2020-01-01T00:00:00Z"},
+        )
+    ) == ["item_0"]
+    assert _ids(
+        client.get(
+            "/catalogs/cat/search",
+            params={"intersects": json.dumps(intersects), "collections": "other"},
+        )
+    ) == ["item_0"]
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_search_pagination(client, method):
+    ids = []
+    if method == "GET":
+        response = client.get("/catalogs/cat/search", params={"limit": 30})
+    else:
+        response = client.post("/catalogs/cat/search", json={"limit": 30})
+    for _ in range(10):
+        page = response.json()
+        ids.extend(feature["id"] for feature in page["features"])
+        next_links = [link for link in page["links"] if link["rel"] == "next"]
+        if not next_links:
+            break
+        if method == "GET":
+            response = client.get(next_links[0]["href"])
+        else:
+            response = client.post(
+                next_links[0]["href"], json={"limit": 30, **next_links[0]["body"]}
+            )
+    assert len(ids) == 110
+    assert client.get("/catalogs/cat/search", params={"token": "x"}).status_code == 400
+
+
+def test_item_collection(client):
+    response = client.get("/catalogs/cat/collections/col/items", params={"limit": 500})
+    assert len(_ids(response)) == 100
+    assert client.get("/catalogs/cat/collections/missing/items").status_code == 404
+
+
+@pytest.mark.parametrize("client_class", [InMemoryCoreClient, AsyncInMemoryCoreClient])
+def test_search_fields_projection(client_class):
+    extensions = [TokenPaginationExtension(), FieldsExtension()]
+    api = _api(client_class(store=_store()), extensions)
+    with TestClient(api.app) as client:
+        features = client.get(
+            "/catalogs/cat/search",
+            params={
+                "ids": "item_1",
+                "collections": "col",
+                "fields": "properties.datetime,-links",
+            },
+        ).json()["features"]
+        assert features == [
+            {
+                "id": "item_1",
+                "collection": "col",
+                "type": "Feature",
+                "stac_version": "1.0.0",
+                "geometry": {"type": "Point", "coordinates": [-85, 0]},
+                "bbox": [-85, 0, -85, 0],
+                "assets": {},
+                "properties": {"datetime": "2020-01-02T00:00:00Z"},
+            }
+        ]
+        features = client.post(
+            "/catalogs/cat/search",
+            json={"ids": ["item_1"], "fields": {"exclude": ["assets"]}},
+        ).json()["features"]
+        assert len(features) == 2
+        assert all("assets" not in feature for feature in features)
+        assert all(feature["links"] for feature in features)
+        response = client.get("/catalogs/cat/search", params={"ids": "item_1"})
+        assert response.json()["features"][0]["links"]
+
+
+@pytest.mark.parametrize("enable_response_models", [False, True])
+@pytest.mark.parametrize("client_class", [InMemoryCoreClient, AsyncInMemoryCoreClient])
+def test_search_count_modes(client_class, enable_response_models):
+    extensions = [TokenPaginationExtension(), CountExtension(default_mode="none")]
+    api = _api(
+        client_class(store=_store()),
+        extensions,
+        enable_response_models=enable_response_models,
+    )
+    with TestClient(api.app) as client:
+        page = client.get("/catalogs/cat/search", params={"limit": 5}).json()
+        assert "numberMatched" not in page
+        assert page["context"] == {"returned": 5, "limit": 5, "count": "none"}
+
+        page = client.get(
+            "/catalogs/cat/search", params={"count": "exact", "collections": "col"}
+        ).json()
+        assert page["numberMatched"] == page["context"]["matched"] == 100
+        assert page["context"] == {
+            "returned": 10,
+            "limit": 10,
+            "matched": 100,
+            "count": "exact",
+        }
+
+        page = client.post(
+            "/catalogs/cat/search",
+            json={"count": "estimated", "bbox": [-100, -1, -80, 1]},
+        ).json()
+        assert page["context"]["count"] == "estimated"
+        assert page["numberMatched"] >= 12
+
+        assert (
+            client.get("/catalogs/cat/search", params={"count": "x"}).status_code == 400
+        )
+
+
+def test_search_wrappers_keep_the_method_identity():
+    method = InMemoryCoreClient(store=_store()).get_search
+    for wrapped in [
+        project_fields(method),
+        resolve_count_mode(method, CountMode.none),
+        resolve_count_mode(project_fields(method), CountMode.none),
+    ]:
+        assert wrapped.__name__ == "get_search"
+        assert wrapped.__doc__ == method.__doc__
+        assert inspect.signature(wrapped) == inspect.signature(method)
+
+
+def test_store_count():
+    store = _store()
+    search = {"catalog_paths": ["cat"], "bbox": [-100, -1, -80, 1], "nested": False}
+    assert store.count(**search) == 10
+    assert store.count(**search, mode=CountMode.estimated) >= 10
+    assert store.count(**search, mode=CountMode.none) is None
+    assert store.count(mode=CountMode.estimated) == len(store) == 110
+
+
+def test_set_matched():
+    item_collection = {"type": "FeatureCollection", "features": [_item(1)]}
+    assert set_matched(item_collection, "estimated", 7) == {
+        "type": "FeatureCollection",
+        "features": [_item(1)],
+        "numberMatched": 7,
+        "context": {"returned": 1, "matched": 7, "count": "estimated"},
+    }
+
+
+def test_store_writes():
+    store = _store()
+    store.add_item("cat", {**_item(1), "bbox": [50, 50, 50, 50]})
+    store.delete_item("cat", "col", "item_2")
+    assert len(store) == 109
+    rows, _ = store.search(bbox=[49, 49, 51, 51])
+    assert [store.row(row)[1]["id"] for row in rows] == ["item_1"]
+    rows, _ = store.search(ids=["item_2"], collections=["col"])
+    assert rows == []
@@ -1,3 +1,4 @@
+import asyncio
 from unittest import mock
 
 import pytest
@@ -153,6 +154,19 @@ def test_replace_header_value_by_name(
             },
             ("https", "test", 1234),
         ),
+        (
+            {
+                "scheme": "http",
+                "server": ["testserver", 80],
+                "headers": [
+                    (
+                        b"forwarded",
+                        b'for=1.2.3.4;Proto=https;Host="test:1234", for=5.6.7.8;host=b',
+                    ),
+                ],
+            },
+            ("https", "test", 1234),
+        ),
     ],
 )
 def test_get_forwarded_url_parts(
@@ -166,3 +180,27 @@ def test_cors_middleware(test_client):
     resp = test_client.get("/_mgmt/ping", headers={"Origin": "http://netloc"})
     assert resp.status_code == 200
     assert resp.headers["access-control-allow-origin"] == "*"
+
+
+@pytest.mark.parametrize(
+    "headers,expected_host",
+    [
+        ([(b"host", b"testserver")], b"testserver"),
+        ([(b"host", b"testserver"), (b"forwarded", b"proto=https;host=test")], b"test"),
+        (
+            [(b"host", b"testserver"), (b"x-forwarded-port", b"8080")],
+            b"testserver:8080",
+        ),
+    ],
+)
+def test_proxy_header_middleware_host(headers, expected_host):
+    received = {}
+
+    async def app(scope, receive, send):
+        received.update(scope)
+
+    scope = {"type": "http", "scheme": "http", "server": ["testserver", 80]}
+    asyncio.run(ProxyHeaderMiddleware(app)({**scope, "headers": headers}, None, None))
+    assert [value for name, value in received["headers"] if name == b"host"] == [
+        expected_host
+    ]
@@ -0,0 +1,92 @@
+import gzip
+
+from starlette.testclient import TestClient
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.api.openapi import OPENAPI_MEDIA_TYPE
+from stac_fastapi.types import config, core
+
+
+class DummyCoreClient(core.BaseCoreClient):
+    def all_collections(self, *args, **kwargs): ...
+
+    def all_catalogs(self, *args, **kwargs): ...
+
+    def get_catalog(self, *args, **kwargs): ...
+
+    def get_catalog_collections(self, *args, **kwargs): ...
+
+    def get_collection(self, *args, **kwargs): ...
+
+    def get_item(self, *args, **kwargs): ...
+
+    def get_global_search(self, *args, **kwargs): ...
+
+    def post_global_search(self, *args, **kwargs): ...
+
+    def get_search(self, *args, **kwargs): ...
+
+    def post_search(self, *args, **kwargs): ...
+
+    def item_collection(self, *args, **kwargs): ...
+
+
+def _build_api() -> StacApi:
+    return StacApi(settings=config.ApiSettings(), client=DummyCoreClient())
+
+
+def test_openapi_prerendered_at_startup():
+    api = _build_api()
+    assert getattr(api.app.state, "openapi_document", None) is None
+    with TestClient(api.app) as client:
+        document = api.app.state.openapi_document
+        assert document is not None
+
+        response = client.get("/api", headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == OPENAPI_MEDIA_TYPE
+        assert "content-encoding" not in response.headers
+        assert response.content == document.body
+        assert response.json()["paths"]["/search"]
+
+        etag = response.headers["etag"]
+        response = client.get(
+            "/api", headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+
+
+def test_openapi_gzip():
+    api = _build_api()
+    with TestClient(api.app) as client:
+        response = client.get("/api", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    # httpx decodes the body
+    assert response.content == api.app.state.openapi_document.body
+    assert gzip.decompress(api.app.state.openapi_document.gzip_body) == (
+        response.content
+    )
+
+
+def test_openapi_rendered_on_first_request_without_startup():
+    api = _build_api()
+    response = TestClient(api.app).get("/api")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == OPENAPI_MEDIA_TYPE
+    assert response.content == api.app.state.openapi_document.body
+
+
+def test_openapi_servers_follow_request_root_path():
+    api = _build_api()
+    with TestClient(api.app) as client:
+        assert "servers" not in client.get("/api").json()
+    with TestClient(api.app, root_path="/stac") as client:
+        assert client.get("/api").json()["servers"] == [{"url": "/stac"}]
+    assert set(api.app.state.openapi_documents) == {"", "/stac"}
+
+    api = _build_api()
+    api.app.root_path = "/static"
+    with TestClient(api.app) as client:
+        assert client.get("/api").json()["servers"] == [{"url": "/static"}]
@@ -0,0 +1,234 @@
+import os
+
+import pytest
+from fastapi import Depends, HTTPException, Request
+from starlette.testclient import TestClient
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.api.response_cache import (
+    CachePolicy,
+    FileCacheBackend,
+    MemoryCacheBackend,
+    ResponseCache,
+    purge_response_cache,
+)
+from stac_fastapi.extensions.core import TransactionExtension
+from stac_fastapi.types import config, core
+
+
+class CountingCoreClient(core.BaseCoreClient):
+    calls = 0
+
+    def _response(self, **kwargs):
+        self.calls += 1
+        return {"calls": self.calls, "links": []}
+
+    def all_collections(self, *args, **kwargs):
+        return self._response()
+
+    def get_catalog(self, *args, **kwargs):
+        return self._response()
+
+    def get_collection(self, *args, **kwargs):
+        return self._response()
+
+    def get_global_search(self, *args, **kwargs):
+        return self._response()
+
+    def post_global_search(self, *args, **kwargs):
+        return self._response()
+
+    def all_catalogs(self, *args, **kwargs): ...
+
+    def get_catalog_collections(self, *args, **kwargs): ...
+
+    def get_item(self, *args, **kwargs): ...
+
+    def get_search(self, *args, **kwargs): ...
+
+    def post_search(self, *args, **kwargs): ...
+
+    def item_collection(self, *args, **kwargs): ...
+
+
+class DummyTransactionsClient(core.BaseTransactionsClient):
+    def create_item(self, *args, **kwargs):
+        return {}
+
+    def update_item(self, *args, **kwargs): ...
+
+    def delete_item(self, *args, **kwargs): ...
+
+    def create_collection(self, *args, **kwargs): ...
+
+    def update_collection(self, *args, **kwargs): ...
+
+    def delete_collection(self, *args, **kwargs): ...
+
+    def create_catalog(self, *args, **kwargs): ...
+
+    def create_super_catalog(self, *args, **kwargs): ...
+
+    def update_catalog(self, *args, **kwargs): ...
+
+    def delete_catalog(self, *args, **kwargs): ...
+
+
+@pytest.fixture(params=["memory", "file"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCacheBackend()
+    return FileCacheBackend(directory=str(tmp_path))
+
+
+@pytest.fixture
+def api(backend) -> StacApi:
+    settings = config.ApiSettings()
+    cache = ResponseCache(
+        policies=[
+            CachePolicy(
+                scopes=[
+                    {"path": "/search"},
+                    {"path": "/search", "method": "POST"},
+                    {"path": "/catalogs/{catalog_path:path}"},
+                ]
+            )
+        ],
+        backend=backend,
+    )
+    return StacApi(
+        settings=settings,
+        client=CountingCoreClient(),
+        extensions=[
+            TransactionExtension(client=DummyTransactionsClient(), settings=settings)
+        ],
+        response_cache=cache,
+    )
+
+
+def test_get_cached(api):
+    with TestClient(api.app) as client:
+        first = client.get("/search", params=[("limit", 10), ("ids", "a")])
+        second = client.get("/search", params=[("ids", "a"), ("limit", 10)])
+        other = client.get("/search", params={"limit": 20})
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert first.json() == second.json() == {"calls": 1, "links": []}
+    assert second.headers["content-type"] == first.headers["content-type"]
+    assert other.json()["calls"] == 2
+
+
+def test_post_cached_by_body(api):
+    with TestClient(api.app) as client:
+        first = client.post("/search", json={"limit": 10})
+        second = client.post("/search", json={"limit": 10})
+        other = client.post("/search", json={"limit": 20})
+
+    assert second.headers["x-cache"] == "HIT"
+    assert first.json() == second.json()
+    assert other.json()["calls"] == 2
+
+
+def test_uncached_routes_and_requests(api):
+    with TestClient(api.app) as client:
+        client.get("/collections")
+        response = client.get("/collections")
+        assert "x-cache" not in response.headers
+        assert response.json()["calls"] == 2
+
+        client.get("/search")
+        response = client.get("/search", headers={"Cache-Control": "no-cache"})
+        assert response.json()["calls"] == 4
+
+
+def test_transactions_purge_affected_catalogs(api):
+    with TestClient(api.app) as client:
+        for url in ["/catalogs/cat1/collections/col", "/catalogs/cat2", "/search"]:
+            client.get(url)
+
+        response = client.post("/catalogs/cat1/sub/collections/col/items", json={})
+        assert response.status_code == 200
+
+        assert client.get("/catalogs/cat1/collections/col").headers["x-cache"] == "MISS"
+        assert client.get("/search").headers["x-cache"] == "MISS"
+        response = client.get("/catalogs/cat2")
+        assert response.headers["x-cache"] == "HIT"
+
+        etag = response.headers["etag"]
+        response = client.get("/catalogs/cat2", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+
+def test_unsafe_methods_are_not_cached():
+    policy = CachePolicy([{"path": "/catalogs/{catalog_path:path}"}])
+    assert policy.matches("GET", "/catalogs/cat/collections/col/items")
+    assert policy.matches("HEAD", "/catalogs/cat")
+    for method in ["POST", "PUT", "PATCH", "DELETE"]:
+        assert not policy.matches(method, "/catalogs/cat/collections/col/items")
+
+    policy = CachePolicy([{"path": "/search", "method": "POST"}])
+    assert policy.matches("POST", "/search")
+    assert not policy.matches("GET", "/search")
+    with pytest.raises(ValueError):
+        CachePolicy([{"path": "/catalogs/{catalog_path:path}", "method": "DELETE"}])
+
+
+def test_purge_wrapper_keeps_the_endpoint_identity():
+    def create_item(*args, **kwargs):
+        """Create an item."""
+
+    wrapped = purge_response_cache(create_item)
+    assert wrapped.__name__ == "create_item"
+    assert wrapped.__doc__ == "Create an item."
+
+
+def _authorized(request: Request):
+    if request.headers.get("authorization") != "Bearer secret":
+        raise HTTPException(status_code=401)
+
+
+def test_authenticated_requests_are_not_cached(backend):
+    collection = "/catalogs/{catalog_path:path}/collections/{collection_id}"
+    api = StacApi(
+        settings=config.ApiSettings(),
+        client=CountingCoreClient(),
+        route_dependencies=[
+            ([{"path": collection, "method": "GET"}], [Depends(_authorized)])
+        ],
+        response_cache=ResponseCache(
+            policies=[CachePolicy(scopes=[{"path": collection}])], backend=backend
+        ),
+    )
+    authorization = {"Authorization": "Bearer secret"}
+    with TestClient(api.app) as client:
+        assert client.get("/catalogs/cat/collections/col").status_code == 401
+        response = client.get("/catalogs/cat/collections/col", headers=authorization)
+        assert response.status_code == 200
+        assert "x-cache" not in response.headers
+        assert client.get("/catalogs/cat/collections/col").status_code == 401
+        response = client.get("/catalogs/cat/collections/col", headers=authorization)
+        assert response.json()["calls"] == 2
+        response = client.get(
+            "/catalogs/cat/collections/col", headers={"Cookie": "session=x"}
+        )
+        assert response.status_code == 401
+
+
+def test_file_backend_removes_files(tmp_path):
+    backend = FileCacheBackend(directory=str(tmp_path), maxsize=1)
+    cache = ResponseCache(
+        policies=[CachePolicy([{"path": "/search"}])], backend=backend
+    )
+    api = StacApi(
+        settings=config.ApiSettings(),
+        client=CountingCoreClient(),
+        response_cache=cache,
+    )
+    with TestClient(api.app) as client:
+        client.get("/search", params={"limit": 1})
+        client.get("/search", params={"limit": 2})
+        assert len(os.listdir(tmp_path)) == 1
+
+        cache.purge_catalog(None)
+        assert os.listdir(tmp_path) == []
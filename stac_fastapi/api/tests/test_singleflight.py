@@ -0,0 +1,155 @@
+import asyncio
+
+import httpx
+import pytest
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.api.singleflight import SingleFlight
+from stac_fastapi.types import config, core
+
+ITEM_COLLECTION = {"type": "FeatureCollection", "features": [], "links": []}
+
+
+class GatedCoreClient(core.AsyncBaseCoreClient):
+    """Search calls wait for `gate`, so that concurrent requests overlap."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gate = asyncio.Event()
+        self.searches = []
+
+    async def _search(self, collections):
+        self.searches.append(collections)
+        await self.gate.wait()
+        return {**ITEM_COLLECTION, "context": {"collections": sorted(collections)}}
+
+    async def get_search(self, *args, collections=None, **kwargs):
+        return await self._search(collections or [])
+
+    async def post_search(self, search_request, *args, **kwargs):
+        return await self._search(search_request.collections or [])
+
+    async def all_collections(self, *args, **kwargs): ...
+
+    async def all_catalogs(self, *args, **kwargs): ...
+
+    async def get_catalog(self, *args, **kwargs): ...
+
+    async def get_catalog_collections(self, *args, **kwargs): ...
+
+    async def get_collection(self, *args, **kwargs): ...
+
+    async def get_item(self, *args, **kwargs): ...
+
+    async def get_global_search(self, *args, **kwargs): ...
+
+    async def post_global_search(self, *args, **kwargs): ...
+
+    async def item_collection(self, *args, **kwargs): ...
+
+
+async def _concurrent_searches(enabled: bool, requests):
+    client = GatedCoreClient()
+    api = StacApi(
+        settings=config.ApiSettings(search_single_flight=enabled), client=client
+    )
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://testserver"
+    ) as http:
+        tasks = [asyncio.ensure_future(http.request(**r)) for r in requests]
+        while len(client.searches) + api.single_flight.stats.coalesced < len(requests):
+            await asyncio.sleep(0.01)
+        client.gate.set()
+        responses = await asyncio.gather(*tasks)
+    return api, client, responses
+
+
+SAME_SEARCHES = [
+    {"method": "GET", "url": "/catalogs/cat/search?collections=a,b"},
+    {"method": "GET", "url": "/catalogs/cat/search?collections=b,a"},
+    {
+        "method": "POST",
+        "url": "/catalogs/cat/search",
+        "json": {"collections": ["a", "b"]},
+    },
+]
+
+
+def test_identical_searches_are_coalesced():
+    api, client, responses = asyncio.run(_concurrent_searches(True, SAME_SEARCHES))
+    assert len(client.searches) == 1
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert len({r.content for r in responses}) == 1
+    assert responses[0].json()["context"] == {"collections": ["a", "b"]}
+    assert responses[0].headers["content-type"] == "application/geo+json"
+
+    stats = api.single_flight.stats
+    assert (stats.calls, stats.executions, stats.coalesced) == (3, 1, 2)
+    assert stats.ratio == pytest.approx(2 / 3)
+    assert len(api.single_flight) == 0
+
+
+def test_single_flight_disabled():
+    _, client, responses = asyncio.run(_concurrent_searches(False, SAME_SEARCHES))
+    assert len(client.searches) == 3
+    assert [r.status_code for r in responses] == [200, 200, 200]
+
+
+def test_different_searches_are_not_coalesced():
+    requests = [
+        {"method": "GET", "url": "/catalogs/cat/search?collections=a"},
+        {"method": "GET", "url": "/catalogs/cat/search?collections=b"},
+        {"method": "GET", "url": "/catalogs/other/search?collections=a"},
+    ]
+    api, client, _ = asyncio.run(_concurrent_searches(True, requests))
+    assert len(client.searches) == 3
+    assert api.single_flight.stats.coalesced == 0
+
+
+def test_feature_sequences_are_not_coalesced():
+    requests = [
+        {
+            "method": "GET",
+            "url": "/catalogs/cat/search?collections=a",
+            "headers": {"Accept": "application/geo+json-seq"},
+        }
+    ] * 2
+    api, client, _ = asyncio.run(_concurrent_searches(True, requests))
+    assert len(client.searches) == 2
+    assert api.single_flight.stats.calls == 0
+
+
+def test_authenticated_searches_are_not_coalesced():
+    requests = [
+        {
+            "method": "GET",
+            "url": "/catalogs/cat/search?collections=a",
+            "headers": {"Authorization": f"Bearer {user}"},
+        }
+        for user in ("alice", "bob")
+    ]
+    api, client, responses = asyncio.run(_concurrent_searches(True, requests))
+    assert len(client.searches) == 2
+    assert [r.status_code for r in responses] == [200, 200]
+    assert api.single_flight.stats.calls == 0
+
+
+def test_errors_are_shared():
+    async def _run():
+        flights = SingleFlight()
+        gate = asyncio.Event()
+
+        async def fail():
+            await gate.wait()
+            raise ValueError("backend error")
+
+        calls = [asyncio.ensure_future(flights.do("key", fail)) for _ in range(2)]
+        await asyncio.sleep(0)
+        gate.set()
+        return flights, await asyncio.gather(*calls, return_exceptions=True)
+
+    flights, results = asyncio.run(_run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flights.stats.executions == 1
+    assert len(flights) == 0
@@ -0,0 +1,251 @@
+import asyncio
+import json
+
+import pytest
+from starlette.testclient import TestClient
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.api.models import create_get_request_model, create_post_request_model
+from stac_fastapi.api.streaming import iter_feature_collection
+from stac_fastapi.extensions.core import TokenPaginationExtension
+from stac_fastapi.types import config, core
+from stac_fastapi.types.streaming import StreamingItemCollection
+
+
+def _item(n: int):
+    return {
+        "type": "Feature",
+        "id": f"test_item_{n}",
+        "geometry": {"type": "Point", "coordinates": [0, 0]},
+        "bbox": [0, 0, 0, 0],
+        "properties": {"datetime": "2000-01-01T00:00:00Z"},
+        "links": [],
+        "assets": {},
+    }
+
+
+class StreamingCoreClient(core.BaseCoreClient):
+    def item_collection(self, *args, limit: int = 10, **kwargs):
+        returned = []
+
+        def features():
+            for n in range(limit):
+                returned.append(n)
+                yield _item(n)
+
+        return StreamingItemCollection(
+            features=features(),
+            header={"context": {"limit": limit}},
+            footer=lambda: {
+                "links": [{"rel": "self", "href": "http://testserver/"}],
+                "numberReturned": len(returned),
+            },
+        )
+
+    def get_search(self, *args, limit: int = 10, **kwargs):
+        async def features():
+            for n in range(limit):
+                yield _item(n)
+
+        return StreamingItemCollection(features=features())
+
+    def all_collections(self, *args, **kwargs): ...
+
+    def all_catalogs(self, *args, **kwargs): ...
+
+    def get_catalog(self, *args, **kwargs): ...
+
+    def get_catalog_collections(self, *args, **kwargs): ...
+
+    def get_collection(self, *args, **kwargs): ...
+
+    def get_item(self, *args, **kwargs): ...
+
+    def get_global_search(self, *args, **kwargs): ...
+
+    def post_global_search(self, *args, **kwargs): ...
+
+    def post_search(self, *args, **kwargs): ...
+
+
+@pytest.fixture
+def client():
+    api = StacApi(settings=config.ApiSettings(), client=StreamingCoreClient())
+    with TestClient(api.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("limit", [0, 1, 250])
+def test_stream_item_collection(client, limit):
+    response = client.get(
+        "/catalogs/cat/collections/col/items", params={"limit": limit}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/geo+json"
+
+    body = response.json()
+    assert body["type"] == "FeatureCollection"
+    assert body["context"] == {"limit": limit}
+    assert [f["id"] for f in body["features"]] == [
+        f"test_item_{n}" for n in range(limit)
+    ]
+    assert body["numberReturned"] == limit
+    assert body["links"] == [{"rel": "self", "href": "http://testserver/"}]
+
+
+def test_stream_async_features(client):
+    response = client.get("/catalogs/cat/search", params={"limit": 3})
+    assert response.status_code == 200
+    assert response.json() == {
+        "type": "FeatureCollection",
+        "features": [_item(0), _item(1), _item(2)],
+    }
+
+
+def test_stream_is_chunked():
+    collection = StreamingItemCollection(
+        features=[_item(n) for n in range(100)], footer={"links": []}
+    )
+
+    async def _collect():
+        return [
+            chunk async for chunk in iter_feature_collection(collection, chunk_size=512)
+        ]
+
+    chunks = asyncio.run(_collect())
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == {
+        "type": "FeatureCollection",
+        "features": [_item(n) for n in range(100)],
+        "links": [],
+    }
+
+
+class PagedCoreClient(StreamingCoreClient):
+    pages = 3
+    # next page tokens wrap around to the first page after this many pages
+    cycle = None
+
+    def _page(self, token, limit, next_link):
+        page = int(token or 0)
+        links = []
+        if page + 1 < self.pages:
+            links.append(next_link(str((page + 1) % (self.cycle or self.pages))))
+        return {
+            "type": "FeatureCollection",
+            "features": [_item(page * limit + n) for n in range(limit)],
+            "links": links,
+        }
+
+    def get_global_search(self, *args, limit=10, token=None, **kwargs):
+        return self._page(
+            token,
+            limit,
+            lambda t: {"rel": "next", "href": f"http://testserver/search?token={t}"},
+        )
+
+    async def post_global_search(self, search_request, **kwargs):
+        return self._page(
+            search_request.token,
+            search_request.limit,
+            lambda t: {"rel": "next", "method": "POST", "body": {"token": t}},
+        )
+
+
+def _paged_client(auto_paginate: bool, client=None, **settings) -> TestClient:
+    extensions = [TokenPaginationExtension()]
+    api = StacApi(
+        settings=config.ApiSettings(
+            feature_sequence_auto_paginate=auto_paginate, **settings
+        ),
+        client=client or PagedCoreClient(),
+        extensions=extensions,
+        search_get_request_model=create_get_request_model(extensions),
+        search_post_request_model=create_post_request_model(extensions),
+    )
+    return TestClient(api.app)
+
+
+@pytest.mark.parametrize(
+    "accept,media_type,prefix",
+    [
+        ("application/geo+json-seq", "application/geo+json-seq", b"\x1e"),
+        ("application/x-ndjson", "application/x-ndjson", b""),
+        (
+            "application/json;q=0.5, application/ndjson",
+            "application/x-ndjson",
+            b"",
+        ),
+    ],
+)
+def test_search_feature_sequence(accept, media_type, prefix):
+    with _paged_client(auto_paginate=False) as client:
+        response = client.get(
+            "/search", params={"limit": 2}, headers={"Accept": accept}
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == media_type
+
+    lines = response.content.split(b"\n")
+    assert lines[-1] == b""
+    assert all(line.startswith(prefix) for line in lines[:-1])
+    features = [json.loads(line[len(prefix) :]) for line in lines[:-1]]
+    assert [f["id"] for f in features] == ["test_item_0", "test_item_1"]
+
+
+def test_search_feature_collection_preferred():
+    with _paged_client(auto_paginate=True) as client:
+        response = client.get(
+            "/search",
+            params={"limit": 2},
+            headers={"Accept": "application/geo+json, application/geo+json-seq;q=0.1"},
+        )
+    assert response.headers["content-type"] == "application/geo+json"
+    assert len(response.json()["features"]) == 2
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_search_feature_sequence_auto_pagination(method):
+    with _paged_client(auto_paginate=True) as client:
+        if method == "GET":
+            response = client.get(
+                "/search",
+                params={"limit": 2},
+                headers={"Accept": "application/x-ndjson"},
+            )
+        else:
+            response = client.post(
+                "/search",
+                json={"limit": 2},
+                headers={"Accept": "application/x-ndjson"},
+            )
+    assert response.status_code == 200
+    features = [json.loads(line) for line in response.content.splitlines()]
+    assert [f["id"] for f in features] == [f"test_item_{n}" for n in range(6)]
+
+
+def _streamed_ids(client):
+    response = client.get(
+        "/search", params={"limit": 2}, headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    return [json.loads(line)["id"] for line in response.content.splitlines()]
+
+
+def test_auto_pagination_stops_at_repeated_tokens():
+    paged = PagedCoreClient()
+    paged.pages, paged.cycle = 100, 3
+    with _paged_client(auto_paginate=True, client=paged) as client:
+        ids = _streamed_ids(client)
+    # pages 0, 1, 2 then 0 again, whose next token was already followed
+    assert ids == [f"test_item_{n}" for n in [0, 1, 2, 3, 4, 5, 0, 1]]
+
+
+def test_auto_pagination_max_pages():
+    paged = PagedCoreClient()
+    paged.pages = 100
+    with _paged_client(
+        auto_paginate=True, client=paged, feature_sequence_max_pages=4
+    ) as client:
+        ids = _streamed_ids(client)
+    assert ids == [f"test_item_{n}" for n in range(8)]
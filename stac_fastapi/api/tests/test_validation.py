@@ -0,0 +1,96 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pydantic import ValidationError
+from stac_pydantic import Item
+from starlette.testclient import TestClient
+
+from stac_fastapi.api.app import StacApi
+from stac_fastapi.api.validation import ValidationStats, sampled_validation
+from stac_fastapi.types import config, core
+
+VALID_ITEM = {
+    "type": "Feature",
+    "stac_version": "1.0.0",
+    "id": "test_item",
+    "geometry": {"type": "Point", "coordinates": [0, 0]},
+    "bbox": [0, 0, 0, 0],
+    "properties": {"datetime": "2000-01-01T00:00:00Z"},
+    "links": [],
+    "assets": {},
+}
+INVALID_ITEM = {**VALID_ITEM, "geometry": {"type": "Point"}}
+
+
+class DummyCoreClient(core.BaseCoreClient):
+    def get_item(self, item_id: str, *args, **kwargs):
+        return INVALID_ITEM if item_id == "invalid" else VALID_ITEM
+
+    def all_collections(self, *args, **kwargs): ...
+
+    def all_catalogs(self, *args, **kwargs): ...
+
+    def get_catalog(self, *args, **kwargs): ...
+
+    def get_catalog_collections(self, *args, **kwargs): ...
+
+    def get_collection(self, *args, **kwargs): ...
+
+    def get_global_search(self, *args, **kwargs): ...
+
+    def post_global_search(self, *args, **kwargs): ...
+
+    def get_search(self, *args, **kwargs): ...
+
+    def post_search(self, *args, **kwargs): ...
+
+    def item_collection(self, *args, **kwargs): ...
+
+
+@pytest.mark.parametrize("sample_rate,sampled", [(0, 0), (1, 2)])
+def test_sampled_response_validation(sample_rate, sampled):
+    api = StacApi(
+        settings=config.ApiSettings(response_validation_sample_rate=sample_rate),
+        client=DummyCoreClient(),
+    )
+    with TestClient(api.app) as client:
+        for item_id in ["valid", "invalid"]:
+            response = client.get(f"/catalogs/cat/collections/col/items/{item_id}")
+            # invalid responses are logged and counted, not rejected
+            assert response.status_code == 200
+
+    stats = api.app.state.response_validation
+    assert stats.sampled == sampled
+    assert stats.violations == sampled // 2
+    assert stats.violations_by_model["Item"] == sampled // 2
+
+
+def test_sampled_validation_rate():
+    samples = iter([0.5, 0.05, 0.2, 0.01])
+    stats = ValidationStats()
+
+    async def get_item(**kwargs):
+        return INVALID_ITEM
+
+    func = sampled_validation(get_item, Item, 0.1, stats, sampler=lambda: next(samples))
+    for _ in range(4):
+        assert asyncio.run(func(request=None)) is INVALID_ITEM
+    assert stats.sampled == 2
+    assert stats.violations == 2
+
+
+def test_validation_stats_are_thread_safe():
+    stats = ValidationStats()
+    with pytest.raises(ValidationError) as error:
+        Item.validate(INVALID_ITEM)
+
+    def record():
+        for n in range(1000):
+            stats.record(Item, error.value if n % 2 else None)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(8):
+            pool.submit(record)
+    assert stats.sampled == 8000
+    assert stats.violations == stats.violations_by_model["Item"] == 4000
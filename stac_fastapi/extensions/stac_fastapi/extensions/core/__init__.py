@@ -2,6 +2,7 @@
 
 from .collection_search import CollectionSearchExtension
 from .context import ContextExtension
+from .count import CountExtension
 from .discoverySearch import DiscoverySearchExtension
 from .fields import FieldsExtension
 from .filter import FilterExtension
@@ -12,6 +13,7 @@ from .transaction import TransactionExtension
 
 __all__ = (
     "ContextExtension",
+    "CountExtension",
     "FieldsExtension",
     "FilterExtension",
     "PaginationExtension",
@@ -0,0 +1,7 @@
+"""Count extension module."""
+
+from stac_fastapi.types.count import CountMode
+
+from .count import CountExtension
+
+__all__ = ["CountExtension", "CountMode"]
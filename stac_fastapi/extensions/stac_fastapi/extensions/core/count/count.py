@@ -0,0 +1,44 @@
+"""Count extension."""
+
+from typing import List, Optional
+
+import attr
+from fastapi import FastAPI
+
+from stac_fastapi.types.count import CountMode
+from stac_fastapi.types.extension import ApiExtension
+
+from .request import CountExtensionGetRequest, CountExtensionPostRequest
+
+
+@attr.s
+class CountExtension(ApiExtension):
+    """Count Extension.
+
+    The Count extension adds the `count` parameter to the search endpoints,
+    choosing how the items matched are counted: `exact`, `estimated` from
+    backend statistics or a sample, or `none`. Search client methods accepting
+    it receive the requested mode, or `default_mode`, as `count_mode`, and report
+    the mode used as `context.count` (see `stac_fastapi.types.count.set_matched`).
+
+    Attributes:
+        default_mode: count mode of searches without a `count` parameter.
+    """
+
+    GET = CountExtensionGetRequest
+    POST = CountExtensionPostRequest
+
+    conformance_classes: List[str] = attr.ib(factory=list)
+    schema_href: Optional[str] = attr.ib(default=None)
+    default_mode: CountMode = attr.ib(default=CountMode.exact, converter=CountMode)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        pass
@@ -0,0 +1,22 @@
+"""Request models for the count extension."""
+
+from typing import Optional
+
+import attr
+from pydantic import BaseModel
+
+from stac_fastapi.types.count import CountMode
+from stac_fastapi.types.search import APIRequest
+
+
+@attr.s
+class CountExtensionGetRequest(APIRequest):
+    """Count parameter for GET requests."""
+
+    count: Optional[CountMode] = attr.ib(default=None)
+
+
+class CountExtensionPostRequest(BaseModel):
+    """Count parameter for POST requests."""
+
+    count: Optional[CountMode] = None
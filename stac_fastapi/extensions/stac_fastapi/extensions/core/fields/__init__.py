@@ -1,5 +1,7 @@
 """Fields extension module."""
 
+from stac_fastapi.types.projection import FieldsProjection, compile_fields
+
 from .fields import FieldsExtension
 
-__all__ = ["FieldsExtension"]
+__all__ = ["FieldsExtension", "FieldsProjection", "compile_fields"]
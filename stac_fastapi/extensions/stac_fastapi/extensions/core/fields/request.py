@@ -6,6 +6,7 @@ import attr
 from pydantic import BaseModel, Field
 
 from stac_fastapi.types.config import Settings
+from stac_fastapi.types.projection import FieldsProjection, compile_fields
 from stac_fastapi.types.search import APIRequest, str2list
 
 
@@ -28,18 +29,17 @@ class PostFieldsExtension(BaseModel):
         of pydantic fields on model export
         Ref: https://pydantic-docs.helpmanual.io/usage/exporting_models/#advanced-include-and-exclude
         """
-        field_dict = {}
-        for field in fields or []:
-            if "." in field:
-                parent, key = field.split(".")
-                if parent not in field_dict:
-                    field_dict[parent] = {key}
-                else:
-                    if field_dict[parent] is not ...:
-                        field_dict[parent].add(key)
-            else:
-                field_dict[field] = ...  # type:ignore
-        return field_dict
+        return FieldsProjection(fields or (), ()).pydantic_fields["include"]
+
+    @property
+    def projection(self) -> FieldsProjection:
+        """Compiled projection of the fields, including the default includes.
+
+        Projections are cached per include, exclude and default include fields.
+        """
+        return compile_fields(
+            self.include, self.exclude, Settings.get().default_includes
+        )
 
     @property
     def filter_fields(self) -> Dict:
@@ -49,15 +49,7 @@ class PostFieldsExtension(BaseModel):
         the included and excluded fields passed to the API
         Ref: https://pydantic-docs.helpmanual.io/usage/exporting_models/#advanced-include-and-exclude
         """
-        # Always include default_includes, even if they
-        # exist in the exclude list.
-        include = (self.include or set()) - (self.exclude or set())
-        include |= Settings.get().default_includes or set()
-
-        return {
-            "include": self._get_field_dict(include),
-            "exclude": self._get_field_dict(self.exclude),
-        }
+        return self.projection.pydantic_fields
 
 
 @attr.s
@@ -1,5 +1,33 @@
 """Filter extension module."""
 
+from .cql2 import (
+    compile_filter,
+    compile_mask,
+    compile_predicate,
+    parse_cql2_json,
+    parse_cql2_text,
+    parse_filter,
+)
 from .filter import FilterExtension
+from .sql import (
+    SQLDialect,
+    SQLFragment,
+    SQLiteDialect,
+    SQLTranslator,
+    queryable_columns,
+)
 
-__all__ = ["FilterExtension"]
+__all__ = [
+    "FilterExtension",
+    "SQLDialect",
+    "SQLFragment",
+    "SQLiteDialect",
+    "SQLTranslator",
+    "compile_filter",
+    "compile_mask",
+    "compile_predicate",
+    "parse_cql2_json",
+    "parse_cql2_text",
+    "parse_filter",
+    "queryable_columns",
+]
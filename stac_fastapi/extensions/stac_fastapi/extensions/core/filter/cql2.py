@@ -0,0 +1,1049 @@
+"""CQL2 filter parsing and evaluation.
+
+Filters, in CQL2-JSON or CQL2-text, are parsed to a hashable expression tree which
+compiles to a predicate on STAC items or, with numpy, to a function computing a
+boolean mask over columns of property values. Parsed and compiled filters are
+memoized, so a repeated filter is only parsed and compiled once.
+"""
+
+import functools
+import importlib.util
+import json
+import operator
+import re
+import unicodedata
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import attr
+
+from stac_fastapi.types.errors import InvalidQueryParameter
+from stac_fastapi.types.indexes import MAX_TIME, MIN_TIME
+from stac_fastapi.types.rfc3339 import datetime_to_epoch_us, rfc3339_str_to_datetime
+from stac_fastapi.types.spatial import (
+    SpatialPredicate,
+    bbox_envelopes,
+    geometry_envelope,
+)
+
+# Test for numpy, used to evaluate filters over columns of values where available
+if importlib.util.find_spec("numpy") is not None:
+    import numpy as np
+else:
+    np = None
+
+# Number of distinct filters kept parsed and compiled
+CACHE_SIZE = 256
+
+# Deepest nesting of operations compiled
+MAX_DEPTH = 64
+
+_DAY_US = 86_400_000_000
+Span = Tuple[int, int]
+
+
+@attr.s(frozen=True, slots=True)
+class Property:
+    """Reference to an item property, or to `id`, `collection` or `geometry`."""
+
+    name: str = attr.ib()
+
+
+def _value_type(value: Any) -> Any:
+    """Return the Python type of a value, and of the items of tuples."""
+    if isinstance(value, tuple):
+        return tuple(_value_type(v) for v in value)
+    return type(value).__name__
+
+
+@attr.s(frozen=True, slots=True)
+class Literal:
+    """Literal value.
+
+    Literals of equal values of different types, like `true`, `1` and `1.0`, are
+    not equal, so that the caches of parsed and compiled filters tell them apart.
+
+    Attributes:
+        value: the value. Timestamps and dates keep their string form, intervals
+            are pairs of strings with ".." for open ends, bboxes tuples of numbers
+            and geometries their GeoJSON as JSON text.
+        type: "value", "timestamp", "date", "interval", "bbox" or "geometry".
+    """
+
+    value: Any = attr.ib()
+    type: str = attr.ib(default="value")
+    value_type: Any = attr.ib(init=False, repr=False)
+
+    @value_type.default
+    def _value_type_default(self) -> Any:
+        return _value_type(self.value)
+
+
+@attr.s(frozen=True, slots=True)
+class Operation:
+    """Operator or function applied to its arguments."""
+
+    op: str = attr.ib()
+    args: Tuple[Any, ...] = attr.ib(converter=tuple)
+
+
+Expression = Union[Property, Literal, Operation]
+
+
+def _invalid(message: str) -> InvalidQueryParameter:
+    return InvalidQueryParameter(f"Invalid CQL2 filter: {message}")
+
+
+def _compare(op: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    """Comparison of item values, where null or incompatible values never match."""
+
+    def compare(a: Any, b: Any) -> bool:
+        if a is None or b is None:
+            return False
+        try:
+            return op(*_coerce(a, b))
+        except (TypeError, ValueError):
+            return False
+
+    return compare
+
+
+def _coerce(a: Any, b: Any) -> Tuple[Any, Any]:
+    """Parse strings compared to temporal values, and compare dates to dates."""
+    if isinstance(a, str) and isinstance(b, date):
+        a = _temporal_value(a, b)
+    elif isinstance(b, str) and isinstance(a, date):
+        b = _temporal_value(b, a)
+    if isinstance(a, datetime) != isinstance(b, datetime):
+        if isinstance(a, date) and isinstance(b, date):
+            a, b = _date(a), _date(b)
+    return a, b
+
+
+def _temporal_value(value: str, like: date) -> date:
+    if isinstance(like, datetime):
+        return rfc3339_str_to_datetime(value)
+    return date.fromisoformat(value[:10])
+
+
+def _date(value: date) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _arithmetic(op: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+    def apply(a: Any, b: Any) -> Any:
+        if a is None or b is None:
+            return None
+        try:
+            return op(a, b)
+        except (TypeError, ZeroDivisionError):
+            return None
+
+    return apply
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _like_regex(pattern: str) -> "re.Pattern":
+    """Translate a LIKE pattern, with `%`, `_` and `\\` escapes, to a regex."""
+    regex = []
+    escaped = False
+    for char in pattern:
+        if escaped:
+            regex.append(re.escape(char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "%":
+            regex.append(".*")
+        elif char == "_":
+            regex.append(".")
+        else:
+            regex.append(re.escape(char))
+    return re.compile("".join(regex), re.DOTALL)
+
+
+def _like(value: Any, pattern: Any) -> bool:
+    if not isinstance(value, str) or not isinstance(pattern, str):
+        return False
+    return _like_regex(pattern).fullmatch(value) is not None
+
+
+def _casei(value: Any) -> Any:
+    return value.casefold() if isinstance(value, str) else value
+
+
+def _accenti(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    decomposed = unicodedata.normalize("NFD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _array_op(op: Callable[[List[Any], List[Any]], bool]) -> Callable[..., bool]:
+    def apply(a: Any, b: Any) -> bool:
+        if a is None or b is None:
+            return False
+        # single values, or ambiguous one element arrays of CQL2-text, as arrays
+        return op(_as_list(a), _as_list(b))
+
+    return apply
+
+
+def _as_list(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+_LE = _compare(operator.le)
+
+# Implementations on single values, by operator
+_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "=": _compare(operator.eq),
+    "<>": _compare(operator.ne),
+    "<": _compare(operator.lt),
+    "<=": _LE,
+    ">": _compare(operator.gt),
+    ">=": _compare(operator.ge),
+    "+": _arithmetic(operator.add),
+    "-": _arithmetic(operator.sub),
+    "*": _arithmetic(operator.mul),
+    "/": _arithmetic(operator.truediv),
+    "%": _arithmetic(operator.mod),
+    "^": _arithmetic(operator.pow),
+    "div": _arithmetic(operator.floordiv),
+    "like": _like,
+    "between": lambda value, low, high: _LE(low, value) and _LE(value, high),
+    "in": lambda value, values: value is not None and value in values,
+    "isNull": lambda value: value is None,
+    "casei": _casei,
+    "accenti": _accenti,
+    "array": lambda *values: values,
+    "a_equals": _array_op(
+        lambda a, b: all(x in b for x in a) and all(x in a for x in b)
+    ),
+    "a_contains": _array_op(lambda a, b: all(x in a for x in b)),
+    "a_containedBy": _array_op(lambda a, b: all(x in b for x in a)),
+    "a_overlaps": _array_op(lambda a, b: any(x in b for x in a)),
+}
+
+# Relations of intervals `a` and `b`, given as `(a_start, a_end, b_start, b_end)`.
+# They combine comparisons with `&`, so they also apply to numpy arrays.
+_TEMPORAL: Dict[str, Callable[[Any, Any, Any, Any], Any]] = {
+    "t_after": lambda a0, a1, b0, b1: a0 > b1,
+    "t_before": lambda a0, a1, b0, b1: a1 < b0,
+    "t_contains": lambda a0, a1, b0, b1: (a0 < b0) & (a1 > b1),
+    "t_disjoint": lambda a0, a1, b0, b1: (a0 > b1) | (a1 < b0),
+    "t_during": lambda a0, a1, b0, b1: (a0 > b0) & (a1 < b1),
+    "t_equals": lambda a0, a1, b0, b1: (a0 == b0) & (a1 == b1),
+    "t_finishedBy": lambda a0, a1, b0, b1: (a0 < b0) & (a1 == b1),
+    "t_finishes": lambda a0, a1, b0, b1: (a0 > b0) & (a1 == b1),
+    "t_intersects": lambda a0, a1, b0, b1: (a0 <= b1) & (a1 >= b0),
+    "t_meets": lambda a0, a1, b0, b1: a1 == b0,
+    "t_metBy": lambda a0, a1, b0, b1: a0 == b1,
+    "t_overlappedBy": lambda a0, a1, b0, b1: (a0 > b0) & (a0 < b1) & (a1 > b1),
+    "t_overlaps": lambda a0, a1, b0, b1: (a0 < b0) & (a1 > b0) & (a1 < b1),
+    "t_startedBy": lambda a0, a1, b0, b1: (a0 == b0) & (a1 > b1),
+    "t_starts": lambda a0, a1, b0, b1: (a0 == b0) & (a1 < b1),
+}
+
+_LOGICAL = ("and", "or", "not")
+_SPATIAL = ("s_intersects", "s_disjoint")
+_PREDICATES = {
+    *_LOGICAL,
+    *_TEMPORAL,
+    *_SPATIAL,
+    *("=", "<>", "<", "<=", ">", ">=", "like", "between", "in", "isNull"),
+    *("a_equals", "a_contains", "a_containedBy", "a_overlaps"),
+}
+
+# Numbers of arguments of operators and functions, as `(minimum, maximum)`
+_ARITY: Dict[str, Tuple[int, Optional[int]]] = {
+    **{op: (2, 2) for op in _FUNCTIONS},
+    **{op: (2, 2) for op in _TEMPORAL},
+    **{op: (2, 2) for op in _SPATIAL},
+    "and": (2, None),
+    "or": (2, None),
+    "not": (1, 1),
+    "between": (3, 3),
+    "isNull": (1, 1),
+    "casei": (1, 1),
+    "accenti": (1, 1),
+    "array": (0, None),
+}
+
+# Supported operators and functions, by lower case name
+OPERATORS: Dict[str, str] = {
+    name.lower(): name for name in (*_FUNCTIONS, *_TEMPORAL, *_LOGICAL, *_SPATIAL)
+}
+
+
+def _check_arity(op: str, args: Tuple[Expression, ...]) -> None:
+    """Raise InvalidQueryParameter unless `op` takes `len(args)` arguments."""
+    minimum, maximum = _ARITY[op]
+    if len(args) < minimum or (maximum is not None and len(args) > maximum):
+        if minimum == maximum:
+            expected = str(minimum)
+        elif maximum is None:
+            expected = f"at least {minimum}"
+        else:
+            expected = f"{minimum} to {maximum}"
+        raise _invalid(f"{op} takes {expected} arguments, got {len(args)}")
+
+
+def _operator(name: Any) -> str:
+    if not isinstance(name, str) or name.lower() not in OPERATORS:
+        raise InvalidQueryParameter(f"Unsupported CQL2 operator or function: {name}")
+    return OPERATORS[name.lower()]
+
+
+def _string(value: Any) -> str:
+    if not isinstance(value, str):
+        raise _invalid(f"expected a string, got {value!r}")
+    return value
+
+
+def _list(value: Any, what: str) -> List[Any]:
+    if not isinstance(value, list):
+        raise _invalid(f"{what} must be an array, got {value!r}")
+    return value
+
+
+def _bbox(values: Any) -> Literal:
+    if (
+        not isinstance(values, (list, tuple))
+        or len(values) not in (4, 6)
+        or not all(
+            isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+        )
+    ):
+        raise _invalid(f"a bbox has 4 or 6 numbers, got {values!r}")
+    return Literal(tuple(values), "bbox")
+
+
+def _geometry_literal(geometry: Dict[str, Any]) -> Literal:
+    try:
+        geometry_envelope(geometry)
+    except (KeyError, IndexError, TypeError, ValueError):
+        raise _invalid(f"invalid geometry {geometry!r}") from None
+    return Literal(json.dumps(geometry, sort_keys=True), "geometry")
+
+
+def _interval(bounds: Any) -> Literal:
+    if not isinstance(bounds, (list, tuple)) or len(bounds) != 2:
+        raise _invalid(f"an interval has two bounds, got {bounds!r}")
+    return Literal(tuple(_string(bound) for bound in bounds), "interval")
+
+
+def _from_json_object(value: Dict[str, Any]) -> Expression:
+    if "op" in value:
+        args = _list(value.get("args", []), "args")
+        return Operation(_operator(value["op"]), [_from_json(arg) for arg in args])
+    if "property" in value:
+        return Property(_string(value["property"]))
+    if "function" in value:
+        function = value["function"]
+        if not isinstance(function, dict):
+            raise _invalid(f"a function is an object, got {function!r}")
+        args = _list(function.get("args", []), "args")
+        return Operation(_operator(function.get("name")), map(_from_json, args))
+    for type in ("timestamp", "date"):
+        if type in value:
+            return Literal(_string(value[type]), type)
+    if "interval" in value:
+        return _interval(value["interval"])
+    if "bbox" in value:
+        return _bbox(value["bbox"])
+    if "type" in value:
+        return _geometry_literal(value)
+    raise _invalid(f"unexpected object {value!r}")
+
+
+def _from_json(value: Any) -> Expression:
+    if isinstance(value, dict):
+        return _from_json_object(value)
+    if isinstance(value, list):
+        return Operation("array", [_from_json(v) for v in value])
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return Literal(value)
+    raise _invalid(f"unexpected value {value!r}")
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _parse_cql2_json_text(text: str) -> Expression:
+    try:
+        return _from_json(json.loads(text))
+    except RecursionError:
+        raise _invalid("nested too deeply") from None
+
+
+def parse_cql2_json(filter: Union[Dict[str, Any], str]) -> Expression:
+    """Parse a CQL2-JSON filter, given as a dict or JSON text.
+
+    Raises:
+        InvalidQueryParameter: if the filter is not valid CQL2-JSON.
+    """
+    try:
+        if isinstance(filter, str):
+            filter = json.loads(filter)
+        # normalized text, as key of the parsed filters cache
+        text = json.dumps(filter, sort_keys=True, separators=(",", ":"))
+    except RecursionError:
+        raise _invalid("nested too deeply") from None
+    except (TypeError, ValueError) as e:
+        raise _invalid(str(e)) from e
+    return _parse_cql2_json_text(text)
+
+
+_TOKEN_REGEX = re.compile(
+    r"""\s*(?:
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+    |(?P<string>'(?:[^']|'')*')
+    |(?P<property>"(?:[^"]|"")*")
+    |(?P<word>[A-Za-z_][A-Za-z0-9_:.]*)
+    |(?P<symbol><>|<=|>=|[=<>()+\-*/%^,])
+    )""",
+    re.VERBOSE,
+)
+
+_COMPARISONS = ("=", "<>", "<", "<=", ">", ">=")
+
+# WKT geometry types, with the nesting depth of their coordinates
+_WKT_TYPES = {
+    "POINT": ("Point", 1),
+    "LINESTRING": ("LineString", 1),
+    "POLYGON": ("Polygon", 2),
+    "MULTIPOINT": ("MultiPoint", 1),
+    "MULTILINESTRING": ("MultiLineString", 2),
+    "MULTIPOLYGON": ("MultiPolygon", 3),
+}
+
+
+def _tokenize(text: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_REGEX.match(text, position)
+        if match is None:
+            raise _invalid(f"unexpected character at {text[position:]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            value = float(value) if re.search("[.eE]", value) else int(value)
+        elif kind in ("string", "property"):
+            quote = value[0]
+            value = value[1:-1].replace(quote * 2, quote)
+        tokens.append((kind, value))
+    tokens.append(("end", None))
+    return tokens
+
+
+class _TextParser:
+    """Recursive descent parser of CQL2-text."""
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def parse(self) -> Expression:
+        expression = self._or()
+        if self._peek()[0] != "end":
+            raise _invalid(f"unexpected {self._peek()[1]!r}")
+        return expression
+
+    def _peek(self) -> Tuple[str, Any]:
+        return self.tokens[self.position]
+
+    def _next(self) -> Tuple[str, Any]:
+        token = self.tokens[self.position]
+        if token[0] != "end":
+            self.position += 1
+        return token
+
+    def _keyword(self) -> Optional[str]:
+        kind, value = self._peek()
+        return value.upper() if kind == "word" else None
+
+    def _accept(self, expected: str) -> bool:
+        kind, value = self._peek()
+        if (kind == "symbol" and value == expected) or self._keyword() == expected:
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, expected: str) -> None:
+        if not self._accept(expected):
+            raise _invalid(f"expected {expected!r}, got {self._peek()[1]!r}")
+
+    def _list(self, parse: Callable[[], Any]) -> List[Any]:
+        """Parse a parenthesized, comma separated list."""
+        self._expect("(")
+        items = [] if self._accept(")") else [parse()]
+        if items:
+            while self._accept(","):
+                items.append(parse())
+            self._expect(")")
+        return items
+
+    def _or(self) -> Expression:
+        args = [self._and()]
+        while self._accept("OR"):
+            args.append(self._and())
+        return args[0] if len(args) == 1 else Operation("or", args)
+
+    def _and(self) -> Expression:
+        args = [self._not()]
+        while self._accept("AND"):
+            args.append(self._not())
+        return args[0] if len(args) == 1 else Operation("and", args)
+
+    def _not(self) -> Expression:
+        if self._accept("NOT"):
+            return Operation("not", [self._not()])
+        return self._predicate()
+
+    def _predicate(self) -> Expression:
+        left = self._additive()
+        kind, value = self._peek()
+        if kind == "symbol" and value in _COMPARISONS:
+            self._next()
+            return Operation(value, [left, self._additive()])
+        if self._accept("IS"):
+            negate = self._accept("NOT")
+            self._expect("NULL")
+            return self._negate(Operation("isNull", [left]), negate)
+        negate = self._accept("NOT")
+        if self._accept("LIKE"):
+            predicate = Operation("like", [left, self._additive()])
+        elif self._accept("BETWEEN"):
+            low = self._additive()
+            self._expect("AND")
+            predicate = Operation("between", [left, low, self._additive()])
+        elif self._accept("IN"):
+            values = Operation("array", self._list(self._additive))
+            predicate = Operation("in", [left, values])
+        elif negate:
+            raise _invalid(f"unexpected {self._peek()[1]!r} after NOT")
+        else:
+            return left
+        return self._negate(predicate, negate)
+
+    @staticmethod
+    def _negate(expression: Expression, negate: bool) -> Expression:
+        return Operation("not", [expression]) if negate else expression
+
+    def _additive(self) -> Expression:
+        expression = self._multiplicative()
+        while self._peek() in (("symbol", "+"), ("symbol", "-")):
+            op = self._next()[1]
+            expression = Operation(op, [expression, self._multiplicative()])
+        return expression
+
+    def _multiplicative(self) -> Expression:
+        expression = self._power()
+        while True:
+            if self._peek() in (("symbol", "*"), ("symbol", "/"), ("symbol", "%")):
+                op = self._next()[1]
+            elif self._accept("DIV"):
+                op = "div"
+            else:
+                return expression
+            expression = Operation(op, [expression, self._power()])
+
+    def _power(self) -> Expression:
+        expression = self._unary()
+        if self._accept("^"):
+            return Operation("^", [expression, self._power()])
+        return expression
+
+    def _unary(self) -> Expression:
+        if self._accept("-"):
+            operand = self._unary()
+            if isinstance(operand, Literal) and isinstance(operand.value, (int, float)):
+                return Literal(-operand.value)
+            return Operation("*", [Literal(-1), operand])
+        return self._primary()
+
+    def _primary(self) -> Expression:
+        kind, value = self._peek()
+        if kind in ("number", "string"):
+            self._next()
+            return Literal(value)
+        if kind == "property":
+            self._next()
+            return Property(value)
+        if kind == "symbol" and value == "(":
+            items = self._list(self._or)
+            return items[0] if len(items) == 1 else Operation("array", items)
+        if kind == "word":
+            return self._word()
+        raise _invalid(f"unexpected {value!r}")
+
+    def _word(self) -> Expression:
+        keyword = self._keyword()
+        name = self._next()[1]
+        if keyword in ("TRUE", "FALSE"):
+            return Literal(keyword == "TRUE")
+        if keyword in ("TIMESTAMP", "DATE"):
+            self._expect("(")
+            literal = Literal(self._string(), keyword.lower())
+            self._expect(")")
+            return literal
+        if keyword == "INTERVAL":
+            return _interval(self._list(self._string))
+        if keyword == "BBOX":
+            return _bbox(self._list(self._number))
+        if keyword in _WKT_TYPES or keyword == "GEOMETRYCOLLECTION":
+            self.position -= 1
+            return _geometry_literal(self._geometry())
+        if self._peek() == ("symbol", "("):
+            return Operation(_operator(name), self._list(self._or))
+        return Property(name)
+
+    def _string(self) -> str:
+        kind, value = self._next()
+        if kind != "string":
+            raise _invalid(f"expected a string, got {value!r}")
+        return value
+
+    def _number(self) -> Union[int, float]:
+        sign = -1 if self._accept("-") else 1
+        kind, value = self._next()
+        if kind != "number":
+            raise _invalid(f"expected a number, got {value!r}")
+        return sign * value
+
+    def _geometry(self) -> Dict[str, Any]:
+        keyword = self._keyword()
+        self._next()
+        self._accept("Z")
+        if keyword == "GEOMETRYCOLLECTION":
+            return {
+                "type": "GeometryCollection",
+                "geometries": self._list(self._geometry),
+            }
+        if keyword not in _WKT_TYPES:
+            raise _invalid(f"expected a geometry, got {keyword!r}")
+        type, depth = _WKT_TYPES[keyword]
+        coordinates = self._coordinates(depth)
+        return {
+            "type": type,
+            "coordinates": coordinates[0] if type == "Point" else coordinates,
+        }
+
+    def _coordinates(self, depth: int) -> List[Any]:
+        if depth:
+            return self._list(lambda: self._coordinates(depth - 1))
+        # positions of multipoints may be parenthesized
+        parenthesized = self._accept("(")
+        position = [self._number()]
+        while self._peek()[0] == "number" or self._peek() == ("symbol", "-"):
+            position.append(self._number())
+        if parenthesized:
+            self._expect(")")
+        return position
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse_cql2_text(text: str) -> Expression:
+    """Parse a CQL2-text filter.
+
+    Raises:
+        InvalidQueryParameter: if the filter is not valid CQL2-text.
+    """
+    try:
+        return _TextParser(text).parse()
+    except RecursionError:
+        raise _invalid("nested too deeply") from None
+
+
+def parse_filter(
+    filter: Union[Dict[str, Any], str], filter_lang: Optional[str] = None
+) -> Expression:
+    """Parse a filter as given in a search request.
+
+    Dicts are CQL2-JSON. Strings are CQL2-text unless `filter_lang` is
+    "cql2-json" or "cql-json".
+    """
+    if isinstance(filter, str) and filter_lang not in ("cql2-json", "cql-json"):
+        return parse_cql2_text(filter)
+    return parse_cql2_json(filter)
+
+
+def _span(value: Any) -> Optional[Span]:
+    """Return the `(start, end)` microseconds since the epoch of a temporal value."""
+    if isinstance(value, str):
+        try:
+            if len(value) == 10:
+                value = date.fromisoformat(value)
+            else:
+                value = rfc3339_str_to_datetime(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        us = datetime_to_epoch_us(value)
+        return us, us
+    if isinstance(value, date):
+        start = datetime_to_epoch_us(datetime(value.year, value.month, value.day))
+        return start, start + _DAY_US - 1
+    return value if isinstance(value, tuple) else None
+
+
+def _literal_span(literal: Literal) -> Span:
+    if literal.type == "interval":
+        start, end = literal.value
+        return (
+            MIN_TIME if start == ".." else _literal_span(Literal(start))[0],
+            MAX_TIME if end == ".." else _literal_span(Literal(end))[1],
+        )
+    span = _span(literal.value)
+    if span is None:
+        raise _invalid(f"invalid temporal value {literal.value!r}")
+    return span
+
+
+def _bbox_geometry(bbox: Tuple[float, ...]) -> Dict[str, Any]:
+    return {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]]
+            for x0, y0, x1, y1 in bbox_envelopes(bbox)
+        ],
+    }
+
+
+def _literal_value(literal: Literal) -> Any:
+    """Return the Python value of a literal."""
+    try:
+        if literal.type == "timestamp":
+            return rfc3339_str_to_datetime(literal.value)
+        if literal.type == "date":
+            return date.fromisoformat(literal.value)
+    except ValueError as e:
+        raise _invalid(str(e)) from e
+    if literal.type == "interval":
+        return _literal_span(literal)
+    if literal.type == "bbox":
+        return _bbox_geometry(literal.value)
+    if literal.type == "geometry":
+        return json.loads(literal.value)
+    return literal.value
+
+
+def _spatial_predicate(literal: Literal) -> SpatialPredicate:
+    if literal.type == "bbox":
+        return SpatialPredicate.from_bbox(literal.value)
+    return SpatialPredicate.from_geometry(_literal_value(literal))
+
+
+def _intersects(a: Any, b: Any) -> bool:
+    if a is None or b is None:
+        return False
+    return SpatialPredicate.from_geometry(a).intersects(b)
+
+
+def _property_name(name: str) -> str:
+    return name[len("properties.") :] if name.startswith("properties.") else name
+
+
+class _Compiler:
+    """Compile expressions to functions of a single argument, the evaluated data."""
+
+    depth = 0
+
+    def compile(self, expression: Expression) -> Callable[[Any], Any]:
+        if self.depth >= MAX_DEPTH:
+            raise _invalid(f"nested deeper than {MAX_DEPTH} operations")
+        self.depth += 1
+        try:
+            return self._compile(expression)
+        finally:
+            self.depth -= 1
+
+    def _compile(self, expression: Expression) -> Callable[[Any], Any]:
+        if isinstance(expression, Property):
+            return self.property(_property_name(expression.name))
+        if isinstance(expression, Literal):
+            value = self.literal(expression)
+            return lambda _: value
+        op, args = expression.op, expression.args
+        _check_arity(op, args)
+        if op == "in" and not (
+            isinstance(args[1], Operation) and args[1].op == "array"
+        ):
+            raise _invalid("in expects a list of values")
+        if op in _LOGICAL:
+            return self.logical(op, [self.compile(arg) for arg in args])
+        if op in _TEMPORAL:
+            return self.temporal(op, args)
+        if op in _SPATIAL:
+            return self.spatial(op, args)
+        if op == "array" and all(isinstance(arg, Literal) for arg in args):
+            values = tuple(self.literal(arg) for arg in args)
+            return lambda _: values
+        return self.apply(op, [self.compile(arg) for arg in args])
+
+    def spatial(self, op: str, args: Tuple[Expression, ...]) -> Callable[[Any], Any]:
+        literals = [arg for arg in args if isinstance(arg, Literal)]
+        if len(literals) == 1:
+            predicate = _spatial_predicate(literals[0])
+            (other,) = [arg for arg in args if not isinstance(arg, Literal)]
+            return self.spatial_test(op, predicate, other)
+        test = self.lift(_spatial_test(op, _intersects), 2, predicate=True)
+        return self.map(test, map(self.compile, args))
+
+    def temporal(self, op: str, args: Tuple[Expression, ...]) -> Callable[[Any], Any]:
+        spans = []
+        for arg in args:
+            if isinstance(arg, Literal) and arg.type != "value":
+                span = _literal_span(arg)
+                spans.append(self.span(lambda _, span=span: span))
+            else:
+                spans.append(self.span(self.compile(arg)))
+        return self.relate(_TEMPORAL[op], *spans)
+
+
+def _spatial_test(op: str, intersects: Callable[..., bool]) -> Callable[..., bool]:
+    if op == "s_intersects":
+        return intersects
+
+    def disjoint(*geometries: Any) -> bool:
+        return None not in geometries and not intersects(*geometries)
+
+    return disjoint
+
+
+def _get(item: Dict[str, Any], name: str) -> Any:
+    if name in ("id", "collection", "geometry", "bbox"):
+        return item.get(name)
+    return (item.get("properties") or {}).get(name)
+
+
+class _ItemCompiler(_Compiler):
+    """Compile expressions to functions of a STAC item."""
+
+    def property(self, name: str) -> Callable[[Any], Any]:
+        return lambda item: _get(item, name)
+
+    def literal(self, literal: Literal) -> Any:
+        return _literal_value(literal)
+
+    def logical(self, op: str, args: List[Callable]) -> Callable[[Any], Any]:
+        if op == "not":
+            (arg,) = args
+            return lambda item: not arg(item)
+        test = all if op == "and" else any
+        return lambda item: test(arg(item) for arg in args)
+
+    def map(self, function: Callable[..., Any], args) -> Callable[[Any], Any]:
+        args = list(args)
+        if len(args) == 1:
+            (a,) = args
+            return lambda item: function(a(item))
+        if len(args) == 2:
+            a, b = args
+            return lambda item: function(a(item), b(item))
+        return lambda item: function(*[arg(item) for arg in args])
+
+    def lift(
+        self, function: Callable[..., Any], count: int, predicate: bool = False
+    ) -> Callable[..., Any]:
+        return function
+
+    def apply(self, op: str, args: List[Callable]) -> Callable[[Any], Any]:
+        return self.map(_FUNCTIONS[op], args)
+
+    def spatial_test(
+        self, op: str, predicate: SpatialPredicate, other: Expression
+    ) -> Callable[[Any], Any]:
+        if other == Property("geometry"):
+            # tests the whole item, so that its bbox pre-rejects it
+            if op == "s_intersects":
+                return predicate
+            return lambda item: item.get("geometry") is not None and not predicate(item)
+        test = _spatial_test(op, predicate.intersects)
+        return self.map(test, [self.compile(other)])
+
+    def span(self, value: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        return lambda item: _span(value(item))
+
+    def relate(self, relation: Callable, a: Callable, b: Callable) -> Callable:
+        def test(item: Dict[str, Any]) -> bool:
+            a_span, b_span = a(item), b(item)
+            if a_span is None or b_span is None:
+                return False
+            return bool(relation(*a_span, *b_span))
+
+        return test
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required to evaluate filters over arrays")
+
+
+def _is_null_array(values: Any) -> "np.ndarray":
+    values = np.asarray(values)
+    if values.dtype.kind in "fc":
+        return np.isnan(values)
+    if values.dtype.kind in "mM":
+        return np.isnat(values)
+    if values.dtype.kind == "O":
+        return np.asarray(np.frompyfunc(lambda v: v is None, 1, 1)(values), bool)
+    return np.zeros(values.shape, dtype=bool)
+
+
+# Vectorized implementations, by operator, falling back to the implementations
+# on single values when they fail
+_ARRAY_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "=": operator.eq,
+    "<>": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "%": operator.mod,
+    "^": operator.pow,
+    "div": operator.floordiv,
+    "between": lambda value, low, high: (value >= low) & (value <= high),
+    "in": lambda value, values: np.isin(value, list(values)),
+    "isNull": _is_null_array,
+}
+
+
+def _span_array(values: Any) -> Tuple[Any, Any, Any]:
+    """Return the `(start, end, valid)` microseconds since the epoch of values."""
+    if isinstance(values, tuple):
+        return values[0], values[1], True
+    values = np.asarray(values)
+    if values.dtype.kind == "M":
+        us = values.astype("datetime64[us]").view(np.int64)
+        return us, us, ~np.isnat(values)
+    spans = [_span(value) for value in values.tolist()]
+    return (
+        np.array([span[0] if span else 0 for span in spans], dtype=np.int64),
+        np.array([span[1] if span else 0 for span in spans], dtype=np.int64),
+        np.array([span is not None for span in spans], dtype=bool),
+    )
+
+
+class _ArrayCompiler(_Compiler):
+    """Compile expressions to functions of a mapping of property names to arrays."""
+
+    def property(self, name: str) -> Callable[[Any], Any]:
+        return lambda columns: columns[name]
+
+    def literal(self, literal: Literal) -> Any:
+        value = _literal_value(literal)
+        if literal.type == "timestamp":
+            return np.datetime64(datetime_to_epoch_us(value), "us")
+        if literal.type == "date":
+            return np.datetime64(value, "D")
+        return value
+
+    def logical(self, op: str, args: List[Callable]) -> Callable[[Any], Any]:
+        if op == "not":
+            (arg,) = args
+            return lambda columns: np.logical_not(arg(columns))
+        combine = np.logical_and if op == "and" else np.logical_or
+        return lambda columns: functools.reduce(combine, [arg(columns) for arg in args])
+
+    def map(self, function: Callable[..., Any], args) -> Callable[[Any], Any]:
+        args = list(args)
+        return lambda columns: function(*[arg(columns) for arg in args])
+
+    def lift(
+        self, function: Callable[..., Any], count: int, predicate: bool = False
+    ) -> Callable[..., Any]:
+        vectorized = np.frompyfunc(function, count, 1)
+        if predicate:
+            return lambda *values: np.asarray(vectorized(*values), dtype=bool)
+        return vectorized
+
+    def apply(self, op: str, args: List[Callable]) -> Callable[[Any], Any]:
+        predicate = op in _PREDICATES
+        fallback = self.lift(_FUNCTIONS[op], len(args), predicate)
+        fast = _ARRAY_FUNCTIONS.get(op)
+        if fast is None:
+            return self.map(fallback, args)
+
+        def function(*values: Any) -> Any:
+            try:
+                result = fast(*values)
+            except TypeError:
+                return fallback(*values)
+            if predicate and getattr(result, "dtype", None) != bool:
+                return fallback(*values)
+            return result
+
+        return self.map(function, args)
+
+    def spatial_test(
+        self, op: str, predicate: SpatialPredicate, other: Expression
+    ) -> Callable[[Any], Any]:
+        test = self.lift(_spatial_test(op, predicate.intersects), 1, predicate=True)
+        return self.map(test, [self.compile(other)])
+
+    def span(self, value: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        return lambda columns: _span_array(value(columns))
+
+    def relate(self, relation: Callable, a: Callable, b: Callable) -> Callable:
+        def test(columns: Mapping[str, Any]) -> Any:
+            a0, a1, a_valid = a(columns)
+            b0, b1, b_valid = b(columns)
+            return relation(a0, a1, b0, b1) & a_valid & b_valid
+
+        return test
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_predicate(expression: Expression) -> Callable[[Dict[str, Any]], bool]:
+    """Compile a parsed filter to a predicate on STAC items.
+
+    Property names refer to item properties, except `id`, `collection`, `geometry`
+    and `bbox`. Comparisons with null or incompatible values are false.
+
+    Raises:
+        InvalidQueryParameter: if the filter is invalid.
+    """
+    test = _ItemCompiler().compile(expression)
+    return lambda item: bool(test(item))
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_mask(
+    expression: Expression,
+) -> Callable[[Mapping[str, Any]], "np.ndarray"]:
+    """Compile a parsed filter to a function of columns returning a boolean mask.
+
+    Columns map property names to arrays of equal length, with missing values as
+    `None`, NaN or NaT; timestamps are best given as `datetime64` arrays.
+    Vectorized operators run over whole arrays, others element by element.
+    Requires numpy.
+
+    Raises:
+        InvalidQueryParameter: if the filter is invalid.
+    """
+    _require_numpy()
+    evaluate = _ArrayCompiler().compile(expression)
+
+    def mask(columns: Mapping[str, Any]) -> "np.ndarray":
+        shape = np.broadcast_shapes(*(np.shape(c) for c in columns.values()))
+        return np.zeros(shape, dtype=bool) | np.asarray(evaluate(columns), dtype=bool)
+
+    return mask
+
+
+def compile_filter(
+    filter: Union[Dict[str, Any], str], filter_lang: Optional[str] = None
+) -> Callable[[Dict[str, Any]], bool]:
+    """Parse and compile a filter, as given in a search request, to a predicate.
+
+    Raises:
+        InvalidQueryParameter: if the filter is invalid.
+    """
+    return compile_predicate(parse_filter(filter, filter_lang))
@@ -0,0 +1,363 @@
+"""Translation of CQL2 filters to parameterized SQL.
+
+Literal values are bound as parameters, so filters differing only by their
+values translate to the same SQL text, which drivers and databases reuse as a
+prepared statement and query plan.
+"""
+
+import functools
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import attr
+
+from stac_fastapi.types.errors import InvalidQueryParameter
+from stac_fastapi.types.indexes import MAX_TIME, MIN_TIME
+from stac_fastapi.types.rfc3339 import epoch_us_to_datetime
+
+from .cql2 import (
+    _COMPARISONS,
+    _TEMPORAL,
+    CACHE_SIZE,
+    Expression,
+    Literal,
+    Operation,
+    Property,
+    _check_arity,
+    _literal_span,
+    _literal_value,
+    _property_name,
+    parse_filter,
+)
+
+# Marks parameters while translating, replaced by the dialect placeholders
+_PARAMETER = "\x00"
+
+_PLACEHOLDERS: Dict[str, Callable[[int], str]] = {
+    "qmark": lambda index: "?",
+    "format": lambda index: "%s",
+    "numeric": lambda index: f":{index}",
+    "dollar": lambda index: f"${index}",
+}
+
+
+@attr.s(frozen=True)
+class SQLFragment:
+    """SQL expression, with the values of its parameters in order."""
+
+    sql: str = attr.ib()
+    params: Tuple[Any, ...] = attr.ib(default=(), converter=tuple)
+
+
+@attr.s(frozen=True, eq=False)
+class _Term:
+    """SQL expression during translation, combined with Python operators."""
+
+    sql: str = attr.ib()
+    params: Tuple[Any, ...] = attr.ib(default=())
+
+    def _binary(self, op: str, other: "_Term") -> "_Term":
+        return _Term(f"({self.sql} {op} {other.sql})", self.params + other.params)
+
+    def __eq__(self, other: "_Term") -> "_Term":  # type: ignore[override]
+        return self._binary("=", other)
+
+    def __lt__(self, other: "_Term") -> "_Term":
+        return self._binary("<", other)
+
+    def __le__(self, other: "_Term") -> "_Term":
+        return self._binary("<=", other)
+
+    def __gt__(self, other: "_Term") -> "_Term":
+        return self._binary(">", other)
+
+    def __ge__(self, other: "_Term") -> "_Term":
+        return self._binary(">=", other)
+
+    def __and__(self, other: "_Term") -> "_Term":
+        return self._binary("AND", other)
+
+    def __or__(self, other: "_Term") -> "_Term":
+        return self._binary("OR", other)
+
+
+def _join(template: str, terms: List[_Term]) -> _Term:
+    return _Term(
+        template.format(*(term.sql for term in terms)),
+        sum((term.params for term in terms), ()),
+    )
+
+
+@attr.s(frozen=True)
+class SQLDialect:
+    """Generic ANSI SQL, with SQL/MM spatial functions.
+
+    Attributes:
+        paramstyle: DB-API parameter style of the placeholders, "qmark", "format",
+            "numeric" or "dollar".
+    """
+
+    name = "ansi"
+
+    # SQL templates of operators, functions and typed values, `{}` standing for
+    # their arguments; operators missing here are not supported by the dialect
+    templates: Dict[str, str] = {
+        "%": "MOD({}, {})",
+        "^": "POWER({}, {})",
+        "div": "FLOOR({} / {})",
+        "casei": "LOWER({})",
+        "like": "({} LIKE {} ESCAPE '\\')",
+        "timestamp": "CAST({} AS TIMESTAMP WITH TIME ZONE)",
+        "timestamp_column": "{}",
+        "date": "CAST({} AS DATE)",
+        "date_column": "CAST({} AS DATE)",
+        "geometry": "ST_GeomFromGeoJSON({})",
+        "bbox": "ST_MakeEnvelope({}, {}, {}, {}, 4326)",
+        "s_intersects": "ST_Intersects({}, {})",
+        "s_disjoint": "ST_Disjoint({}, {})",
+    }
+
+    paramstyle: str = attr.ib(
+        default="qmark", validator=attr.validators.in_(_PLACEHOLDERS)
+    )
+
+    def template(self, key: str) -> str:
+        """Return the SQL template of an operator, function or typed value."""
+        try:
+            return self.templates[key]
+        except KeyError:
+            raise InvalidQueryParameter(
+                f"{key} is not supported by the {self.name} SQL dialect"
+            ) from None
+
+    def placeholder(self, index: int) -> str:
+        """Return the placeholder of the parameter at `index`, counted from 1."""
+        return _PLACEHOLDERS[self.paramstyle](index)
+
+    def quote_identifier(self, name: str) -> str:
+        """Quote a column name."""
+        return '"' + name.replace('"', '""') + '"'
+
+    def timestamp_value(self, value: datetime) -> Any:
+        """Return the parameter value of a timestamp."""
+        return value
+
+    def date_value(self, value: date) -> Any:
+        """Return the parameter value of a date."""
+        return value
+
+
+@attr.s(frozen=True)
+class SQLiteDialect(SQLDialect):
+    """SQLite, with timestamps and dates stored as RFC 3339 text.
+
+    Timestamps compare as `julianday` numbers, so that differently formatted
+    timestamps and time zones compare correctly. There are no spatial functions.
+    """
+
+    name = "sqlite"
+    templates: Dict[str, str] = {
+        "%": "({} % {})",
+        "^": "POWER({}, {})",
+        "div": "CAST({} / {} AS INTEGER)",
+        "casei": "LOWER({})",
+        "like": "({} LIKE {} ESCAPE '\\')",
+        "timestamp": "julianday({})",
+        "timestamp_column": "julianday({})",
+        "date": "date({})",
+        "date_column": "date({})",
+    }
+
+    def timestamp_value(self, value: datetime) -> Any:
+        """Return the parameter value of a timestamp."""
+        # julianday has a millisecond precision, and rounds greater ones
+        return value.isoformat(timespec="milliseconds")
+
+    def date_value(self, value: date) -> Any:
+        """Return the parameter value of a date."""
+        return value.isoformat()
+
+
+def queryable_columns(
+    queryables: Dict[str, Any], column: Optional[Callable[[str], str]] = None
+) -> Dict[str, str]:
+    """Map the queryables returned by `get_queryables` to SQL column expressions.
+
+    Args:
+        queryables: the queryables JSON schema.
+        column: SQL expression of a queryable, by default its quoted name.
+    """
+    column = column or SQLDialect().quote_identifier
+    return {name: column(name) for name in queryables.get("properties", {})}
+
+
+def _bound(us: int) -> datetime:
+    if us == MIN_TIME:
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if us == MAX_TIME:
+        return datetime.max.replace(tzinfo=timezone.utc)
+    return epoch_us_to_datetime(us)
+
+
+def _temporal_type(args: Tuple[Expression, ...]) -> Optional[str]:
+    """Return "timestamp" or "date" when comparing with such literals."""
+    for arg in args:
+        if isinstance(arg, Operation) and arg.op == "array":
+            arg_type = _temporal_type(arg.args)
+            if arg_type:
+                return arg_type
+        elif isinstance(arg, Literal) and arg.type in ("timestamp", "date"):
+            return arg.type
+    return None
+
+
+@attr.s
+class SQLTranslator:
+    """Translate parsed CQL2 filters to parameterized SQL.
+
+    Translations are cached by filter, so an identical filter returns the same
+    SQL text, reused by drivers as a prepared statement. Nulls follow the SQL
+    three-valued logic: unlike `compile_predicate`, the negation of a comparison
+    with null does not match.
+
+    Attributes:
+        dialect: SQL dialect of the translation.
+        columns: SQL expression of each queryable; other properties are invalid.
+            When not set, properties map to the columns of the same name.
+        cache_size: number of translations cached.
+    """
+
+    dialect: SQLDialect = attr.ib(factory=SQLDialect)
+    columns: Optional[Mapping[str, str]] = attr.ib(default=None)
+    cache_size: int = attr.ib(default=CACHE_SIZE)
+
+    def __attrs_post_init__(self):
+        """Create the translation cache."""
+        self._translate_cached = functools.lru_cache(maxsize=self.cache_size)(
+            self._translate
+        )
+
+    def translate(self, expression: Expression) -> SQLFragment:
+        """Translate a parsed filter to a SQL boolean expression.
+
+        Raises:
+            InvalidQueryParameter: if the filter uses unknown queryables or
+                operators the dialect does not support.
+        """
+        return self._translate_cached(expression)
+
+    def translate_filter(
+        self, filter: Union[Dict[str, Any], str], filter_lang: Optional[str] = None
+    ) -> SQLFragment:
+        """Parse and translate a filter, as given in a search request."""
+        return self.translate(parse_filter(filter, filter_lang))
+
+    def cache_clear(self) -> None:
+        """Empty the translation cache, e.g. after changing the columns."""
+        self._translate_cached.cache_clear()
+
+    def _translate(self, expression: Expression) -> SQLFragment:
+        term = self._term(expression)
+        parts = term.sql.split(_PARAMETER)
+        sql = parts[0]
+        for index, part in enumerate(parts[1:], start=1):
+            sql += self.dialect.placeholder(index) + part
+        return SQLFragment(sql, term.params)
+
+    def _column(self, name: str) -> str:
+        name = _property_name(name)
+        if _PARAMETER in name:
+            raise InvalidQueryParameter(f"Invalid property name {name!r}")
+        if self.columns is None:
+            return self.dialect.quote_identifier(name)
+        if name not in self.columns:
+            raise InvalidQueryParameter(f"Unknown queryable: {name}")
+        return self.columns[name]
+
+    def _parameter(self, value: Any, template: str = "{}") -> _Term:
+        return _Term(template.format(_PARAMETER), (value,))
+
+    def _literal(self, literal: Literal) -> _Term:
+        value = _literal_value(literal)
+        if literal.type == "timestamp":
+            value = self.dialect.timestamp_value(value)
+        elif literal.type == "date":
+            value = self.dialect.date_value(value)
+        elif literal.type == "geometry":
+            value = literal.value
+        elif literal.type == "bbox":
+            bbox = literal.value
+            if len(bbox) == 6:
+                bbox = (bbox[0], bbox[1], bbox[3], bbox[4])
+            return _join(
+                self.dialect.template("bbox"), [_Term(_PARAMETER, (v,)) for v in bbox]
+            )
+        elif literal.type == "interval":
+            raise InvalidQueryParameter(
+                "Intervals are only valid in temporal operators"
+            )
+        elif value is None:
+            return _Term("NULL")
+        template = "{}"
+        if literal.type in ("timestamp", "date", "geometry"):
+            template = self.dialect.template(literal.type)
+        return self._parameter(value, template)
+
+    def _term(self, expression: Expression, temporal: Optional[str] = None) -> _Term:
+        """Translate an expression.
+
+        Args:
+            temporal: "timestamp" or "date" when columns hold such values.
+        """
+        if isinstance(expression, Property):
+            column = _Term(self._column(expression.name))
+            if temporal:
+                return _join(self.dialect.template(f"{temporal}_column"), [column])
+            return column
+        if isinstance(expression, Literal):
+            return self._literal(expression)
+        return self._operation(expression.op, expression.args)
+
+    def _operation(self, op: str, args: Tuple[Expression, ...]) -> _Term:
+        _check_arity(op, args)
+        if op in _TEMPORAL:
+            a, b = (self._span(arg) for arg in args)
+            return _TEMPORAL[op](*a, *b)
+        temporal = (
+            _temporal_type(args) if op in (*_COMPARISONS, "between", "in") else None
+        )
+        terms = [self._term(arg, temporal) for arg in args]
+        if op in ("and", "or"):
+            return _join("(" + f" {op.upper()} ".join(["{}"] * len(terms)) + ")", terms)
+        if op == "not":
+            return _join("(NOT {})", terms)
+        if op in _COMPARISONS or op in ("+", "-", "*", "/"):
+            return _join(f"({{}} {op} {{}})", terms)
+        if op == "between":
+            return _join("({} BETWEEN {} AND {})", terms)
+        if op == "isNull":
+            return _join("({} IS NULL)", terms)
+        if op == "in":
+            return self._in(args, terms)
+        if op == "array":
+            return _join("(" + ", ".join(["{}"] * len(terms)) + ")", terms)
+        return _join(self.dialect.template(op), terms)
+
+    def _in(self, args: Tuple[Expression, ...], terms: List[_Term]) -> _Term:
+        values = args[1]
+        if not isinstance(values, Operation) or values.op != "array":
+            raise InvalidQueryParameter("in expects a list of values")
+        if not values.args:
+            return _Term("(1 = 0)")
+        return _join("({} IN {})", terms)
+
+    def _span(self, expression: Expression) -> Tuple[_Term, _Term]:
+        if isinstance(expression, Literal) and expression.type != "value":
+            template = self.dialect.template("timestamp")
+            start, end = (
+                self._parameter(self.dialect.timestamp_value(_bound(us)), template)
+                for us in _literal_span(expression)
+            )
+            return start, end
+        term = self._term(expression, "timestamp")
+        return term, term
@@ -2,5 +2,11 @@
 
 from .pagination import PaginationExtension
 from .token_pagination import TokenPaginationExtension
+from .tokens import PaginationTokenCodec, pagination_query_hash
 
-__all__ = ["PaginationExtension", "TokenPaginationExtension"]
+__all__ = [
+    "PaginationExtension",
+    "PaginationTokenCodec",
+    "TokenPaginationExtension",
+    "pagination_query_hash",
+]
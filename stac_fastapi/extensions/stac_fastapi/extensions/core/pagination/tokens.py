@@ -0,0 +1,172 @@
+"""Signed pagination tokens for keyset pagination.
+
+A token holds the sort key of the last item of a page, so that backends seek the
+next page with `WHERE (sort key) > (token key)` on an index rather than skipping
+an offset. Tokens are bound to their query and signed with an HMAC, so tampered
+tokens, and tokens of another query, are rejected before reaching the database.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import importlib.util
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import attr
+
+from stac_fastapi.types.canonical import SearchRequest, search_hash
+from stac_fastapi.types.errors import InvalidQueryParameter
+from stac_fastapi.types.rfc3339 import datetime_to_epoch_us, epoch_us_to_datetime
+
+# Leading byte of tokens, giving the serialization of their key
+MSGPACK_FORMAT = 1
+JSON_FORMAT = 2
+
+# Longer tokens are rejected without being decoded
+MAX_TOKEN_LENGTH = 2048
+
+# Search parameters which do not change the order of results, ignored by
+# `pagination_query_hash`
+PAGE_PARAMETERS = ("token", "limit")
+
+# Test for msgpack and use it rather than JSON for more compact tokens
+if importlib.util.find_spec("msgpack") is not None:
+    import msgpack
+
+    FORMAT = MSGPACK_FORMAT
+else:
+    msgpack = None
+    FORMAT = JSON_FORMAT
+
+KeyValue = Union[None, bool, int, float, str, datetime]
+
+
+def _to_bytes(value: Union[str, bytes]) -> bytes:
+    return value.encode("utf-8") if isinstance(value, str) else bytes(value)
+
+
+def _pack_value(value: KeyValue) -> Any:
+    if isinstance(value, datetime):
+        # datetimes are the only mapping in keys
+        return {"t": datetime_to_epoch_us(value)}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Cannot encode {type(value).__name__} in a pagination token")
+
+
+def _unpack_value(value: Any) -> KeyValue:
+    if isinstance(value, dict):
+        if set(value) != {"t"} or not isinstance(value["t"], int):
+            raise ValueError(f"Invalid key value {value}")
+        return epoch_us_to_datetime(value["t"])
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise ValueError(f"Invalid key value {value}")
+
+
+def _dumps(key: List[Any], format: int) -> bytes:
+    if format == MSGPACK_FORMAT:
+        return msgpack.packb(key, use_bin_type=True)
+    return json.dumps(key, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _loads(payload: bytes, format: int) -> Any:
+    if format == MSGPACK_FORMAT:
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if format == JSON_FORMAT:
+        return json.loads(payload)
+    raise ValueError(f"Unknown token format {format}")
+
+
+def pagination_query_hash(search: SearchRequest) -> str:
+    """Return the hash of a search binding its pagination tokens.
+
+    Like `search_hash`, ignoring the page parameters, `token` and `limit`, so
+    that every page of a search shares the hash.
+    """
+    return search_hash(search, ignored=PAGE_PARAMETERS)
+
+
+@attr.s(frozen=True)
+class PaginationTokenCodec:
+    """Encode and decode signed keyset pagination tokens.
+
+    Tokens are the base64url encoding of a format byte, the sort key of the last
+    item of a page, serialized with msgpack when installed and compact JSON
+    otherwise, and a truncated HMAC-SHA256 of the key and of the query hash. The
+    query hash is signed but not stored, so a token only decodes for the query
+    it was issued for.
+
+    Key values are None, booleans, numbers, strings or datetimes, decoded as
+    UTC datetimes.
+
+    Attributes:
+        secret: HMAC key, shared by every instance serving the API.
+        digest_size: bytes of the HMAC kept in tokens.
+    """
+
+    secret: bytes = attr.ib(converter=_to_bytes, repr=False)
+    digest_size: int = attr.ib(default=16)
+
+    @secret.validator
+    def _check_secret(self, attribute, value):
+        if not value:
+            raise ValueError("secret must not be empty")
+
+    @digest_size.validator
+    def _check_digest_size(self, attribute, value):
+        if not 8 <= value <= hashlib.sha256().digest_size:
+            raise ValueError("digest_size must be between 8 and 32")
+
+    def _signature(self, payload: bytes, query_hash: str) -> bytes:
+        message = payload + b"\x00" + query_hash.encode("utf-8")
+        return hmac.new(self.secret, message, hashlib.sha256).digest()[
+            : self.digest_size
+        ]
+
+    def encode(self, key: Sequence[KeyValue], query_hash: str = "") -> str:
+        """Return the token of the page following the item with sort key `key`.
+
+        Args:
+            key: the sort key of the last item of the page.
+            query_hash: hash of the search, e.g. from `pagination_query_hash`.
+        """
+        payload = bytes([FORMAT]) + _dumps([_pack_value(v) for v in key], FORMAT)
+        token = payload + self._signature(payload, query_hash)
+        return base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
+
+    def decode(
+        self, token: Optional[str], query_hash: str = ""
+    ) -> Optional[Tuple[KeyValue, ...]]:
+        """Return the sort key of a token, None without a token.
+
+        Args:
+            token: a token returned by `encode`.
+            query_hash: hash of the search, as given to `encode`.
+
+        Raises:
+            InvalidQueryParameter: if the token is malformed, tampered with or
+                issued for another query.
+        """
+        if not token:
+            return None
+        try:
+            if len(token) > MAX_TOKEN_LENGTH:
+                raise ValueError("Token too long")
+            data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload, signature = data[: -self.digest_size], data[-self.digest_size :]
+            if len(payload) < 2 or not hmac.compare_digest(
+                signature, self._signature(payload, query_hash)
+            ):
+                raise ValueError("Invalid signature")
+            key = _loads(payload[1:], payload[0])
+            if not isinstance(key, list):
+                raise ValueError("Invalid key")
+            return tuple(_unpack_value(value) for value in key)
+        except (ValueError, TypeError, binascii.Error) as e:
+            raise InvalidQueryParameter(f"Invalid pagination token {token}") from e
@@ -1,6 +1,8 @@
 """Transaction extension."""
 
-from typing import List, Optional, Type, Union
+import functools
+import inspect
+from typing import Any, Callable, List, Optional, Type, Union
 
 import attr
 from fastapi import APIRouter, Body, FastAPI
@@ -8,6 +10,7 @@ from stac_pydantic import Catalog, Collection, Item
 from starlette.responses import JSONResponse, Response
 
 from stac_fastapi.api.models import CatalogUri, CollectionUri, ItemUri
+from stac_fastapi.api.response_cache import purge_response_cache
 from stac_fastapi.api.routes import create_async_endpoint
 from stac_fastapi.types import stac as stac_types
 from stac_fastapi.types.config import ApiSettings
@@ -16,6 +19,74 @@ from stac_fastapi.types.extension import ApiExtension
 from stac_fastapi.types.search import APIRequest
 
 
+def _run_after(func: Callable, callback: Callable[[tuple, dict], None]) -> Callable:
+    """Call `callback` with the arguments of `func` after it has successfully run."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def _async_wrapper(*args, **kwargs):
+            resp = await func(*args, **kwargs)
+            callback(args, kwargs)
+            return resp
+
+        return _async_wrapper
+
+    @functools.wraps(func)
+    def _wrapper(*args, **kwargs):
+        resp = func(*args, **kwargs)
+        callback(args, kwargs)
+        return resp
+
+    return _wrapper
+
+
+def _clear_landing_page_cache(args: tuple, kwargs: dict) -> None:
+    landing_page_cache = getattr(
+        kwargs["request"].app.state, "landing_page_cache", None
+    )
+    if landing_page_cache is not None:
+        landing_page_cache.clear()
+
+
+def invalidate_landing_page(func: Callable) -> Callable:
+    """Clear the cached landing page after `func` has successfully run.
+
+    Wraps transaction client methods which add, modify or remove catalogs or
+    collections, since these are listed on the landing page.
+    """
+    return _run_after(func, _clear_landing_page_cache)
+
+
+def _catalog_id(catalog: Any) -> Optional[str]:
+    if isinstance(catalog, dict):
+        return catalog.get("id")
+    return getattr(catalog, "id", None)
+
+
+def invalidate_catalog_path(func: Callable, created: bool = False) -> Callable:
+    """Forget the catalog paths resolved by the API after `func` has successfully run.
+
+    Wraps transaction client methods which modify or remove the catalog at
+    `catalog_path`, whose path and nested paths are invalidated. With `created`,
+    `catalog_path` is the parent of the new catalog, and only the path of the new
+    catalog is invalidated, e.g. in case it replaces a catalog deleted by another
+    process.
+    """
+
+    def _invalidate(args: tuple, kwargs: dict) -> None:
+        resolver = getattr(kwargs["request"].app.state, "catalog_resolver", None)
+        if resolver is None:
+            return
+        catalog_path = kwargs.get("catalog_path") or ""
+        if created:
+            catalog = kwargs["catalog"] if "catalog" in kwargs else args[0]
+            catalog_path = "/".join(filter(None, [catalog_path, _catalog_id(catalog)]))
+        if catalog_path:
+            resolver.invalidate(catalog_path)
+
+    return _run_after(func, _invalidate)
+
+
 @attr.s
 class PostItem(CollectionUri):
     """Create Item."""
@@ -100,7 +171,9 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["POST"],
-            endpoint=create_async_endpoint(self.client.create_item, PostItem),
+            endpoint=create_async_endpoint(
+                purge_response_cache(self.client.create_item), PostItem
+            ),
         )
 
     def register_update_item(self):
@@ -114,7 +187,9 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["PUT"],
-            endpoint=create_async_endpoint(self.client.update_item, PutItem),
+            endpoint=create_async_endpoint(
+                purge_response_cache(self.client.update_item), PutItem
+            ),
         )
 
     def register_delete_item(self):
@@ -128,7 +203,9 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["DELETE"],
-            endpoint=create_async_endpoint(self.client.delete_item, ItemUri),
+            endpoint=create_async_endpoint(
+                purge_response_cache(self.client.delete_item), ItemUri
+            ),
         )
 
     def register_create_collection(self):
@@ -142,7 +219,10 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_none=True,
             methods=["POST"],
             endpoint=create_async_endpoint(
-                self.client.create_collection, PostCollection
+                purge_response_cache(
+                    invalidate_landing_page(self.client.create_collection)
+                ),
+                PostCollection,
             ),
         )
 
@@ -157,7 +237,10 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_none=True,
             methods=["PUT"],
             endpoint=create_async_endpoint(
-                self.client.update_collection, PutCollection
+                purge_response_cache(
+                    invalidate_landing_page(self.client.update_collection)
+                ),
+                PutCollection,
             ),
         )
 
@@ -172,7 +255,10 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_none=True,
             methods=["DELETE"],
             endpoint=create_async_endpoint(
-                self.client.delete_collection, CollectionUri
+                purge_response_cache(
+                    invalidate_landing_page(self.client.delete_collection)
+                ),
+                CollectionUri,
             ),
         )
 
@@ -186,7 +272,15 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["POST"],
-            endpoint=create_async_endpoint(self.client.create_catalog, PostCatalog),
+            endpoint=create_async_endpoint(
+                purge_response_cache(
+                    invalidate_catalog_path(
+                        invalidate_landing_page(self.client.create_catalog),
+                        created=True,
+                    )
+                ),
+                PostCatalog,
+            ),
         )
 
     def register_create_base_catalog(self):
@@ -199,7 +293,15 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["POST"],
-            endpoint=create_async_endpoint(self.client.create_catalog, PostBaseCatalog),
+            endpoint=create_async_endpoint(
+                purge_response_cache(
+                    invalidate_catalog_path(
+                        invalidate_landing_page(self.client.create_catalog),
+                        created=True,
+                    )
+                ),
+                PostBaseCatalog,
+            ),
         )
 
     def register_create_super_catalog(self):
@@ -213,7 +315,12 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_none=True,
             methods=["POST"],
             endpoint=create_async_endpoint(
-                self.client.create_super_catalog, stac_types.Catalog
+                purge_response_cache(
+                    invalidate_catalog_path(
+                        self.client.create_super_catalog, created=True
+                    )
+                ),
+                stac_types.Catalog,
             ),
         )
 
@@ -227,7 +334,14 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["PUT"],
-            endpoint=create_async_endpoint(self.client.update_catalog, PostCatalog),
+            endpoint=create_async_endpoint(
+                purge_response_cache(
+                    invalidate_catalog_path(
+                        invalidate_landing_page(self.client.update_catalog)
+                    )
+                ),
+                PostCatalog,
+            ),
         )
 
     def register_delete_catalog(self):
@@ -240,7 +354,14 @@ class TransactionExtension(ApiExtension):
             response_model_exclude_unset=True,
             response_model_exclude_none=True,
             methods=["DELETE"],
-            endpoint=create_async_endpoint(self.client.delete_catalog, CatalogUri),
+            endpoint=create_async_endpoint(
+                purge_response_cache(
+                    invalidate_catalog_path(
+                        invalidate_landing_page(self.client.delete_catalog)
+                    )
+                ),
+                CatalogUri,
+            ),
         )
 
     def register(self, app: FastAPI) -> None:
@@ -9,6 +9,7 @@ from fastapi import APIRouter, FastAPI
 from pydantic import BaseModel
 
 from stac_fastapi.api.models import create_request_model
+from stac_fastapi.api.response_cache import purge_response_cache
 from stac_fastapi.api.routes import create_async_endpoint
 from stac_fastapi.types.extension import ApiExtension
 
@@ -138,7 +139,7 @@ class BulkTransactionExtension(ApiExtension):
             response_model_exclude_none=True,
             methods=["POST"],
             endpoint=create_async_endpoint(
-                self.client.bulk_item_insert, items_request_model
+                purge_response_cache(self.client.bulk_item_insert), items_request_model
             ),
         )
         app.include_router(router, tags=["Bulk Transaction Extension"])
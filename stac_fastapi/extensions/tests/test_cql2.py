@@ -0,0 +1,256 @@
+import pytest
+
+from stac_fastapi.extensions.core.filter import (
+    compile_filter,
+    compile_mask,
+    parse_cql2_json,
+    parse_cql2_text,
+)
+from stac_fastapi.extensions.core.filter.cql2 import Literal, Operation, Property
+from stac_fastapi.types.errors import InvalidQueryParameter
+
+ITEM = {
+    "type": "Feature",
+    "id": "item-1",
+    "collection": "sentinel",
+    "geometry": {"type": "Point", "coordinates": [5, 5]},
+    "bbox": [5, 5, 5, 5],
+    "properties": {
+        "datetime": "2020-06-15T12:00:00Z",
+        "eo:cloud_cover": 12.5,
+        "platform": "Sentinel-2B",
+        "instruments": ["msi", "tirs"],
+        "title": "Élan",
+    },
+}
+
+SQUARE = {
+    "type": "Polygon",
+    "coordinates": [[[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]],
+}
+
+
+def test_text_and_json_parse_to_the_same_expression():
+    text = "\"eo:cloud_cover\" <= 20 AND NOT collection IN ('a', 'b') OR id = 'x'"
+    json_filter = {
+        "op": "or",
+        "args": [
+            {
+                "op": "and",
+                "args": [
+                    {"op": "<=", "args": [{"property": "eo:cloud_cover"}, 20]},
+                    {
+                        "op": "not",
+                        "args": [
+                            {
+                                "op": "in",
+                                "args": [{"property": "collection"}, ["a", "b"]],
+                            }
+                        ],
+                    },
+                ],
+            },
+            {"op": "=", "args": [{"property": "id"}, "x"]},
+        ],
+    }
+    assert parse_cql2_text(text) == parse_cql2_json(json_filter)
+
+
+def test_parse_text_literals():
+    assert parse_cql2_text("a + -2 * b ^ 2 > 1.5e1") == Operation(
+        ">",
+        [
+            Operation(
+                "+",
+                [
+                    Property("a"),
+                    Operation(
+                        "*",
+                        [Literal(-2), Operation("^", [Property("b"), Literal(2)])],
+                    ),
+                ],
+            ),
+            Literal(15.0),
+        ],
+    )
+    assert parse_cql2_text("title = 'it''s'").args[1] == Literal("it's")
+    assert parse_cql2_text("d > DATE('2020-01-01')").args[1] == Literal(
+        "2020-01-01", "date"
+    )
+    expression = parse_cql2_text("S_INTERSECTS(geometry, MULTIPOINT ((1 2), (3 -4)))")
+    assert expression.op == "s_intersects"
+    assert (
+        parse_cql2_json(
+            {
+                "op": "s_intersects",
+                "args": [
+                    {"property": "geometry"},
+                    {"type": "MultiPoint", "coordinates": [[1, 2], [3, -4]]},
+                ],
+            }
+        )
+        == expression
+    )
+
+
+def test_parse_is_memoized():
+    a = parse_cql2_json({"op": "=", "args": [{"property": "id"}, "x"]})
+    b = parse_cql2_json('{"args": [{"property": "id"}, "x"], "op": "="}')
+    assert a is b
+    assert compile_filter("id = 'x'") is compile_filter("id  =  'x'")
+
+
+@pytest.mark.parametrize(
+    "filter,expected",
+    [
+        ("id = 'item-1' AND collection = 'sentinel'", True),
+        ('"eo:cloud_cover" < 10', False),
+        ('"eo:cloud_cover" BETWEEN 10 AND 20', True),
+        ('"eo:cloud_cover" * 2 = 25', True),
+        ("platform LIKE 'Sentinel-2_'", True),
+        ("platform NOT LIKE 'Landsat%'", True),
+        ("CASEI(platform) = CASEI('SENTINEL-2B')", True),
+        ("ACCENTI(title) = 'Elan'", True),
+        ("missing IS NULL AND platform IS NOT NULL", True),
+        ("missing > 1 OR missing = 1", False),
+        ("platform IN ('Sentinel-2A', 'Sentinel-2B')", True),
+        ("datetime > TIMESTAMP('2020-06-01T00:00:00Z')", True),
+        ("datetime = DATE('2020-06-15')", True),
+        ("T_INTERSECTS(datetime, INTERVAL('2020-06-15', '..'))", True),
+        ("T_BEFORE(datetime, TIMESTAMP('2020-06-15T11:59:59Z'))", False),
+        (
+            "T_DURING(datetime, INTERVAL('2020-01-01', '2021-01-01T00:00:00Z'))",
+            True,
+        ),
+        ("S_INTERSECTS(geometry, POLYGON((0 0, 10 0, 10 10, 0 10, 0 0)))", True),
+        ("S_INTERSECTS(geometry, BBOX(6, 6, 7, 7))", False),
+        ("S_DISJOINT(geometry, BBOX(6, 6, 7, 7))", True),
+        ("A_CONTAINS(instruments, ('msi'))", True),
+        ("A_OVERLAPS(instruments, ('oli', 'tirs'))", True),
+        ("A_CONTAINEDBY(instruments, ('msi', 'oli'))", False),
+        ("TRUE AND NOT FALSE", True),
+    ],
+)
+def test_predicate(filter, expected):
+    assert compile_filter(filter)(ITEM) is expected
+
+
+def test_json_predicate():
+    predicate = compile_filter(
+        {
+            "op": "and",
+            "args": [
+                {"op": "s_intersects", "args": [{"property": "geometry"}, SQUARE]},
+                {
+                    "op": "t_intersects",
+                    "args": [
+                        {"property": "datetime"},
+                        {"interval": ["2020-06-01T00:00:00Z", ".."]},
+                    ],
+                },
+                {
+                    "op": "like",
+                    "args": [
+                        {"op": "casei", "args": [{"property": "platform"}]},
+                        {"op": "casei", "args": ["sentinel%"]},
+                    ],
+                },
+            ],
+        }
+    )
+    assert predicate(ITEM)
+    assert not predicate({**ITEM, "geometry": None})
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        "id = ",
+        "id = 'x' AND",
+        "id NOT = 'x'",
+        "UNKNOWN(id)",
+        "datetime > TIMESTAMP('yesterday')",
+        "T_BEFORE(datetime)",
+        "id = 'x' 'y'",
+        "id ~ 'x'",
+        "S_INTERSECTS(geometry, BBOX(1, 2, 3))",
+        "CASEI(id, 'x') = 'x'",
+        "(" * 10_000 + "id = 'x'" + ")" * 10_000,
+        "NOT " * 10_000 + "id = 'x'",
+        "NOT " * 100 + "id = 'x'",
+    ],
+)
+def test_invalid_text(filter):
+    with pytest.raises(InvalidQueryParameter):
+        compile_filter(filter)
+
+
+def _nested(filter, depth):
+    for _ in range(depth):
+        filter = {"op": "not", "args": [filter]}
+    return filter
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        {"op": "unknown", "args": []},
+        {"op": "=", "args": [{"property": 1}, 1]},
+        {"op": "t_after", "args": [{"property": "d"}, {"interval": ["2020-01-01"]}]},
+        {"unexpected": 1},
+        {"op": "=", "args": 5},
+        {"op": "=", "args": [{"property": "a"}]},
+        {"op": "between", "args": [{"property": "a"}, 1]},
+        {"op": "not", "args": [True, False]},
+        {"function": "foo"},
+        {"function": {"name": "casei", "args": "a"}},
+        {"op": "s_intersects", "args": [{"property": "geometry"}, {"bbox": 5}]},
+        {"op": "s_intersects", "args": [{"property": "geometry"}, {"bbox": [1, 2, 3]}]},
+        {"op": "s_intersects", "args": [{"property": "geometry"}, {"type": "Point"}]},
+        {"op": "s_intersects", "args": [{"property": "g"}, {"type": "Pt", "x": 1}]},
+        {"op": "not", "args": [{"op": "isNull", "args": []}]},
+        {"op": "in", "args": [{"property": "cloud"}, 5]},
+        {"op": "in", "args": [{"property": "cloud"}, {"property": "values"}]},
+        _nested({"op": "isNull", "args": [None]}, 100),
+        _nested({"op": "isNull", "args": [None]}, 10_000),
+    ],
+)
+def test_invalid_json(filter):
+    with pytest.raises(InvalidQueryParameter):
+        compile_filter(filter)
+
+
+def test_mask():
+    np = pytest.importorskip("numpy")
+    columns = {
+        "eo:cloud_cover": np.array([5.0, 50.0, np.nan, 15.0]),
+        "platform": np.array(["a", "b", "a", None], dtype=object),
+        "datetime": np.array(
+            ["2020-01-01", "2021-01-01", "NaT", "2020-06-01"], dtype="datetime64[us]"
+        ),
+        "geometry": np.array(
+            [{"type": "Point", "coordinates": [x, x]} for x in (1, 2, 20, 5)],
+            dtype=object,
+        ),
+    }
+
+    def mask(filter):
+        return compile_mask(parse_cql2_text(filter))(columns).tolist()
+
+    assert mask('"eo:cloud_cover" < 20') == [True, False, False, True]
+    assert mask('"eo:cloud_cover" IS NULL') == [False, False, True, False]
+    assert mask("platform = 'a' OR platform LIKE 'b%'") == [True, True, True, False]
+    assert mask("datetime < TIMESTAMP('2020-12-01T00:00:00Z')") == [
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert mask("T_AFTER(datetime, DATE('2020-01-01'))") == [False, True, False, True]
+    assert mask("S_INTERSECTS(geometry, BBOX(0, 0, 10, 10))") == [
+        True,
+        True,
+        False,
+        True,
+    ]
+    assert mask("TRUE") == [True] * 4
@@ -0,0 +1,155 @@
+import sqlite3
+
+import pytest
+
+from stac_fastapi.extensions.core.filter import (
+    SQLDialect,
+    SQLiteDialect,
+    SQLTranslator,
+    compile_filter,
+    queryable_columns,
+)
+from stac_fastapi.types.errors import InvalidQueryParameter
+
+ROWS = [
+    ("a", "s2", "2020-01-01T00:00:00Z", 5.0, "Sentinel-2A"),
+    ("b", "s2", "2020-06-15T12:00:00+02:00", 50.0, "Sentinel-2B"),
+    ("c", "l8", "2021-03-01T00:00:00Z", None, "Landsat-8"),
+    ("d", "l8", "2019-12-31T23:59:59.5Z", 15.0, None),
+]
+
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:")
+    connection.execute(
+        "CREATE TABLE items "
+        '(id TEXT, collection TEXT, datetime TEXT, "eo:cloud_cover" REAL, platform TEXT)'
+    )
+    connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?)", ROWS)
+    yield connection
+    connection.close()
+
+
+def _item(row):
+    id, collection, datetime, cloud_cover, platform = row
+    properties = {"datetime": datetime, "eo:cloud_cover": cloud_cover}
+    if platform is not None:
+        properties["platform"] = platform
+    return {"id": id, "collection": collection, "properties": properties}
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        "collection = 's2' AND \"eo:cloud_cover\" < 10",
+        '"eo:cloud_cover" BETWEEN 10 AND 60 OR platform IS NULL',
+        "NOT (collection = 's2' OR id = 'c')",
+        '"eo:cloud_cover" * 2 + 1 > 30',
+        "platform LIKE 'Sentinel%'",
+        "platform LIKE 'Sentinel-2\\_' OR id IN ('c', 'd')",
+        "CASEI(platform) = CASEI('LANDSAT-8')",
+        "id IN ()",
+        "datetime > TIMESTAMP('2020-01-01T00:00:00Z')",
+        "datetime <= TIMESTAMP('2020-06-15T10:00:00Z')",
+        "datetime = DATE('2020-06-15')",
+        "T_INTERSECTS(datetime, INTERVAL('2020-01-01', '..'))",
+        "T_BEFORE(datetime, INTERVAL('2020-01-01T00:00:00Z', '..'))",
+        "T_DURING(datetime, INTERVAL('2020-01-01', '2021-01-01'))",
+        "T_AFTER(datetime, DATE('2020-01-01'))",
+    ],
+)
+def test_sqlite_matches_python_evaluation(connection, filter):
+    fragment = SQLTranslator(SQLiteDialect()).translate_filter(filter)
+    ids = [
+        row[0]
+        for row in connection.execute(
+            f"SELECT id FROM items WHERE {fragment.sql} ORDER BY id", fragment.params
+        )
+    ]
+    predicate = compile_filter(filter)
+    assert ids == [row[0] for row in ROWS if predicate(_item(row))]
+
+
+def test_parameters_and_placeholders():
+    filter = {
+        "op": "and",
+        "args": [
+            {"op": "=", "args": [{"property": "collection"}, "s2"]},
+            {
+                "op": "s_intersects",
+                "args": [{"property": "geometry"}, {"bbox": [0, 0, 1, 1]}],
+            },
+        ],
+    }
+    fragment = SQLTranslator(SQLDialect(paramstyle="dollar")).translate_filter(filter)
+    assert fragment.sql == (
+        '(("collection" = $1) AND '
+        'ST_Intersects("geometry", ST_MakeEnvelope($2, $3, $4, $5, 4326)))'
+    )
+    assert fragment.params == ("s2", 0, 0, 1, 1)
+
+    fragment = SQLTranslator(SQLDialect(paramstyle="format")).translate_filter(
+        "id = 'x' OR id = 'y'"
+    )
+    assert fragment.sql == '(("id" = %s) OR ("id" = %s))'
+    assert fragment.params == ("x", "y")
+
+
+def test_queryable_columns():
+    queryables = {"properties": {"eo:cloud_cover": {}, "datetime": {}}}
+    columns = queryable_columns(queryables, lambda name: f"properties->>'{name}'")
+    translator = SQLTranslator(columns=columns)
+    fragment = translator.translate_filter('"eo:cloud_cover" < 10')
+    assert fragment.sql == "(properties->>'eo:cloud_cover' < ?)"
+    assert queryable_columns(queryables) == {
+        "eo:cloud_cover": '"eo:cloud_cover"',
+        "datetime": '"datetime"',
+    }
+    with pytest.raises(InvalidQueryParameter):
+        translator.translate_filter("platform = 'x'")
+
+
+def test_translations_are_cached():
+    translator = SQLTranslator(SQLiteDialect())
+    fragment = translator.translate_filter("id = 'x'")
+    assert translator.translate_filter("id  =  'x'") is fragment
+    # only the parameters differ between filters of the same shape
+    assert translator.translate_filter("id = 'y'").sql == fragment.sql
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        "S_INTERSECTS(geometry, POINT(0 0))",
+        "ACCENTI(platform) = 'x'",
+        "A_CONTAINS(instruments, ('msi'))",
+    ],
+)
+def test_unsupported_by_sqlite(filter):
+    with pytest.raises(InvalidQueryParameter):
+        SQLTranslator(SQLiteDialect()).translate_filter(filter)
+
+
+def test_literals_of_equal_values_and_different_types_are_not_confused():
+    translator = SQLTranslator(SQLiteDialect())
+    for value in [True, 1, 1.0]:
+        fragment = translator.translate_filter(
+            {"op": "=", "args": [{"property": "a"}, value]}
+        )
+        assert fragment.params == (value,)
+        assert type(fragment.params[0]) is type(value)
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        {"op": "=", "args": [{"property": "a"}]},
+        {"op": "casei", "args": [{"property": "a"}, 1, 2]},
+        {"op": "between", "args": [{"property": "a"}, 1]},
+        {"op": "=", "args": [{"property": "a\x00"}, 1]},
+    ],
+)
+def test_invalid_translations(filter):
+    with pytest.raises(InvalidQueryParameter):
+        SQLTranslator(SQLiteDialect()).translate_filter(filter)
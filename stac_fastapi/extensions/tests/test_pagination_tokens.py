@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from stac_fastapi.extensions.core.pagination import (
+    PaginationTokenCodec,
+    pagination_query_hash,
+    tokens,
+)
+from stac_fastapi.types.errors import InvalidQueryParameter
+
+KEY = (datetime(2020, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc), "item-1", 12.5, None)
+
+
+@pytest.fixture(params=[tokens.MSGPACK_FORMAT, tokens.JSON_FORMAT])
+def codec(request, monkeypatch):
+    if request.param == tokens.MSGPACK_FORMAT:
+        pytest.importorskip("msgpack")
+    monkeypatch.setattr(tokens, "FORMAT", request.param)
+    return PaginationTokenCodec("secret")
+
+
+def test_round_trip(codec):
+    token = codec.encode(KEY, "hash")
+    assert token.isascii() and "=" not in token
+    assert codec.decode(token, "hash") == KEY
+    assert codec.decode(None) is None
+    assert codec.decode(codec.encode([1, True])) == (1, True)
+
+
+def test_rejected_tokens(codec):
+    token = codec.encode(KEY, "hash")
+    tampered = token[:-1] + ("A" if token[-1] != "A" else "B")
+    for invalid in [
+        tampered,
+        "x" + token,
+        "not a token",
+        "A" * (tokens.MAX_TOKEN_LENGTH + 1),
+    ]:
+        with pytest.raises(InvalidQueryParameter):
+            codec.decode(invalid, "hash")
+    with pytest.raises(InvalidQueryParameter):
+        codec.decode(token, "other hash")
+    with pytest.raises(InvalidQueryParameter):
+        PaginationTokenCodec("other secret").decode(token, "hash")
+
+
+def test_invalid_codec():
+    with pytest.raises(ValueError):
+        PaginationTokenCodec("")
+    with pytest.raises(ValueError):
+        PaginationTokenCodec("secret", digest_size=4)
+    with pytest.raises(TypeError):
+        PaginationTokenCodec("secret").encode([object()])
+
+
+def test_query_hash_ignores_pages():
+    search = {"collections": ["b", "a"], "limit": 10, "token": "x"}
+    assert pagination_query_hash(search) == pagination_query_hash(
+        {"collections": ["a", "b"], "limit": 50}
+    )
+    assert pagination_query_hash(search) != pagination_query_hash({"ids": ["a"]})
@@ -11,7 +11,6 @@ install_requires = [
     "pydantic[dotenv]<2",
     "stac_pydantic==2.0.*",
     "pystac==1.*",
-    "iso8601>=1.0.2,<2.2.0",
 ]
 
 extra_reqs = {
@@ -0,0 +1,111 @@
+"""In-process caches."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+import attr
+
+
+@attr.s
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds.
+
+    A non-positive `ttl` disables the cache: `set` is a no-op and `get` always
+    misses.
+
+    Attributes:
+        ttl: time to live of an entry, in seconds.
+        maxsize: maximum number of entries kept before evicting the least recently
+            used one.
+        timer: monotonic clock used to compute expiry.
+        on_remove: optional callback called with the key and value of every entry
+            leaving the cache (evicted, expired, replaced or removed), e.g. to
+            release resources held by the value.
+    """
+
+    ttl: float = attr.ib(default=0)
+    maxsize: int = attr.ib(default=128)
+    timer: Callable[[], float] = attr.ib(default=time.monotonic)
+    on_remove: Optional[Callable[[Hashable, Any], None]] = attr.ib(default=None)
+    _data: "OrderedDict[Hashable, Tuple[float, Any]]" = attr.ib(
+        init=False, factory=OrderedDict
+    )
+    _lock: threading.Lock = attr.ib(init=False, factory=threading.Lock)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are stored at all."""
+        return self.ttl > 0
+
+    def _removed(self, entries: List[Tuple[Hashable, Any]]) -> None:
+        if self.on_remove is not None:
+            for key, value in entries:
+                self.on_remove(key, value)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for `key`, or `default` if missing or expired."""
+        if not self.enabled:
+            return default
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= self.timer():
+                del self._data[key]
+            else:
+                self._data.move_to_end(key)
+                return value
+        self._removed([(key, value)])
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store `value` under `key`, for `ttl` seconds if given."""
+        if not self.enabled:
+            return
+        removed = []
+        with self._lock:
+            previous = self._data.get(key)
+            if previous is not None:
+                removed.append((key, previous[1]))
+            self._data[key] = (self.timer() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted_key, (_, evicted) = self._data.popitem(last=False)
+                removed.append((evicted_key, evicted))
+        self._removed(removed)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove `key` from the cache if present."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        if entry is not None:
+            self._removed([(key, entry[1])])
+
+    def prune(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove the entries whose key matches `predicate`.
+
+        Returns:
+            The number of removed entries.
+        """
+        with self._lock:
+            removed = [
+                (key, value) for key, (_, value) in self._data.items() if predicate(key)
+            ]
+            for key, _ in removed:
+                del self._data[key]
+        self._removed(removed)
+        return len(removed)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            removed = [(key, value) for key, (_, value) in self._data.items()]
+            self._data.clear()
+        self._removed(removed)
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including expired ones."""
+        return len(self._data)
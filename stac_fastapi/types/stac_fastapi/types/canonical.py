@@ -0,0 +1,209 @@
+"""Canonical representation of search requests."""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from pydantic import BaseModel
+
+from stac_fastapi.types.search import APIRequest
+
+SearchRequest = Union[APIRequest, BaseModel, Dict[str, Any]]
+
+# Parameters which are never part of the query itself
+IGNORED_PARAMETERS = ("request",)
+
+# Significant digits kept for coordinates
+COORDINATE_PRECISION = 9
+
+
+def _datetime(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _float(value: Union[int, float]) -> float:
+    # `+ 0.0` turns -0.0 into 0.0
+    return round(float(value), COORDINATE_PRECISION) + 0.0
+
+
+def _value(value: Any) -> Any:
+    """Normalize a value to plain JSON types."""
+    if isinstance(value, BaseModel):
+        return _value(value.dict(by_alias=True, exclude_none=True))
+    if isinstance(value, Enum):
+        return _value(value.value)
+    if isinstance(value, datetime):
+        return _datetime(value)
+    if isinstance(value, bool) or value is None or isinstance(value, (str, int)):
+        return value
+    if isinstance(value, float):
+        return _float(value)
+    if isinstance(value, dict):
+        return {str(k): _value(v) for k, v in value.items() if v is not None}
+    if isinstance(value, (set, frozenset)):
+        return sorted(_value(v) for v in value)
+    if isinstance(value, (list, tuple)):
+        return [_value(v) for v in value]
+    return str(value)
+
+
+def _id_list(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = value.split(",")
+    return sorted({str(v).strip() for v in value if str(v).strip()})
+
+
+def _bbox(value: Any) -> List[float]:
+    if isinstance(value, str):
+        value = value.split(",")
+    return [_float(v) for v in value]
+
+
+def _interval(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_datetime(v) if v is not None else ".." for v in value]
+    return _datetime(value)
+
+
+def _coordinates(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_coordinates(v) for v in value]
+    return _float(value)
+
+
+def _geometry(value: Any) -> Any:
+    if isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value):
+        # GET intersects split on commas
+        value = ",".join(value)
+    if isinstance(value, str):
+        value = json.loads(value)
+    geometry = _value(value)
+    if "coordinates" in geometry:
+        geometry["coordinates"] = _coordinates(geometry["coordinates"])
+    if "geometries" in geometry:
+        geometry["geometries"] = [_geometry(g) for g in geometry["geometries"]]
+    return geometry
+
+
+def _sortby(value: Any) -> List[List[str]]:
+    if isinstance(value, str):
+        value = value.split(",")
+    sortby = []
+    for sort in value:
+        if isinstance(sort, str):
+            sort = sort.strip()
+            direction = "desc" if sort.startswith("-") else "asc"
+            sortby.append([sort.lstrip("+-"), direction])
+        else:
+            sort = _value(sort)
+            sortby.append([sort["field"], sort.get("direction", "asc")])
+    return sortby
+
+
+def _fields(value: Any) -> Dict[str, List[str]]:
+    if isinstance(value, (str, list, tuple)):
+        if isinstance(value, str):
+            value = value.split(",")
+        include = {f.lstrip("+") for f in value if not f.startswith("-")}
+        exclude = {f[1:] for f in value if f.startswith("-")}
+    else:
+        value = _value(value)
+        include = set(value.get("include") or [])
+        exclude = set(value.get("exclude") or [])
+    return {"include": sorted(include), "exclude": sorted(exclude)}
+
+
+def _json(value: Any) -> Any:
+    return _value(json.loads(value) if isinstance(value, str) else value)
+
+
+NORMALIZERS: Dict[str, Callable[[Any], Any]] = {
+    "catalog_paths": _id_list,
+    "collections": _id_list,
+    "ids": _id_list,
+    "bbox": _bbox,
+    "datetime": _interval,
+    "intersects": _geometry,
+    "limit": int,
+    "sortby": _sortby,
+    "fields": _fields,
+    "query": _json,
+}
+
+
+def _parameters(search: SearchRequest) -> Dict[str, Any]:
+    """Collect the parameters of a GET, POST or catalog POST search request."""
+    if isinstance(search, BaseModel):
+        return search.dict(by_alias=True)
+    parameters = dict(search.kwargs() if isinstance(search, APIRequest) else search)
+    search_request = parameters.pop("search_request", None)
+    if isinstance(search_request, BaseModel):
+        parameters.update(search_request.dict(by_alias=True))
+    return parameters
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, (str, list, tuple, set, frozenset, dict)) and not value:
+        return True
+    return isinstance(value, dict) and all(_is_empty(v) for v in value.values())
+
+
+def canonical_search(search: SearchRequest) -> Dict[str, Any]:
+    """Return the canonical representation of a search request.
+
+    Semantically identical searches have the same representation, whether made
+    with `GET` or `POST`: collection, id and catalog path lists are sorted and
+    deduplicated, bbox and geometry coordinates are floats, datetimes are in UTC,
+    `sortby` and `fields` use a common format, and empty parameters are dropped.
+    The order of `sortby` is kept, since it changes the result order.
+
+    Args:
+        search: a GET request model, a POST request model, or their parameters.
+
+    Returns:
+        A JSON serializable dictionary.
+    """
+    canonical: Dict[str, Any] = {}
+    filter_lang: Optional[str] = None
+    for name, value in _parameters(search).items():
+        name = name.replace("-", "_")
+        if name in IGNORED_PARAMETERS:
+            continue
+        if name == "filter_lang":
+            filter_lang = _value(value)
+            continue
+        value = NORMALIZERS.get(name, _value)(value) if not _is_empty(value) else None
+        if not _is_empty(value):
+            canonical[name] = value
+    if "filter" in canonical and filter_lang is not None:
+        # the filter language only matters along with a filter
+        canonical["filter_lang"] = filter_lang
+    return canonical
+
+
+def search_hash(search: SearchRequest, ignored: Iterable[str] = ()) -> str:
+    """Return a stable 128-bit hash of a search request, as 32 hex digits.
+
+    Computed from `canonical_search`, so semantically identical searches have the
+    same hash.
+
+    Args:
+        search: the search request.
+        ignored: canonical parameters left out of the hash, e.g. `token`.
+    """
+    parameters = canonical_search(search)
+    for name in ignored:
+        parameters.pop(name, None)
+    canonical = json.dumps(
+        parameters,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,28 @@
+"""Conditional request types."""
+
+from datetime import datetime
+from typing import Any, Callable, Optional, Union
+
+import attr
+
+
+@attr.s
+class Versioned:
+    """A response body with the version metadata used for conditional requests.
+
+    Clients may return this from `get_item`, `get_collection` and `get_catalog` to
+    supply their own entity tag or modification time, e.g. from an `updated` column.
+    The API can then answer `If-None-Match` and `If-Modified-Since` requests with
+    `304 Not Modified` without serializing the body. Without an `etag`, one is
+    computed from the serialized body.
+
+    Attributes:
+        body: the STAC object, or a function (or coroutine function) returning it,
+            which is only called when the body has to be sent.
+        etag: entity tag of the body, quoted or not. May be weak (`W/` prefix).
+        last_modified: time the object was last modified.
+    """
+
+    body: Union[Any, Callable[[], Any]] = attr.ib()
+    etag: Optional[str] = attr.ib(default=None)
+    last_modified: Optional[datetime] = attr.ib(default=None)
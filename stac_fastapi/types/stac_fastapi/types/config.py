@@ -17,6 +17,22 @@ class ApiSettings(BaseSettings):
         indexed_fields:
             set of fields which are usually in `item.properties` but are indexed
             as distinct columns in the database.
+        landing_page_cache_ttl:
+            number of seconds a rendered landing page is cached for, per base URL
+            and router prefix. Caching is disabled when 0.
+        feature_sequence_auto_paginate:
+            when search results are requested as `application/geo+json-seq` or
+            NDJSON, follow `next` links server-side and stream every page in a
+            single response.
+        feature_sequence_max_pages:
+            maximum number of pages streamed by an auto-paginated response.
+        response_validation_sample_rate:
+            fraction of responses (0 to 1) validated against the STAC models when
+            `enable_response_models` is false. Violations are logged and counted,
+            the responses are returned unchanged. Disabled when 0.
+        search_single_flight:
+            coalesce concurrent identical searches: requests arriving while the
+            same search is processed wait for it and share its response body.
     """
 
     # TODO: Remove `default_includes` attribute so we can use
@@ -32,6 +48,11 @@ class ApiSettings(BaseSettings):
     app_port: int = 8000
     reload: bool = True
     enable_response_models: bool = False
+    landing_page_cache_ttl: float = 0
+    feature_sequence_auto_paginate: bool = False
+    feature_sequence_max_pages: int = 1000
+    response_validation_sample_rate: float = 0
+    search_single_flight: bool = False
 
     openapi_url: str = "/api"
     docs_url: str = "/api.html"
@@ -1,7 +1,10 @@
 """Base clients."""
 
 import abc
-from typing import Any, Dict, List, Optional, Union
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from urllib.parse import urljoin
 
 import attr
@@ -12,10 +15,20 @@ from stac_pydantic.version import STAC_VERSION
 from starlette.responses import Response
 
 from stac_fastapi.types import stac as stac_types
+from stac_fastapi.types.cache import TTLCache
+from stac_fastapi.types.conditional import Versioned
 from stac_fastapi.types.config import ApiSettings
 from stac_fastapi.types.conformance import BASE_CONFORMANCE_CLASSES
 from stac_fastapi.types.extension import ApiExtension
+from stac_fastapi.types.fanout import (
+    CatalogCursor,
+    Page,
+    PageMerge,
+    SubSearch,
+    decode_token,
+)
 from stac_fastapi.types.requests import get_base_url
+from stac_fastapi.types.resolver import CatalogPathResolver
 from stac_fastapi.types.rfc3339 import DateTimeType
 from stac_fastapi.types.search import (
     BaseCatalogSearchPostRequest,
@@ -24,6 +37,7 @@ from stac_fastapi.types.search import (
     BaseSearchPostRequest,
 )
 from stac_fastapi.types.stac import Conformance
+from stac_fastapi.types.streaming import StreamingItemCollection
 
 NumType = Union[float, int]
 StacType = Dict[str, Any]
@@ -31,6 +45,15 @@ StacType = Dict[str, Any]
 api_settings = ApiSettings()
 
 
+def _unique_conformance_classes(conformance_classes: List[str]) -> List[str]:
+    """Deduplicate conformance classes, keeping their first-seen order.
+
+    Enum members are converted to their plain string value so that they compare
+    equal to the same class given as a string.
+    """
+    return list(dict.fromkeys(getattr(c, "value", c) for c in conformance_classes))
+
+
 @attr.s  # type:ignore
 class BaseTransactionsClient(abc.ABC):
     """Defines a pattern for implementing the STAC API Transaction Extension."""
@@ -306,12 +329,39 @@ class AsyncBaseTransactionsClient(abc.ABC):
 
 @attr.s
 class LandingPageMixin(abc.ABC):
-    """Create a STAC landing page (GET /)."""
+    """Create a STAC landing page (GET /).
+
+    Landing pages are cached in `landing_page_cache`. When not given, `StacApi`
+    sets a cache expiring after its `landing_page_cache_ttl` setting.
+    """
 
     stac_version: str = attr.ib(default=STAC_VERSION)
     landing_page_id: str = attr.ib(default=api_settings.stac_fastapi_landing_id)
     title: str = attr.ib(default=api_settings.stac_fastapi_title)
     description: str = attr.ib(default=api_settings.stac_fastapi_description)
+    landing_page_cache: Optional[TTLCache] = attr.ib(default=None)
+
+    @staticmethod
+    def _landing_page_cache_key(request: Request):
+        return (str(request.base_url), request.app.state.router_prefix)
+
+    def _get_cached_landing_page(
+        self, request: Request
+    ) -> Optional[stac_types.LandingPage]:
+        if self.landing_page_cache is None:
+            return None
+        landing_page = self.landing_page_cache.get(
+            self._landing_page_cache_key(request)
+        )
+        return copy.deepcopy(landing_page) if landing_page is not None else None
+
+    def _set_cached_landing_page(
+        self, request: Request, landing_page: stac_types.LandingPage
+    ) -> None:
+        if self.landing_page_cache is not None and self.landing_page_cache.enabled:
+            self.landing_page_cache.set(
+                self._landing_page_cache_key(request), copy.deepcopy(landing_page)
+            )
 
     def _landing_page(
         self,
@@ -374,24 +424,97 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
 
     Attributes:
         extensions: list of registered api extensions.
+        catalog_resolver: optional resolver of catalog paths. When set, client
+            methods receive the resolved `catalog_path` as `resolved_catalog`.
+
+    With the fields extension registered, search methods accepting it receive the
+    `FieldsProjection` of the requested fields as `projection` (None when no fields
+    are requested), so that backends can skip fetching fields left out. Likewise,
+    with the count extension they receive the `CountMode` to count matches in as
+    `count_mode`.
     """
 
     base_conformance_classes: List[str] = attr.ib(
-        factory=lambda: BASE_CONFORMANCE_CLASSES
+        factory=lambda: list(BASE_CONFORMANCE_CLASSES)
     )
     extensions: List[ApiExtension] = attr.ib(default=attr.Factory(list))
     post_request_model = attr.ib(default=BaseSearchPostRequest)
+    catalog_resolver: Optional[CatalogPathResolver] = attr.ib(default=None)
+    _frozen_conformance_classes: Optional[Tuple[str, ...]] = attr.ib(
+        default=None, init=False
+    )
 
     def conformance_classes(self) -> List[str]:
         """Generate conformance classes by adding extension conformance to base
         conformance classes."""
-        base_conformance_classes = self.base_conformance_classes.copy()
+        if self._frozen_conformance_classes is not None:
+            return list(self._frozen_conformance_classes)
+
+        conformance_classes = self.base_conformance_classes.copy()
 
         for extension in self.extensions:
             extension_classes = getattr(extension, "conformance_classes", [])
-            base_conformance_classes.extend(extension_classes)
+            conformance_classes.extend(extension_classes)
+
+        return _unique_conformance_classes(conformance_classes)
+
+    def freeze_conformance_classes(self) -> List[str]:
+        """Compute the conformance classes once and reuse them for every request.
+
+        Called by `StacApi` after the extensions have been registered. Changes to
+        `extensions` or `base_conformance_classes` made afterwards require calling
+        this method again.
+        """
+        self._frozen_conformance_classes = None
+        self._frozen_conformance_classes = tuple(self.conformance_classes())
+        return list(self._frozen_conformance_classes)
+
+    def fan_out_search(
+        self,
+        search: SubSearch,
+        catalog_paths: Sequence[str],
+        limit: int = 10,
+        token: Optional[str] = None,
+        sortby: Optional[Sequence[Any]] = None,
+        max_workers: int = 8,
+    ) -> Tuple[List[stac_types.Item], Optional[str]]:
+        """Search catalogs concurrently and merge their items, e.g. to implement
+        the global searches over `catalog_paths`.
+
+        Sub-searches run in a pool of at most `max_workers` threads, and their
+        pages are merged with a heap by `sortby`, stopping at `limit` items. A
+        catalog is searched again for its next page when the merge uses up its
+        page before the end.
 
-        return list(set(base_conformance_classes))
+        Args:
+            search: searches a catalog, called with its path, a limit and the
+                token of the page to search, None for the first one. Returns the
+                items of the page, at most the limit, sorted by `sortby`, and the
+                next page token.
+            catalog_paths: the catalogs to search.
+            limit: maximum number of items returned.
+            token: composite token of the page, returned by a previous call.
+            sortby: the requested GET or POST sort.
+
+        Returns:
+            The items and the composite token of the next page if there are more.
+        """
+        cursors = decode_token(token, catalog_paths)
+        if not cursors:
+            return [], None
+        merge = PageMerge(cursors, limit, sortby)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(cursors))) as pool:
+            fetches = merge.fetches()
+            while fetches:
+                merge.add(
+                    list(
+                        pool.map(
+                            lambda c: search(c.catalog_path, limit, c.token), fetches
+                        )
+                    )
+                )
+                fetches = merge.fetches()
+        return merge.result()
 
     def extension_is_enabled(self, extension: str) -> bool:
         """Check if an api extension is enabled."""
@@ -399,7 +522,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
 
     def list_conformance_classes(self):
         """Return a list of conformance classes, including implemented extensions."""
-        base_conformance = BASE_CONFORMANCE_CLASSES
+        base_conformance = list(BASE_CONFORMANCE_CLASSES)
 
         for extension in self.extensions:
             extension_classes = getattr(extension, "conformance_classes", [])
@@ -416,6 +539,10 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
             API landing page, serving as an entry point to the API.
         """
         request: Request = kwargs["request"]
+        cached_landing_page = self._get_cached_landing_page(request)
+        if cached_landing_page is not None:
+            return cached_landing_page
+
         base_url = get_base_url(request)
         landing_page = self._landing_page(
             base_url=base_url,
@@ -473,6 +600,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
             }
         )
 
+        self._set_cached_landing_page(request, landing_page)
         return landing_page
 
     def conformance(self, **kwargs) -> stac_types.Conformance:
@@ -488,7 +616,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
     @abc.abstractmethod
     def post_global_search(
         self, search_request: BaseSearchPostRequest, **kwargs
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Cross catalog search (POST).
 
         Called with `POST /search`.
@@ -516,7 +644,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
         sortby: Optional[str] = None,
         intersects: Optional[str] = None,
         **kwargs,
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Cross catalog search (GET).
 
         Called with `GET /search`.
@@ -529,7 +657,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
     @abc.abstractmethod
     def post_search(
         self, catalog_path: str, search_request: BaseCatalogSearchPostRequest, **kwargs
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Single catalog item search (POST).
 
         Called with `POST /catalogs/{catalog_id}/search`.
@@ -557,7 +685,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
         sortby: Optional[str] = None,
         intersects: Optional[str] = None,
         **kwargs,
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Single catalog item search (GET).
 
         Called with `GET /catalogs/{catalog_id}/search`.
@@ -570,7 +698,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
     @abc.abstractmethod
     def get_item(
         self, item_id: str, collection_id: str, catalog_path: str, **kwargs
-    ) -> stac_types.Item:
+    ) -> Union[stac_types.Item, Versioned]:
         """Get item by id.
 
         Called with `GET /collections/{collection_id}/items/{item_id}`.
@@ -580,7 +708,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
             collection_id: Id of the collection.
 
         Returns:
-            Item.
+            Item, optionally wrapped in `Versioned` for conditional requests.
         """
         ...
 
@@ -611,7 +739,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
     @abc.abstractmethod
     def get_collection(
         self, catalog_path: str, collection_id: str, **kwargs
-    ) -> stac_types.Collection:
+    ) -> Union[stac_types.Collection, Versioned]:
         """Get collection by id.
 
         Called with `GET /catalogs/{catalog_id}/collections/{collection_id}`.
@@ -620,12 +748,14 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
             collection_id: Id of the collection.
 
         Returns:
-            Collection.
+            Collection, optionally wrapped in `Versioned` for conditional requests.
         """
         ...
 
     @abc.abstractmethod
-    def get_catalog(self, catalog_path: str, **kwargs) -> stac_types.Catalog:
+    def get_catalog(
+        self, catalog_path: str, **kwargs
+    ) -> Union[stac_types.Catalog, Versioned]:
         """Get catalog by id.
 
         Called with `GET /catalogs/{catalog_id}`.
@@ -634,7 +764,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
             catalog_id: Id of the catalog.
 
         Returns:
-            Catalog.
+            Catalog, optionally wrapped in `Versioned` for conditional requests.
         """
         ...
 
@@ -663,7 +793,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
         limit: int = 10,
         token: str = None,
         **kwargs,
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Get all items from a specific collection.
 
         Called with `GET /collections/{collection_id}/items`
@@ -674,7 +804,7 @@ class BaseCoreClient(LandingPageMixin, abc.ABC):
             token: pagination token.
 
         Returns:
-            An ItemCollection.
+            An ItemCollection, or a StreamingItemCollection to stream the features.
         """
         ...
 
@@ -685,24 +815,100 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
 
     Attributes:
         extensions: list of registered api extensions.
+        catalog_resolver: optional resolver of catalog paths. When set, client
+            methods receive the resolved `catalog_path` as `resolved_catalog`.
+
+    With the fields extension registered, search methods accepting it receive the
+    `FieldsProjection` of the requested fields as `projection` (None when no fields
+    are requested), so that backends can skip fetching fields left out. Likewise,
+    with the count extension they receive the `CountMode` to count matches in as
+    `count_mode`.
     """
 
     base_conformance_classes: List[str] = attr.ib(
-        factory=lambda: BASE_CONFORMANCE_CLASSES
+        factory=lambda: list(BASE_CONFORMANCE_CLASSES)
     )
     extensions: List[ApiExtension] = attr.ib(default=attr.Factory(list))
     post_request_model = attr.ib(default=BaseSearchPostRequest)
+    catalog_resolver: Optional[CatalogPathResolver] = attr.ib(default=None)
+    _frozen_conformance_classes: Optional[Tuple[str, ...]] = attr.ib(
+        default=None, init=False
+    )
 
     def conformance_classes(self) -> List[str]:
         """Generate conformance classes by adding extension conformance to base
         conformance classes."""
+        if self._frozen_conformance_classes is not None:
+            return list(self._frozen_conformance_classes)
+
         conformance_classes = self.base_conformance_classes.copy()
 
         for extension in self.extensions:
             extension_classes = getattr(extension, "conformance_classes", [])
             conformance_classes.extend(extension_classes)
 
-        return list(set(conformance_classes))
+        return _unique_conformance_classes(conformance_classes)
+
+    def freeze_conformance_classes(self) -> List[str]:
+        """Compute the conformance classes once and reuse them for every request.
+
+        Called by `StacApi` after the extensions have been registered. Changes to
+        `extensions` or `base_conformance_classes` made afterwards require calling
+        this method again.
+        """
+        self._frozen_conformance_classes = None
+        self._frozen_conformance_classes = tuple(self.conformance_classes())
+        return list(self._frozen_conformance_classes)
+
+    async def fan_out_search(
+        self,
+        search: SubSearch,
+        catalog_paths: Sequence[str],
+        limit: int = 10,
+        token: Optional[str] = None,
+        sortby: Optional[Sequence[Any]] = None,
+        max_concurrency: int = 8,
+    ) -> Tuple[List[stac_types.Item], Optional[str]]:
+        """Search catalogs concurrently and merge their items, e.g. to implement
+        the global searches over `catalog_paths`.
+
+        Sub-searches run as asyncio tasks, at most `max_concurrency` at a time,
+        and their pages are merged with a heap by `sortby`, stopping at `limit`
+        items. A catalog is searched again for its next page when the merge uses
+        up its page before the end. If a sub-search fails, the others are
+        cancelled.
+
+        Args:
+            search: coroutine function searching a catalog, called with its path,
+                a limit and the token of the page to search, None for the first
+                one. Returns the items of the page, at most the limit, sorted by
+                `sortby`, and the next page token.
+            catalog_paths: the catalogs to search.
+            limit: maximum number of items returned.
+            token: composite token of the page, returned by a previous call.
+            sortby: the requested GET or POST sort.
+
+        Returns:
+            The items and the composite token of the next page if there are more.
+        """
+        merge = PageMerge(decode_token(token, catalog_paths), limit, sortby)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _search(cursor: CatalogCursor) -> Page:
+            async with semaphore:
+                return await search(cursor.catalog_path, limit, cursor.token)
+
+        fetches = merge.fetches()
+        while fetches:
+            tasks = [asyncio.ensure_future(_search(cursor)) for cursor in fetches]
+            try:
+                merge.add(await asyncio.gather(*tasks))
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+            fetches = merge.fetches()
+        return merge.result()
 
     def extension_is_enabled(self, extension: str) -> bool:
         """Check if an api extension is enabled."""
@@ -717,6 +923,10 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
             API landing page, serving as an entry point to the API.
         """
         request: Request = kwargs["request"]
+        cached_landing_page = self._get_cached_landing_page(request)
+        if cached_landing_page is not None:
+            return cached_landing_page
+
         base_url = get_base_url(request)
         landing_page = self._landing_page(
             base_url=base_url,
@@ -782,6 +992,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
             }
         )
 
+        self._set_cached_landing_page(request, landing_page)
         return landing_page
 
     async def conformance(self, **kwargs) -> stac_types.Conformance:
@@ -797,7 +1008,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
     @abc.abstractmethod
     async def post_global_search(
         self, search_request: BaseSearchPostRequest, **kwargs
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Cross catalog search (POST).
 
         Called with `POST /search`.
@@ -825,7 +1036,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
         sortby: Optional[str] = None,
         intersects: Optional[str] = None,
         **kwargs,
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Cross catalog search (GET).
 
         Called with `GET /search`.
@@ -850,7 +1061,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
         sortby: Optional[str] = None,
         intersects: Optional[str] = None,
         **kwargs,
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Single catalog item search (GET).
 
         Called with `GET /catalogs/{catalog_id}/search`.
@@ -863,7 +1074,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
     @abc.abstractmethod
     async def post_search(
         self, catalog_path: str, search_request: BaseCatalogSearchPostRequest, **kwargs
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Single catalog item search (POST).
 
         Called with `POST /catalogs/{catalog_id}/search`.
@@ -879,7 +1090,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
     @abc.abstractmethod
     async def get_item(
         self, item_id: str, collection_id: str, catalog_path: str, **kwargs
-    ) -> stac_types.Item:
+    ) -> Union[stac_types.Item, Versioned]:
         """Get item by id.
 
         Called with `GET /catalogs/{catalog_id}/collections/{collection_id}/items/{item_id}`.
@@ -889,7 +1100,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
             collection_id: Id of the collection.
 
         Returns:
-            Item.
+            Item, optionally wrapped in `Versioned` for conditional requests.
         """
         ...
 
@@ -920,7 +1131,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
     @abc.abstractmethod
     async def get_collection(
         self, collection_id: str, **kwargs
-    ) -> stac_types.Collection:
+    ) -> Union[stac_types.Collection, Versioned]:
         """Get collection by id.
 
         Called with `GET /catalogs/{catalog_id}/collections/{collection_id}`.
@@ -929,12 +1140,14 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
             collection_id: Id of the collection.
 
         Returns:
-            Collection.
+            Collection, optionally wrapped in `Versioned` for conditional requests.
         """
         ...
 
     @abc.abstractmethod
-    async def get_catalog(self, catalog_path: str, **kwargs) -> stac_types.Catalog:
+    async def get_catalog(
+        self, catalog_path: str, **kwargs
+    ) -> Union[stac_types.Catalog, Versioned]:
         """Get catalog by id.
 
         Called with `GET /catalogs/{catalog_id}`.
@@ -943,7 +1156,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
             catalog_id: Id of the catalog.
 
         Returns:
-            Catalog.
+            Catalog, optionally wrapped in `Versioned` for conditional requests.
         """
         ...
 
@@ -956,7 +1169,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
         limit: int = 10,
         token: str = None,
         **kwargs,
-    ) -> stac_types.ItemCollection:
+    ) -> Union[stac_types.ItemCollection, StreamingItemCollection]:
         """Get all items from a specific collection.
 
         Called with `GET /catalogs/{catalog_id}/collections/{collection_id}/items`
@@ -967,7 +1180,7 @@ class AsyncBaseCoreClient(LandingPageMixin, abc.ABC):
             token: pagination token.
 
         Returns:
-            An ItemCollection.
+            An ItemCollection, or a StreamingItemCollection to stream the features.
         """
         ...
 
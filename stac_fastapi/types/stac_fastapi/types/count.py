@@ -0,0 +1,45 @@
+"""Counting of the items matched by searches."""
+
+from enum import Enum
+from typing import Optional
+
+from stac_fastapi.types import stac as stac_types
+
+
+class CountMode(str, Enum):
+    """How the items matched by a search are counted.
+
+    Attributes:
+        exact: count every matching item.
+        estimated: estimate the count from backend statistics or a sample, at a
+            fraction of the cost of an exact count.
+        none: do not count.
+    """
+
+    exact = "exact"
+    estimated = "estimated"
+    none = "none"
+
+
+def set_matched(
+    item_collection: stac_types.ItemCollection,
+    mode: CountMode,
+    matched: Optional[int],
+) -> stac_types.ItemCollection:
+    """Add the count of matched items to an item collection.
+
+    The count is set as `numberMatched` and `context.matched`, unless None, and the
+    mode used as `context.count`, so that clients tell estimates from exact counts.
+    `context.returned`, required in a context, is set if missing.
+
+    Returns:
+        The item collection, updated in place.
+    """
+    context = dict(item_collection.get("context") or {})
+    context.setdefault("returned", len(item_collection.get("features") or ()))
+    context["count"] = CountMode(mode).value
+    if matched is not None:
+        item_collection["numberMatched"] = matched
+        context["matched"] = matched
+    item_collection["context"] = context
+    return item_collection
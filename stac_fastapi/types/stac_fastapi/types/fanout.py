@@ -0,0 +1,229 @@
+"""Merging of per-catalog sub-searches of cross catalog searches.
+
+Each catalog is searched separately for a page of at most `limit` items, sorted
+by the requested `sortby`, and the pages are merged with a heap into a single
+page. When the merge uses up the page of a catalog with more items, the next page
+of that catalog is searched before the merge goes on. The next page token
+records, for each catalog with items left, the token of the sub-search page the
+merge stopped in and how many of its items were returned, so that a page never
+skips nor repeats items, and sub-searches never search more than `limit` items
+however deep the pagination.
+"""
+
+import base64
+import binascii
+import functools
+import heapq
+import json
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple, Union
+
+import attr
+
+from stac_fastapi.types import stac as stac_types
+from stac_fastapi.types.errors import InvalidQueryParameter
+
+# Page of a sub-search: its items, sorted, and the token of the next page if any
+Page = Tuple[List[stac_types.Item], Optional[str]]
+
+# Sub-search of a catalog, called with the catalog path, a limit and a page token
+SubSearch = Callable[[str, int, Optional[str]], Union[Page, Awaitable[Page]]]
+
+# Fields of items at the top level, other sort fields being properties
+TOP_LEVEL_FIELDS = ("id", "collection", "type", "bbox", "geometry")
+
+
+@attr.s(frozen=True)
+class CatalogCursor:
+    """Position of a cross catalog search in the items of a catalog.
+
+    Attributes:
+        catalog_path: the catalog searched.
+        token: token of the sub-search page to search, None for the first page.
+        skip: items of that page already returned.
+    """
+
+    catalog_path: str = attr.ib()
+    token: Optional[str] = attr.ib(default=None)
+    skip: int = attr.ib(default=0)
+
+
+@functools.total_ordering
+class _Descending:
+    """Sort value inverting the order of the value it wraps."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: Any) -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: Any) -> bool:
+        return other.value < self.value
+
+
+def _sort_fields(sortby: Optional[Sequence[Any]]) -> List[Tuple[str, bool]]:
+    """Return the fields of a GET or POST `sortby`, with whether descending."""
+    fields = []
+    for sort in sortby or ():
+        if isinstance(sort, str):
+            fields.append((sort.lstrip("+-"), sort.startswith("-")))
+            continue
+        if not isinstance(sort, dict):
+            sort = sort.dict()
+        direction = getattr(sort.get("direction"), "value", sort.get("direction"))
+        fields.append((sort["field"], direction == "desc"))
+    return fields
+
+
+def _field_value(item: stac_types.Item, field: str) -> Any:
+    *parents, name = field.split(".")
+    if not parents and name not in TOP_LEVEL_FIELDS:
+        parents = ["properties"]
+    value: Any = item
+    for key in parents:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value.get(name) if isinstance(value, dict) else None
+
+
+def sort_key(
+    sortby: Optional[Sequence[Any]],
+) -> Optional[Callable[[stac_types.Item], Tuple[Any, ...]]]:
+    """Return the sort key of items for a GET or POST `sortby`, None without one.
+
+    Items missing a sort field come last in either direction. Datetimes compare
+    as strings, so sub-searches should return them in a single format.
+    """
+    fields = _sort_fields(sortby)
+    if not fields:
+        return None
+
+    def key(item: stac_types.Item) -> Tuple[Any, ...]:
+        values: List[Any] = []
+        for field, descending in fields:
+            value = _field_value(item, field)
+            values.append(value is None)
+            values.append(_Descending(value) if descending else value)
+        return tuple(values)
+
+    return key
+
+
+def encode_token(cursors: Sequence[CatalogCursor]) -> Optional[str]:
+    """Return the composite token of catalog cursors, None without any."""
+    if not cursors:
+        return None
+    data = json.dumps(
+        [[c.catalog_path, c.token, c.skip] for c in cursors], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(data.encode("utf-8")).rstrip(b"=").decode()
+
+
+def decode_token(
+    token: Optional[str], catalog_paths: Sequence[str]
+) -> List[CatalogCursor]:
+    """Return the catalog cursors of a composite token, or the first page of
+    every catalog without a token.
+
+    Raises:
+        InvalidQueryParameter: if the token is malformed or searches catalogs
+            outside `catalog_paths`.
+    """
+    if not token:
+        return [CatalogCursor(catalog_path) for catalog_path in catalog_paths]
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        cursors = [
+            CatalogCursor(str(path), None if t is None else str(t), int(skip))
+            for path, t, skip in data
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise InvalidQueryParameter(f"Invalid pagination token {token}") from None
+    if any(c.catalog_path not in catalog_paths or c.skip < 0 for c in cursors):
+        raise InvalidQueryParameter(f"Invalid pagination token {token}")
+    return cursors
+
+
+class PageMerge:
+    """Merge of the pages of sub-searches into a page of at most `limit` items.
+
+    Sub-searches are run by the caller: `fetches` returns the cursors of the pages
+    to search, which are then given to `add`, until `fetches` returns none and
+    `result` returns the merged page.
+    """
+
+    def __init__(
+        self,
+        cursors: Sequence[CatalogCursor],
+        limit: int,
+        sortby: Optional[Sequence[Any]] = None,
+    ):
+        """Start the merge of a page.
+
+        Args:
+            cursors: the position of the search in each catalog.
+            limit: maximum number of items returned.
+            sortby: the requested sort. Without one, items of earlier catalogs
+                come first.
+        """
+        self.limit = limit
+        self.features: List[stac_types.Item] = []
+        self._key = sort_key(sortby)
+        self._cursors = list(cursors)
+        # current sub-search page of each catalog, None until searched
+        self._pages: List[Optional[Page]] = [None] * len(self._cursors)
+        # sort key, catalog index, the tie-breaker of equal keys, and next item of
+        # each catalog with a page
+        self._heap: List[Tuple[Tuple[Any, ...], int, stac_types.Item]] = []
+
+    def _pending(self) -> List[int]:
+        return [index for index, page in enumerate(self._pages) if page is None]
+
+    def fetches(self) -> List[CatalogCursor]:
+        """Merge items until the page is full, or the pages of some catalogs are
+        needed, and return their cursors, each to search for `limit` items.
+        """
+        while len(self.features) < self.limit:
+            pending = self._pending()
+            if pending:
+                return [self._cursors[index] for index in pending]
+            if not self._heap:
+                break
+            _, index, item = heapq.heappop(self._heap)
+            self.features.append(item)
+            cursor = self._cursors[index]
+            self._cursors[index] = attr.evolve(cursor, skip=cursor.skip + 1)
+            self._push(index)
+        return []
+
+    def add(self, pages: Sequence[Page]) -> None:
+        """Add the pages searched at the cursors last returned by `fetches`.
+
+        Pages are sorted by `sortby`.
+        """
+        for index, page in zip(self._pending(), pages):
+            self._pages[index] = page
+            self._push(index)
+
+    def _push(self, index: int) -> None:
+        """Push the next item of a catalog, or move to its next page."""
+        cursor = self._cursors[index]
+        items, next_token = self._pages[index]
+        if cursor.skip < len(items):
+            item = items[cursor.skip]
+            key = self._key(item) if self._key else ()
+            heapq.heappush(self._heap, (key, index, item))
+        elif next_token is not None:
+            self._cursors[index] = CatalogCursor(cursor.catalog_path, next_token)
+            self._pages[index] = None
+
+    def result(self) -> Tuple[List[stac_types.Item], Optional[str]]:
+        """Return the items and the composite token of the next page if there are
+        more."""
+        next_cursors = [
+            cursor
+            for cursor, page in zip(self._cursors, self._pages)
+            if page is None or cursor.skip < len(page[0])
+        ]
+        return self.features, encode_token(next_cursors)
@@ -0,0 +1,163 @@
+"""Static spatial and temporal indexes."""
+
+import math
+from bisect import bisect_left, bisect_right
+from typing import Any, List, Optional, Sequence, Tuple
+
+import attr
+
+from stac_fastapi.types.spatial import Envelope
+
+# Bounds of open intervals, in microseconds since the epoch
+MIN_TIME = -(2**63)
+MAX_TIME = 2**63 - 1
+
+
+def _union(envelopes: Sequence[Envelope]) -> Envelope:
+    return (
+        min(e[0] for e in envelopes),
+        min(e[1] for e in envelopes),
+        max(e[2] for e in envelopes),
+        max(e[3] for e in envelopes),
+    )
+
+
+def _overlaps(a: Envelope, b: Envelope) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+@attr.s(slots=True)
+class _Node:
+    envelope: Envelope = attr.ib()
+    # child nodes, or `(envelope, value)` entries for leaves
+    children: List[Any] = attr.ib()
+    leaf: bool = attr.ib(default=False)
+
+
+def _pack(
+    entries: List[Tuple[Envelope, Any]], capacity: int, leaf: bool
+) -> List[_Node]:
+    """Group entries into nodes with Sort-Tile-Recursive packing."""
+    node_count = math.ceil(len(entries) / capacity)
+    slice_size = capacity * math.ceil(math.sqrt(node_count))
+    entries = sorted(entries, key=lambda e: e[0][0] + e[0][2])
+    nodes = []
+    for start in range(0, len(entries), slice_size):
+        vertical_slice = sorted(
+            entries[start : start + slice_size], key=lambda e: e[0][1] + e[0][3]
+        )
+        for group_start in range(0, len(vertical_slice), capacity):
+            group = vertical_slice[group_start : group_start + capacity]
+            nodes.append(
+                _Node(
+                    _union([envelope for envelope, _ in group]),
+                    [child for _, child in group],
+                    leaf,
+                )
+            )
+    return nodes
+
+
+@attr.s
+class STRTree:
+    """Static R-tree of envelopes, bulk loaded with Sort-Tile-Recursive packing.
+
+    Attributes:
+        entries: `(envelope, value)` pairs, envelopes being
+            `(minx, miny, maxx, maxy)` tuples.
+        node_capacity: maximum number of children of a node.
+    """
+
+    entries: Sequence[Tuple[Envelope, Any]] = attr.ib()
+    node_capacity: int = attr.ib(default=16)
+    _root: Optional[_Node] = attr.ib(init=False, default=None)
+
+    def __attrs_post_init__(self):
+        """Pack the tree."""
+        if not self.entries:
+            return
+        nodes = _pack(
+            [(envelope, (envelope, value)) for envelope, value in self.entries],
+            self.node_capacity,
+            leaf=True,
+        )
+        while len(nodes) > 1:
+            nodes = _pack(
+                [(node.envelope, node) for node in nodes], self.node_capacity, False
+            )
+        self._root = nodes[0]
+
+    def query(self, envelope: Envelope) -> List[Any]:
+        """Return the values whose envelope overlaps `envelope`."""
+        if self._root is None or not _overlaps(self._root.envelope, envelope):
+            return []
+        values = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.leaf:
+                values.extend(
+                    value for e, value in node.children if _overlaps(e, envelope)
+                )
+            else:
+                stack.extend(
+                    child
+                    for child in node.children
+                    if _overlaps(child.envelope, envelope)
+                )
+        return values
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self.entries)
+
+
+@attr.s
+class TemporalIndex:
+    """Static index of time intervals, sorted by start.
+
+    Intervals are `(start, end)` integers, e.g. microseconds since the epoch, with
+    `MIN_TIME` / `MAX_TIME` for open ends. Queries bisect the sorted starts,
+    bounded by the longest finite interval; open intervals are checked apart.
+
+    Attributes:
+        entries: `((start, end), value)` pairs.
+    """
+
+    entries: Sequence[Tuple[Tuple[int, int], Any]] = attr.ib()
+    _starts: List[int] = attr.ib(init=False, factory=list)
+    _ends: List[int] = attr.ib(init=False, factory=list)
+    _values: List[Any] = attr.ib(init=False, factory=list)
+    _max_duration: int = attr.ib(init=False, default=0)
+    _unbounded: List[Tuple[Tuple[int, int], Any]] = attr.ib(init=False, factory=list)
+
+    def __attrs_post_init__(self):
+        """Sort the intervals."""
+        bounded = []
+        for (start, end), value in self.entries:
+            if start == MIN_TIME or end == MAX_TIME:
+                self._unbounded.append(((start, end), value))
+            else:
+                bounded.append((start, end, value))
+        bounded.sort(key=lambda entry: entry[0])
+        for start, end, value in bounded:
+            self._starts.append(start)
+            self._ends.append(end)
+            self._values.append(value)
+            self._max_duration = max(self._max_duration, end - start)
+
+    def query(self, start: int = MIN_TIME, end: int = MAX_TIME) -> List[Any]:
+        """Return the values whose interval overlaps `[start, end]`."""
+        low = bisect_left(self._starts, max(start - self._max_duration, MIN_TIME))
+        high = bisect_right(self._starts, end)
+        values = [self._values[i] for i in range(low, high) if self._ends[i] >= start]
+        values.extend(
+            value
+            for (value_start, value_end), value in self._unbounded
+            if value_start <= end and value_end >= start
+        )
+        return values
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self.entries)
@@ -1,6 +1,6 @@
 """Link helpers."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Tuple
 from urllib.parse import urljoin, urlsplit
 
 import attr
@@ -22,23 +22,55 @@ INFERRED_LINK_RELS = [
 ]
 
 
+_INFERRED_LINK_RELS = frozenset(INFERRED_LINK_RELS)
+
+
 def filter_links(links: List[Dict]) -> List[Dict]:
     """Remove inferred links."""
     return [link for link in links if link["rel"] not in INFERRED_LINK_RELS]
 
 
+def _resolve_href(href: str, base_url: str) -> str:
+    if "http://" in href or "https://" in href:
+        href = urlsplit(href).path
+    return urljoin(base_url, href)
+
+
 def resolve_links(links: list, base_url: str) -> List[Dict]:
     """Convert relative links to absolute links."""
     filtered_links = filter_links(links)
     for link in filtered_links:
-        if "http://" in link["href"] or "https://" in link["href"]:
-            split_url = urlsplit(link["href"])
-            link["href"] = split_url.path
-            # link["href"].replace(split_url.scheme, "").replace(split_url.netloc, "")
-        link.update({"href": urljoin(base_url, link["href"])})
+        link.update({"href": _resolve_href(link["href"], base_url)})
     return filtered_links
 
 
+def resolve_features_links(features: Iterable[Dict], base_url: str) -> None:
+    """Resolve the stored links of a whole page of features in place.
+
+    Equivalent to replacing each feature's links with `resolve_links(links,
+    base_url)`, but done in a single pass: inferred links are dropped by compacting
+    each `links` list in place, and hrefs shared by several features (e.g. license
+    or derived-from links) are only split and joined once.
+    """
+    resolved: Dict[str, str] = {}
+    for feature in features:
+        links = feature.get("links")
+        if not links:
+            continue
+        kept = 0
+        for link in links:
+            if link["rel"] in _INFERRED_LINK_RELS:
+                continue
+            href = link["href"]
+            resolved_href = resolved.get(href)
+            if resolved_href is None:
+                resolved_href = resolved[href] = _resolve_href(href, base_url)
+            link["href"] = resolved_href
+            links[kept] = link
+            kept += 1
+        del links[kept:]
+
+
 @attr.s
 class BaseLinks:
     """Create inferred links common to collections and items."""
@@ -190,3 +222,100 @@ class ItemLinks(BaseLinks):
             self.root(),
         ]
         return links
+
+
+# Plain string fragments shared by every link built from a template
+_ROOT = Relations.root.value
+_SELF = Relations.self.value
+_PARENT = Relations.parent.value
+_COLLECTION = Relations.collection.value
+_JSON = MimeTypes.json.value
+_GEOJSON = MimeTypes.geojson.value
+
+
+@attr.s
+class LinkTemplates:
+    """Build inferred links for many catalogs, collections and items at once.
+
+    `base_url` is resolved once, when the templates are created, so every link is
+    then built by string concatenation only. Intended to be created once per
+    request and reused for all the objects of a response. Produces the same links
+    as `CatalogLinks`, `CollectionLinks` and `ItemLinks` for identifiers that do not
+    contain URL reserved characters.
+    """
+
+    base_url: str = attr.ib()
+    _catalogs_url: str = attr.ib(init=False)
+    _root_catalogs_url: str = attr.ib(init=False)
+
+    def __attrs_post_init__(self):
+        """Pre-split the base url."""
+        self._catalogs_url = urljoin(self.base_url, "catalogs/")
+        # catalog parent links are resolved against the server root
+        self._root_catalogs_url = urljoin(self.base_url, "/catalogs/")
+
+    def catalog_links(self, catalog_path: str) -> List[Dict[str, Any]]:
+        """Return the inferred links of a catalog, as `CatalogLinks`."""
+        parent_path, _, _ = catalog_path.rpartition("/")
+        return [
+            {"rel": _SELF, "type": _JSON, "href": self._catalogs_url + catalog_path},
+            {
+                "rel": _PARENT,
+                "type": _JSON,
+                "href": self._root_catalogs_url + parent_path,
+            },
+            {"rel": _ROOT, "type": _JSON, "href": self.base_url},
+        ]
+
+    def collection_links(
+        self, catalog_path: str, collection_id: str
+    ) -> List[Dict[str, Any]]:
+        """Return the inferred links of a collection, as `CollectionLinks`."""
+        catalog_href = self._catalogs_url + catalog_path
+        collection_href = catalog_href + "/collections/" + collection_id
+        return [
+            {"rel": _SELF, "type": _JSON, "href": collection_href},
+            {"rel": _PARENT, "type": _JSON, "href": catalog_href},
+            {"rel": "items", "type": _GEOJSON, "href": collection_href + "/items"},
+            {"rel": _ROOT, "type": _JSON, "href": catalog_href},
+        ]
+
+    def item_links(
+        self, catalog_path: str, collection_id: str, item_id: str
+    ) -> List[Dict[str, Any]]:
+        """Return the inferred links of an item, as `ItemLinks`."""
+        return self.items_links([(catalog_path, collection_id, item_id)])[0]
+
+    def items_links(
+        self, items: Iterable[Tuple[str, str, str]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Return the inferred links of a batch of items.
+
+        Args:
+            items: `(catalog_path, collection_id, item_id)` triples.
+
+        Returns:
+            The links of each item, in the order of `items`.
+        """
+        prefixes: Dict[Tuple[str, str], Tuple[str, str, str]] = {}
+        links = []
+        for catalog_path, collection_id, item_id in items:
+            prefix = prefixes.get((catalog_path, collection_id))
+            if prefix is None:
+                catalog_href = self._catalogs_url + catalog_path
+                collection_href = catalog_href + "/collections/" + collection_id
+                prefix = prefixes[(catalog_path, collection_id)] = (
+                    catalog_href,
+                    collection_href,
+                    collection_href + "/items/",
+                )
+            catalog_href, collection_href, items_href = prefix
+            links.append(
+                [
+                    {"rel": _SELF, "type": _GEOJSON, "href": items_href + item_id},
+                    {"rel": _PARENT, "type": _JSON, "href": collection_href},
+                    {"rel": _COLLECTION, "type": _JSON, "href": collection_href},
+                    {"rel": _ROOT, "type": _JSON, "href": catalog_href},
+                ]
+            )
+        return links
@@ -0,0 +1,885 @@
+"""In-memory reference backend."""
+
+import copy
+import json
+import threading
+from array import array
+from datetime import datetime
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import attr
+from fastapi import Request
+from stac_pydantic.shared import BBox
+
+from stac_fastapi.types import stac as stac_types
+from stac_fastapi.types.core import AsyncBaseCoreClient, BaseCoreClient
+from stac_fastapi.types.count import CountMode, set_matched
+from stac_fastapi.types.errors import InvalidQueryParameter, NotFoundError
+from stac_fastapi.types.indexes import MAX_TIME, MIN_TIME, STRTree, TemporalIndex
+from stac_fastapi.types.links import LinkTemplates, filter_links, resolve_features_links
+from stac_fastapi.types.projection import FieldsProjection
+from stac_fastapi.types.requests import get_base_url
+from stac_fastapi.types.rfc3339 import (
+    DateTimeType,
+    datetime_to_epoch_us,
+    item_datetime_ranges,
+)
+from stac_fastapi.types.search import (
+    BaseCatalogSearchPostRequest,
+    BaseSearchPostRequest,
+)
+from stac_fastapi.types.spatial import (
+    SpatialPredicate,
+    bbox_envelopes,
+    compile_spatial_filter,
+    geometry_envelope,
+)
+
+NAN = float("nan")
+
+
+def _interval(value: Optional[DateTimeType]) -> Optional[Tuple[int, int]]:
+    """Convert a `datetime` parameter to epoch microseconds bounds."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        us = datetime_to_epoch_us(value)
+        return us, us
+    start, end = value
+    return (
+        MIN_TIME if start is None else datetime_to_epoch_us(start),
+        MAX_TIME if end is None else datetime_to_epoch_us(end),
+    )
+
+
+def _geometry(intersects: Any) -> Any:
+    """Parse the `intersects` parameter of GET searches."""
+    if isinstance(intersects, (list, tuple)) and all(
+        isinstance(part, str) for part in intersects
+    ):
+        # split on commas by the GET request model
+        intersects = ",".join(intersects)
+    if isinstance(intersects, str):
+        try:
+            return json.loads(intersects)
+        except ValueError:
+            raise InvalidQueryParameter("intersects must be a GeoJSON geometry")
+    return intersects
+
+
+def _after_row(token: Optional[str]) -> int:
+    if not token:
+        return -1
+    try:
+        return int(token)
+    except ValueError:
+        raise InvalidQueryParameter(f"Invalid pagination token {token}")
+
+
+def _item_envelope(item: stac_types.Item) -> Tuple[float, float, float, float]:
+    """Return the 2D bbox of an item, west > east if crossing the antimeridian."""
+    bbox = item.get("bbox")
+    if bbox:
+        if len(bbox) == 6:
+            return bbox[0], bbox[1], bbox[3], bbox[4]
+        return tuple(bbox)
+    if item.get("geometry"):
+        return geometry_envelope(item["geometry"]) or (NAN,) * 4
+    return (NAN,) * 4
+
+
+def _in_catalogs(catalog_path: str, catalog_paths: Sequence[str], nested: bool) -> bool:
+    return any(
+        catalog_path == path or (nested and catalog_path.startswith(path + "/"))
+        for path in catalog_paths
+    )
+
+
+@attr.s
+class ItemStore:
+    """Columnar in-memory store of catalogs, collections and items.
+
+    Items are stored in insertion order, one row per item, with their catalog path,
+    collection and id, bbox and temporal extent in parallel arrays. Bboxes are
+    indexed in an STR-packed R-tree and temporal extents, as epoch microseconds, in
+    a sorted array; both indexes are rebuilt on the first search after a write.
+    Replaced and deleted items leave an empty row behind, so row numbers are
+    stable and serve as pagination tokens.
+
+    Attributes:
+        node_capacity: maximum number of children of an R-tree node.
+        catalogs: catalogs, keyed by catalog path.
+        collections: collections, keyed by catalog path and collection id.
+    """
+
+    node_capacity: int = attr.ib(default=16)
+    catalogs: Dict[str, stac_types.Catalog] = attr.ib(factory=dict)
+    collections: Dict[Tuple[str, str], stac_types.Collection] = attr.ib(factory=dict)
+    _items: List[Optional[stac_types.Item]] = attr.ib(init=False, factory=list)
+    _catalog_paths: List[str] = attr.ib(init=False, factory=list)
+    _collection_ids: List[str] = attr.ib(init=False, factory=list)
+    _item_ids: List[str] = attr.ib(init=False, factory=list)
+    _minx: array = attr.ib(init=False, factory=lambda: array("d"))
+    _miny: array = attr.ib(init=False, factory=lambda: array("d"))
+    _maxx: array = attr.ib(init=False, factory=lambda: array("d"))
+    _maxy: array = attr.ib(init=False, factory=lambda: array("d"))
+    _starts: array = attr.ib(init=False, factory=lambda: array("q"))
+    _ends: array = attr.ib(init=False, factory=lambda: array("q"))
+    _rows: Dict[Tuple[str, str, str], int] = attr.ib(init=False, factory=dict)
+    _rtree: Optional[STRTree] = attr.ib(init=False, default=None)
+    _temporal: Optional[TemporalIndex] = attr.ib(init=False, default=None)
+    _lock: threading.RLock = attr.ib(init=False, factory=threading.RLock)
+
+    def add_catalog(self, catalog_path: str, catalog: stac_types.Catalog) -> None:
+        """Add or replace a catalog."""
+        self.catalogs[catalog_path] = catalog
+
+    def add_collection(
+        self, catalog_path: str, collection: stac_types.Collection
+    ) -> None:
+        """Add or replace a collection of a catalog."""
+        self.collections[(catalog_path, collection["id"])] = collection
+
+    def add_items(self, catalog_path: str, items: Iterable[stac_types.Item]) -> None:
+        """Add or replace items of a catalog."""
+        items = list(items)
+        ranges = item_datetime_ranges(item.get("properties") or {} for item in items)
+        with self._lock:
+            for item, (start, end) in zip(items, ranges):
+                self._append(catalog_path, item, start, end)
+            self._rtree = self._temporal = None
+
+    def add_item(self, catalog_path: str, item: stac_types.Item) -> None:
+        """Add or replace an item of a catalog."""
+        self.add_items(catalog_path, [item])
+
+    def _append(
+        self,
+        catalog_path: str,
+        item: stac_types.Item,
+        start: Optional[int],
+        end: Optional[int],
+    ) -> None:
+        key = (catalog_path, item["collection"], item["id"])
+        previous = self._rows.get(key)
+        if previous is not None:
+            self._items[previous] = None
+        self._rows[key] = len(self._items)
+        self._items.append(item)
+        self._catalog_paths.append(catalog_path)
+        self._collection_ids.append(item["collection"])
+        self._item_ids.append(item["id"])
+
+        for column, value in zip(
+            (self._minx, self._miny, self._maxx, self._maxy), _item_envelope(item)
+        ):
+            column.append(value)
+        self._starts.append(MIN_TIME if start is None else start)
+        self._ends.append(MAX_TIME if end is None else end)
+
+    def delete_item(self, catalog_path: str, collection_id: str, item_id: str) -> None:
+        """Delete an item.
+
+        Raises:
+            NotFoundError: if the item does not exist.
+        """
+        with self._lock:
+            row = self._rows.pop((catalog_path, collection_id, item_id), None)
+            if row is None:
+                raise NotFoundError(f"Item {item_id} not found")
+            self._items[row] = None
+            self._rtree = self._temporal = None
+
+    def find(self, catalog_path: str, collection_id: str, item_id: str) -> int:
+        """Return the row of an item.
+
+        Raises:
+            NotFoundError: if the item does not exist.
+        """
+        row = self._rows.get((catalog_path, collection_id, item_id))
+        if row is None:
+            raise NotFoundError(f"Item {item_id} not found")
+        return row
+
+    def get_item(
+        self, catalog_path: str, collection_id: str, item_id: str
+    ) -> stac_types.Item:
+        """Return an item.
+
+        Raises:
+            NotFoundError: if the item does not exist.
+        """
+        return self._items[self.find(catalog_path, collection_id, item_id)]
+
+    def row(self, row: int) -> Tuple[str, stac_types.Item]:
+        """Return the catalog path and item of a row."""
+        return self._catalog_paths[row], self._items[row]
+
+    def _indexes(self) -> Tuple[STRTree, TemporalIndex]:
+        with self._lock:
+            if self._rtree is None or self._temporal is None:
+                live = [row for row, item in enumerate(self._items) if item is not None]
+                self._rtree = STRTree(
+                    [
+                        (envelope, row)
+                        for row in live
+                        if self._minx[row] == self._minx[row]  # not NaN
+                        for envelope in bbox_envelopes(
+                            (
+                                self._minx[row],
+                                self._miny[row],
+                                self._maxx[row],
+                                self._maxy[row],
+                            )
+                        )
+                    ],
+                    node_capacity=self.node_capacity,
+                )
+                self._temporal = TemporalIndex(
+                    [((self._starts[row], self._ends[row]), row) for row in live]
+                )
+            return self._rtree, self._temporal
+
+    def _candidates(
+        self,
+        predicate: Optional[SpatialPredicate],
+        interval: Optional[Tuple[int, int]],
+    ) -> Sequence[int]:
+        """Return the rows selected by the indexes, in order."""
+        if predicate is None and interval is None:
+            return range(len(self._items))
+        rtree, temporal = self._indexes()
+        rows = None
+        if predicate is not None:
+            rows = {row for e in predicate.envelopes for row in rtree.query(e)}
+        if interval is not None:
+            in_interval = temporal.query(*interval)
+            rows = set(in_interval) if rows is None else rows.intersection(in_interval)
+        return sorted(rows)
+
+    def _matches(self, row: int, predicate: Optional[SpatialPredicate]) -> bool:
+        if predicate is None:
+            return True
+        item = self._items[row]
+        bbox = (self._minx[row], self._miny[row], self._maxx[row], self._maxy[row])
+        return predicate.intersects(item.get("geometry"), bbox)
+
+    def _matching_rows(
+        self,
+        catalog_paths: Optional[Sequence[str]],
+        collections: Optional[Sequence[str]],
+        ids: Optional[Sequence[str]],
+        bbox: Optional[BBox],
+        intersects: Optional[Any],
+        datetime: Optional[DateTimeType],
+        nested: bool,
+        after: int = -1,
+    ) -> Iterator[int]:
+        """Yield the rows matching a search after the row `after`, in order."""
+        predicate = compile_spatial_filter(bbox, intersects)
+        collections = set(collections) if collections else None
+        ids = set(ids) if ids else None
+        for row in self._candidates(predicate, _interval(datetime)):
+            if row <= after or self._items[row] is None:
+                continue
+            if collections is not None and self._collection_ids[row] not in collections:
+                continue
+            if ids is not None and self._item_ids[row] not in ids:
+                continue
+            if catalog_paths and not _in_catalogs(
+                self._catalog_paths[row], catalog_paths, nested
+            ):
+                continue
+            if not self._matches(row, predicate):
+                continue
+            yield row
+
+    def search(
+        self,
+        catalog_paths: Optional[Sequence[str]] = None,
+        collections: Optional[Sequence[str]] = None,
+        ids: Optional[Sequence[str]] = None,
+        bbox: Optional[BBox] = None,
+        intersects: Optional[Any] = None,
+        datetime: Optional[DateTimeType] = None,
+        limit: int = 10,
+        token: Optional[str] = None,
+        nested: bool = True,
+    ) -> Tuple[List[int], Optional[str]]:
+        """Search items.
+
+        Args:
+            catalog_paths: catalogs to search in, with their sub-catalogs if
+                `nested`.
+            token: pagination token returned by a previous search.
+
+        Returns:
+            The matching rows, at most `limit`, and the token of the next page if
+            there are more matches.
+        """
+        if limit <= 0:
+            return [], None
+        after = _after_row(token)
+        rows: List[int] = []
+        for row in self._matching_rows(
+            catalog_paths, collections, ids, bbox, intersects, datetime, nested, after
+        ):
+            if len(rows) == limit:
+                return rows, str(rows[-1])
+            rows.append(row)
+        return rows, None
+
+    def count(
+        self,
+        catalog_paths: Optional[Sequence[str]] = None,
+        collections: Optional[Sequence[str]] = None,
+        ids: Optional[Sequence[str]] = None,
+        bbox: Optional[BBox] = None,
+        intersects: Optional[Any] = None,
+        datetime: Optional[DateTimeType] = None,
+        nested: bool = True,
+        mode: CountMode = CountMode.exact,
+    ) -> Optional[int]:
+        """Count the items matching a search, as `search` would return them.
+
+        Estimates are the number of rows selected by the spatial and temporal
+        indexes, an upper bound computed without reading items.
+
+        Returns:
+            The count, or None with `CountMode.none`.
+        """
+        if mode == CountMode.none:
+            return None
+        if mode == CountMode.estimated:
+            predicate = compile_spatial_filter(bbox, intersects)
+            interval = _interval(datetime)
+            if predicate is None and interval is None:
+                return len(self)
+            return len(self._candidates(predicate, interval))
+        return sum(
+            1
+            for _ in self._matching_rows(
+                catalog_paths, collections, ids, bbox, intersects, datetime, nested
+            )
+        )
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self._rows)
+
+
+class _InMemoryClient:
+    """Implementation shared by the synchronous and asynchronous clients."""
+
+    store: ItemStore
+
+    def _catalog(self, templates: LinkTemplates, catalog_path: str) -> Dict:
+        catalog = copy.copy(self.store.catalogs[catalog_path])
+        catalog["links"] = [
+            *templates.catalog_links(catalog_path),
+            *filter_links(catalog.get("links") or []),
+        ]
+        return catalog
+
+    def _collection(
+        self, templates: LinkTemplates, catalog_path: str, collection_id: str
+    ) -> Dict:
+        collection = copy.copy(self.store.collections[(catalog_path, collection_id)])
+        collection["links"] = [
+            *templates.collection_links(catalog_path, collection_id),
+            *filter_links(collection.get("links") or []),
+        ]
+        return collection
+
+    def _features(self, request: Request, rows: List[int]) -> List[stac_types.Item]:
+        base_url = get_base_url(request)
+        catalog_paths, features = [], []
+        for row in rows:
+            catalog_path, item = self.store.row(row)
+            feature = copy.copy(item)
+            feature["links"] = [dict(link) for link in item.get("links") or []]
+            catalog_paths.append(catalog_path)
+            features.append(feature)
+        resolve_features_links(features, base_url)
+        links = LinkTemplates(base_url).items_links(
+            (catalog_path, feature["collection"], feature["id"])
+            for catalog_path, feature in zip(catalog_paths, features)
+        )
+        for feature, item_links in zip(features, links):
+            feature["links"] = item_links + feature["links"]
+        return features
+
+    def _item_collection(
+        self,
+        request: Request,
+        rows: List[int],
+        token: Optional[str],
+        limit: int,
+        projection: Optional[FieldsProjection] = None,
+    ) -> stac_types.ItemCollection:
+        features = self._features(request, rows)
+        if projection is not None:
+            features = list(projection.project(features))
+        links = []
+        if token is not None:
+            if request.method == "POST":
+                links.append(
+                    {
+                        "rel": "next",
+                        "type": "application/geo+json",
+                        "href": str(request.url),
+                        "method": "POST",
+                        "body": {"token": token},
+                        "merge": True,
+                    }
+                )
+            else:
+                links.append(
+                    {
+                        "rel": "next",
+                        "type": "application/geo+json",
+                        "href": str(request.url.include_query_params(token=token)),
+                    }
+                )
+        return stac_types.ItemCollection(
+            type="FeatureCollection",
+            features=features,
+            links=links,
+            context={"returned": len(rows), "limit": limit},
+        )
+
+    def _search(
+        self,
+        request: Request,
+        catalog_paths: Optional[List[str]] = None,
+        collections: Optional[List[str]] = None,
+        ids: Optional[List[str]] = None,
+        bbox: Optional[BBox] = None,
+        datetime: Optional[DateTimeType] = None,
+        limit: Optional[int] = 10,
+        token: Optional[str] = None,
+        intersects: Optional[Any] = None,
+        nested: bool = True,
+        projection: Optional[FieldsProjection] = None,
+        count_mode: Optional[CountMode] = None,
+    ) -> stac_types.ItemCollection:
+        limit = limit or 10
+        search = dict(
+            catalog_paths=catalog_paths,
+            collections=collections,
+            ids=ids,
+            bbox=bbox,
+            intersects=_geometry(intersects),
+            datetime=datetime,
+            nested=nested,
+        )
+        rows, next_token = self.store.search(**search, limit=limit, token=token)
+        item_collection = self._item_collection(
+            request, rows, next_token, limit, projection
+        )
+        if count_mode is None:
+            return item_collection
+        matched = self.store.count(**search, mode=count_mode)
+        return set_matched(item_collection, count_mode, matched)
+
+    def _post_search(
+        self,
+        request: Request,
+        search_request: Union[BaseSearchPostRequest, BaseCatalogSearchPostRequest],
+        catalog_paths: Optional[List[str]],
+        projection: Optional[FieldsProjection] = None,
+        count_mode: Optional[CountMode] = None,
+    ) -> stac_types.ItemCollection:
+        return self._search(
+            request,
+            catalog_paths=catalog_paths,
+            collections=search_request.collections,
+            ids=search_request.ids,
+            bbox=search_request.bbox,
+            datetime=search_request.datetime,
+            limit=search_request.limit,
+            token=getattr(search_request, "token", None),
+            intersects=search_request.intersects,
+            projection=projection,
+            count_mode=count_mode,
+        )
+
+    def _get_item(
+        self, request: Request, item_id: str, collection_id: str, catalog_path: str
+    ) -> stac_types.Item:
+        row = self.store.find(catalog_path, collection_id, item_id)
+        return self._features(request, [row])[0]
+
+    def _all_collections(self, request: Request) -> stac_types.Collections:
+        templates = LinkTemplates(get_base_url(request))
+        return stac_types.Collections(
+            collections=[
+                self._collection(templates, catalog_path, collection_id)
+                for catalog_path, collection_id in self.store.collections
+            ],
+            links=[],
+        )
+
+    def _all_catalogs(
+        self, request: Request, catalog_path: Optional[str]
+    ) -> stac_types.Catalogs:
+        templates = LinkTemplates(get_base_url(request))
+        prefix = f"{catalog_path.strip('/')}/" if catalog_path else ""
+        return stac_types.Catalogs(
+            catalogs=[
+                self._catalog(templates, path)
+                for path in self.store.catalogs
+                if path.startswith(prefix) and "/" not in path[len(prefix) :]
+            ],
+            links=[],
+        )
+
+    def _get_collection(
+        self, request: Request, catalog_path: str, collection_id: str
+    ) -> stac_types.Collection:
+        if (catalog_path, collection_id) not in self.store.collections:
+            raise NotFoundError(f"Collection {collection_id} not found")
+        return self._collection(
+            LinkTemplates(get_base_url(request)), catalog_path, collection_id
+        )
+
+    def _get_catalog(self, request: Request, catalog_path: str) -> stac_types.Catalog:
+        if catalog_path not in self.store.catalogs:
+            raise NotFoundError(f"Catalog {catalog_path} not found")
+        return self._catalog(LinkTemplates(get_base_url(request)), catalog_path)
+
+    def _get_catalog_collections(
+        self, request: Request, catalog_path: str
+    ) -> stac_types.Collections:
+        if catalog_path not in self.store.catalogs:
+            raise NotFoundError(f"Catalog {catalog_path} not found")
+        templates = LinkTemplates(get_base_url(request))
+        return stac_types.Collections(
+            collections=[
+                self._collection(templates, path, collection_id)
+                for path, collection_id in self.store.collections
+                if path == catalog_path
+            ],
+            links=[],
+        )
+
+    def _get_item_collection(
+        self,
+        request: Request,
+        catalog_path: str,
+        collection_id: str,
+        bbox: Optional[BBox],
+        datetime: Optional[DateTimeType],
+        limit: int,
+        token: Optional[str],
+    ) -> stac_types.ItemCollection:
+        if (catalog_path, collection_id) not in self.store.collections:
+            raise NotFoundError(f"Collection {collection_id} not found")
+        return self._search(
+            request,
+            catalog_paths=[catalog_path],
+            collections=[collection_id],
+            bbox=bbox,
+            datetime=datetime,
+            limit=limit,
+            token=token,
+            nested=False,
+        )
+
+
+@attr.s
+class InMemoryCoreClient(_InMemoryClient, BaseCoreClient):
+    """Core client serving the catalogs, collections and items of an `ItemStore`.
+
+    A dependency-free reference backend, e.g. to test or benchmark the framework.
+    Supports the `collections`, `ids`, `bbox`, `intersects`, `datetime`, `limit`
+    and `token` search parameters; other parameters are ignored. Searches apply
+    the `projection` of the fields extension and count matches in the
+    `count_mode` of the count extension.
+
+    Attributes:
+        store: the catalogs, collections and items served.
+    """
+
+    store: ItemStore = attr.ib(factory=ItemStore)
+
+    def post_global_search(
+        self, search_request: BaseSearchPostRequest, **kwargs
+    ) -> stac_types.ItemCollection:
+        """Cross catalog search (POST)."""
+        return self._post_search(
+            kwargs["request"],
+            search_request,
+            search_request.catalog_paths,
+            kwargs.get("projection"),
+            kwargs.get("count_mode"),
+        )
+
+    def get_global_search(
+        self,
+        catalog_paths: Optional[List[str]] = None,
+        collections: Optional[List[str]] = None,
+        ids: Optional[List[str]] = None,
+        bbox: Optional[BBox] = None,
+        datetime: Optional[DateTimeType] = None,
+        limit: Optional[int] = 10,
+        token: Optional[str] = None,
+        intersects: Optional[str] = None,
+        **kwargs,
+    ) -> stac_types.ItemCollection:
+        """Cross catalog search (GET)."""
+        return self._search(
+            kwargs["request"],
+            catalog_paths=catalog_paths,
+            collections=collections,
+            ids=ids,
+            bbox=bbox,
+            datetime=datetime,
+            limit=limit,
+            token=token,
+            intersects=intersects,
+            projection=kwargs.get("projection"),
+            count_mode=kwargs.get("count_mode"),
+        )
+
+    def post_search(
+        self, catalog_path: str, search_request: BaseCatalogSearchPostRequest, **kwargs
+    ) -> stac_types.ItemCollection:
+        """Single catalog item search (POST)."""
+        return self._post_search(
+            kwargs["request"],
+            search_request,
+            [catalog_path],
+            kwargs.get("projection"),
+            kwargs.get("count_mode"),
+        )
+
+    def get_search(
+        self,
+        catalog_path: str,
+        collections: Optional[List[str]] = None,
+        ids: Optional[List[str]] = None,
+        bbox: Optional[BBox] = None,
+        datetime: Optional[DateTimeType] = None,
+        limit: Optional[int] = 10,
+        token: Optional[str] = None,
+        intersects: Optional[str] = None,
+        **kwargs,
+    ) -> stac_types.ItemCollection:
+        """Single catalog item search (GET)."""
+        return self._search(
+            kwargs["request"],
+            catalog_paths=[catalog_path],
+            collections=collections,
+            ids=ids,
+            bbox=bbox,
+            datetime=datetime,
+            limit=limit,
+            token=token,
+            intersects=intersects,
+            projection=kwargs.get("projection"),
+            count_mode=kwargs.get("count_mode"),
+        )
+
+    def get_item(
+        self, item_id: str, collection_id: str, catalog_path: str, **kwargs
+    ) -> stac_types.Item:
+        """Get item by id."""
+        return self._get_item(kwargs["request"], item_id, collection_id, catalog_path)
+
+    def all_collections(self, **kwargs) -> stac_types.Collections:
+        """Get all collections."""
+        return self._all_collections(kwargs["request"])
+
+    def all_catalogs(
+        self, catalog_path: Optional[str] = None, **kwargs
+    ) -> stac_types.Catalogs:
+        """Get the top-level catalogs, or the sub-catalogs of `catalog_path`."""
+        return self._all_catalogs(kwargs["request"], catalog_path)
+
+    def get_collection(
+        self, catalog_path: str, collection_id: str, **kwargs
+    ) -> stac_types.Collection:
+        """Get collection by id."""
+        return self._get_collection(kwargs["request"], catalog_path, collection_id)
+
+    def get_catalog(self, catalog_path: str, **kwargs) -> stac_types.Catalog:
+        """Get catalog by path."""
+        return self._get_catalog(kwargs["request"], catalog_path)
+
+    def get_catalog_collections(
+        self, catalog_path: str, **kwargs
+    ) -> stac_types.Collections:
+        """Get the collections of a catalog."""
+        return self._get_catalog_collections(kwargs["request"], catalog_path)
+
+    def item_collection(
+        self,
+        collection_id: str,
+        bbox: Optional[BBox] = None,
+        datetime: Optional[DateTimeType] = None,
+        limit: int = 10,
+        token: str = None,
+        **kwargs,
+    ) -> stac_types.ItemCollection:
+        """Get the items of a collection."""
+        return self._get_item_collection(
+            kwargs["request"],
+            kwargs["catalog_path"],
+            collection_id,
+            bbox,
+            datetime,
+            limit,
+            token,
+        )
+
+
+@attr.s
+class AsyncInMemoryCoreClient(_InMemoryClient, AsyncBaseCoreClient):
+    """Asynchronous version of `InMemoryCoreClient`.
+
+    Attributes:
+        store: the catalogs, collections and items served.
+    """
+
+    store: ItemStore = attr.ib(factory=ItemStore)
+
+    async def post_global_search(
+        self, search_request: BaseSearchPostRequest, **kwargs
+    ) -> stac_types.ItemCollection:
+        """Cross catalog search (POST)."""
+        return self._post_search(
+            kwargs["request"],
+            search_request,
+            search_request.catalog_paths,
+            kwargs.get("projection"),
+            kwargs.get("count_mode"),
+        )
+
+    async def get_global_search(
+        self,
+        catalog_paths: Optional[List[str]] = None,
+        collections: Optional[List[str]] = None,
+        ids: Optional[List[str]] = None,
+        bbox: Optional[BBox] = None,
+        datetime: Optional[DateTimeType] = None,
+        limit: Optional[int] = 10,
+        token: Optional[str] = None,
+        intersects: Optional[str] = None,
+        **kwargs,
+    ) -> stac_types.ItemCollection:
+        """Cross catalog search (GET)."""
+        return self._search(
+            kwargs["request"],
+            catalog_paths=catalog_paths,
+            collections=collections,
+            ids=ids,
+            bbox=bbox,
+            datetime=datetime,
+            limit=limit,
+            token=token,
+            intersects=intersects,
+            projection=kwargs.get("projection"),
+            count_mode=kwargs.get("count_mode"),
+        )
+
+    async def post_search(
+        self, catalog_path: str, search_request: BaseCatalogSearchPostRequest, **kwargs
+    ) -> stac_types.ItemCollection:
+        """Single catalog item search (POST)."""
+        return self._post_search(
+            kwargs["request"],
+            search_request,
+            [catalog_path],
+            kwargs.get("projection"),
+            kwargs.get("count_mode"),
+        )
+
+    async def get_search(
+        self,
+        catalog_path: str,
+        collections: Optional[List[str]] = None,
+        ids: Optional[List[str]] = None,
+        bbox: Optional[BBox] = None,
+        datetime: Optional[DateTimeType] = None,
+        limit: Optional[int] = 10,
+        token: Optional[str] = None,
+        intersects: Optional[str] = None,
+        **kwargs,
+    ) -> stac_types.ItemCollection:
+        """Single catalog item search (GET)."""
+        return self._search(
+            kwargs["request"],
+            catalog_paths=[catalog_path],
+            collections=collections,
+            ids=ids,
+            bbox=bbox,
+            datetime=datetime,
+            limit=limit,
+            token=token,
+            intersects=intersects,
+            projection=kwargs.get("projection"),
+            count_mode=kwargs.get("count_mode"),
+        )
+
+    async def get_item(
+        self, item_id: str, collection_id: str, catalog_path: str, **kwargs
+    ) -> stac_types.Item:
+        """Get item by id."""
+        return self._get_item(kwargs["request"], item_id, collection_id, catalog_path)
+
+    async def all_collections(self, **kwargs) -> stac_types.Collections:
+        """Get all collections."""
+        return self._all_collections(kwargs["request"])
+
+    async def all_catalogs(
+        self, catalog_path: Optional[str] = None, **kwargs
+    ) -> stac_types.Catalogs:
+        """Get the top-level catalogs, or the sub-catalogs of `catalog_path`."""
+        return self._all_catalogs(kwargs["request"], catalog_path)
+
+    async def get_collection(
+        self, catalog_path: str, collection_id: str, **kwargs
+    ) -> stac_types.Collection:
+        """Get collection by id."""
+        return self._get_collection(kwargs["request"], catalog_path, collection_id)
+
+    async def get_catalog(self, catalog_path: str, **kwargs) -> stac_types.Catalog:
+        """Get catalog by path."""
+        return self._get_catalog(kwargs["request"], catalog_path)
+
+    async def get_catalog_collections(
+        self, catalog_path: str, **kwargs
+    ) -> stac_types.Collections:
+        """Get the collections of a catalog."""
+        return self._get_catalog_collections(kwargs["request"], catalog_path)
+
+    async def item_collection(
+        self,
+        collection_id: str,
+        bbox: Optional[BBox] = None,
+        datetime: Optional[DateTimeType] = None,
+        limit: int = 10,
+        token: str = None,
+        **kwargs,
+    ) -> stac_types.ItemCollection:
+        """Get the items of a collection."""
+        return self._get_item_collection(
+            kwargs["request"],
+            kwargs["catalog_path"],
+            collection_id,
+            bbox,
+            datetime,
+            limit,
+            token,
+        )
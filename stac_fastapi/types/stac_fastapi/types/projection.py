@@ -0,0 +1,244 @@
+"""Projection of items on the fields of the Fields extension.
+
+https://github.com/stac-api-extensions/fields
+"""
+
+import functools
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import attr
+
+# Tree of dotted paths: each key maps to a subtree, or to `True` for the whole value
+FieldTree = Dict[str, Union["FieldTree", bool]]
+
+
+def split_fields(fields: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+    """Split GET `fields` values, prefixed with `+`, `-` or nothing, in include and
+    exclude sets.
+    """
+    include, exclude = set(), set()
+    for field in fields:
+        if field.startswith("-"):
+            exclude.add(field[1:])
+        else:
+            include.add(field.lstrip("+"))
+    return include, exclude
+
+
+def _tree(paths: Iterable[str]) -> FieldTree:
+    tree: FieldTree = {}
+    # shorter paths first, so that a path covers the longer ones below it
+    for path in sorted(paths, key=lambda path: path.count(".")):
+        *parents, leaf = path.split(".")
+        node = tree
+        for key in parents:
+            child = node.setdefault(key, {})
+            if child is True:
+                break
+            node = child
+        else:
+            node[leaf] = True
+    return tree
+
+
+def _include(
+    value: Dict[str, Any], include: FieldTree, exclude: FieldTree
+) -> Dict[str, Any]:
+    projected = {}
+    for key, subtree in include.items():
+        if key not in value:
+            continue
+        child = value[key]
+        excluded = exclude.get(key)
+        if subtree is True:
+            if excluded is True:
+                continue
+            if excluded and isinstance(child, dict):
+                child = _exclude(child, excluded)
+        elif isinstance(child, dict):
+            # a more specific include overrides an exclude of the whole value
+            child = _include(
+                child, subtree, excluded if isinstance(excluded, dict) else {}
+            )
+        else:
+            continue
+        projected[key] = child
+    return projected
+
+
+def _exclude(value: Dict[str, Any], exclude: FieldTree) -> Dict[str, Any]:
+    projected = {}
+    for key, child in value.items():
+        excluded = exclude.get(key)
+        if excluded is True:
+            continue
+        if excluded and isinstance(child, dict):
+            child = _exclude(child, excluded)
+        projected[key] = child
+    return projected
+
+
+def _paths(tree: FieldTree, prefix: Tuple[str, ...] = ()) -> List[Tuple[str, ...]]:
+    paths = []
+    for key, subtree in tree.items():
+        if subtree is True:
+            paths.append(prefix + (key,))
+        else:
+            paths.extend(_paths(subtree, prefix + (key,)))
+    return paths
+
+
+def _pydantic_fields(tree: FieldTree) -> Dict[str, Any]:
+    return {
+        key: ... if subtree is True else _pydantic_fields(subtree)
+        for key, subtree in tree.items()
+    }
+
+
+def _pydantic_exclude(exclude: FieldTree, include: FieldTree) -> FieldTree:
+    # pydantic export lets excludes win, so drop those overridden by a more
+    # specific include
+    tree: FieldTree = {}
+    for key, excluded in exclude.items():
+        included = include.get(key)
+        if isinstance(included, dict):
+            if excluded is True:
+                continue
+            excluded = _pydantic_exclude(excluded, included)
+            if not excluded:
+                continue
+        tree[key] = excluded
+    return tree
+
+
+@attr.s(frozen=True)
+class FieldsProjection:
+    """Compiled include/exclude fields, projecting item dicts in one walk.
+
+    Fields are dotted paths of any depth. A field both included and excluded is
+    excluded, and otherwise the most specific path wins: excluding `properties` but
+    including `properties.datetime` keeps only the datetime of properties. Without
+    includes, every field not excluded is kept. `pydantic_fields` follow the same
+    rules.
+
+    Projected items are new dicts along the projected paths; other values are
+    shared with the original item.
+
+    Backends receiving a projection can limit what they fetch to `columns`, and
+    within them to `paths`.
+
+    Attributes:
+        include: included fields.
+        exclude: excluded fields.
+        columns: top level fields returned, or None when every field not in
+            `excluded_columns` is.
+        excluded_columns: top level fields never returned.
+        paths: included fields as tuples of keys, in order; empty when every field
+            not excluded is included.
+    """
+
+    include: FrozenSet[str] = attr.ib(converter=frozenset)
+    exclude: FrozenSet[str] = attr.ib(converter=frozenset)
+    include_tree: FieldTree = attr.ib(init=False, eq=False, repr=False)
+    exclude_tree: FieldTree = attr.ib(init=False, eq=False, repr=False)
+    columns: Optional[FrozenSet[str]] = attr.ib(init=False, eq=False, repr=False)
+    excluded_columns: FrozenSet[str] = attr.ib(init=False, eq=False, repr=False)
+    paths: Tuple[Tuple[str, ...], ...] = attr.ib(init=False, eq=False, repr=False)
+
+    def __attrs_post_init__(self):
+        """Build the include and exclude trees, and the fields to fetch."""
+        include_tree, exclude_tree = _tree(self.include), _tree(self.exclude)
+        object.__setattr__(self, "include_tree", include_tree)
+        object.__setattr__(self, "exclude_tree", exclude_tree)
+        columns = None
+        if include_tree:
+            columns = frozenset(key for key in include_tree if self.includes(key))
+        object.__setattr__(self, "columns", columns)
+        object.__setattr__(
+            self,
+            "excluded_columns",
+            frozenset(key for key in exclude_tree if not self.includes(key)),
+        )
+        paths = tuple(
+            path
+            for path in sorted(_paths(include_tree))
+            if self.includes(".".join(path))
+        )
+        object.__setattr__(self, "paths", paths)
+
+    def includes(self, field: str) -> bool:
+        """Whether a dotted field, or some part of it, is returned."""
+        include: Any = self.include_tree or None
+        exclude: Any = self.exclude_tree
+        for key in field.split("."):
+            if include is not None:
+                include = include.get(key)
+                if include is None:
+                    return False
+            exclude = exclude.get(key) if isinstance(exclude, dict) else None
+            if exclude is True and not isinstance(include, dict):
+                return False
+            if include is True:
+                # the whole value is included
+                include = None
+            if include is None and exclude is None:
+                return True
+        return True
+
+    def __call__(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Project an item."""
+        if self.include_tree:
+            return _include(item, self.include_tree, self.exclude_tree)
+        if self.exclude_tree:
+            return _exclude(item, self.exclude_tree)
+        return item
+
+    def project(self, items: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Project items."""
+        return map(self, items)
+
+    @property
+    def pydantic_fields(self) -> Dict[str, Any]:
+        """Include and exclude arguments of pydantic model export."""
+        return {
+            "include": _pydantic_fields(self.include_tree),
+            "exclude": _pydantic_fields(
+                _pydantic_exclude(self.exclude_tree, self.include_tree)
+            ),
+        }
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_fields(
+    include: FrozenSet[str], exclude: FrozenSet[str], default_includes: FrozenSet[str]
+) -> FieldsProjection:
+    return FieldsProjection((include - exclude) | default_includes, exclude)
+
+
+def compile_fields(
+    include: Optional[Iterable[str]] = None,
+    exclude: Optional[Iterable[str]] = None,
+    default_includes: Optional[Iterable[str]] = None,
+) -> FieldsProjection:
+    """Return the projection of include and exclude fields, cached per fields.
+
+    Args:
+        include: included fields.
+        exclude: excluded fields.
+        default_includes: fields always included, unless excluded.
+    """
+    return _compile_fields(
+        frozenset(field.strip() for field in include or () if field.strip()),
+        frozenset(field.strip() for field in exclude or () if field.strip()),
+        frozenset(default_includes or ()),
+    )
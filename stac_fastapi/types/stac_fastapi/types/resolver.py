@@ -0,0 +1,94 @@
+"""Catalog path resolution."""
+
+from typing import Any, Callable, List, Optional, Tuple
+
+import attr
+
+from stac_fastapi.types.cache import TTLCache
+
+_MISSING = object()
+
+
+def split_catalog_path(catalog_path: str) -> List[str]:
+    """Split a catalog path (e.g. `cat1/cat2/cat3`) into catalog ids."""
+    return [segment for segment in catalog_path.split("/") if segment]
+
+
+@attr.s
+class CatalogPathResolver:
+    """Resolve nested catalog paths to backend catalog handles.
+
+    Backends implement `lookup`, which resolves a single catalog id within its
+    parent (`None` for top-level catalogs) and raises `NotFoundError` if it does not
+    exist. Each resolved path prefix is kept in an LRU cache for `ttl` seconds, so
+    `cat1/cat2/cat3` costs one cache lookup once resolved, and resolving
+    `cat1/cat2/cat4` afterwards only looks up `cat4`.
+
+    When set as `catalog_resolver` on a core client, `StacApi` resolves the
+    `catalog_path` of each request and passes the handle to the client method as
+    the `resolved_catalog` keyword argument.
+
+    Attributes:
+        lookup: callable returning the handle of a catalog id within a parent handle.
+        ttl: time to live of a resolved path, in seconds. Disables caching when 0.
+        maxsize: maximum number of resolved paths kept.
+    """
+
+    lookup: Callable[[Optional[Any], str], Any] = attr.ib()
+    ttl: float = attr.ib(default=60)
+    maxsize: int = attr.ib(default=1024)
+    cache: TTLCache = attr.ib(init=False)
+
+    @cache.default
+    def _cache_factory(self) -> TTLCache:
+        return TTLCache(ttl=self.ttl, maxsize=self.maxsize)
+
+    def peek(self, catalog_path: str, default: Optional[Any] = None) -> Any:
+        """Return the cached handle of `catalog_path`, without resolving it."""
+        return self.cache.get("/".join(split_catalog_path(catalog_path)), default)
+
+    def _cached_prefix(self, segments: List[str]) -> Tuple[int, Optional[Any]]:
+        """Return the length and handle of the longest cached prefix of a path."""
+        for length in range(len(segments), 0, -1):
+            handle = self.cache.get("/".join(segments[:length]), _MISSING)
+            if handle is not _MISSING:
+                return length, handle
+        return 0, None
+
+    def resolve(self, catalog_path: str) -> Any:
+        """Resolve `catalog_path` to a catalog handle."""
+        segments = split_catalog_path(catalog_path)
+        length, handle = self._cached_prefix(segments)
+        for length in range(length + 1, len(segments) + 1):
+            handle = self.lookup(handle, segments[length - 1])
+            self.cache.set("/".join(segments[:length]), handle)
+        return handle
+
+    def invalidate(self, catalog_path: Optional[str] = None) -> None:
+        """Forget a resolved catalog path and all the paths nested under it.
+
+        Forgets every path when `catalog_path` is None.
+        """
+        if catalog_path is None:
+            self.cache.clear()
+            return
+        key = "/".join(split_catalog_path(catalog_path))
+        self.cache.prune(lambda path: path == key or path.startswith(key + "/"))
+
+
+@attr.s
+class AsyncCatalogPathResolver(CatalogPathResolver):
+    """Resolve nested catalog paths with an async `lookup`.
+
+    `lookup` is a coroutine function, with the same arguments as for
+    `CatalogPathResolver`.
+    """
+
+    async def resolve(self, catalog_path: str) -> Any:
+        """Resolve `catalog_path` to a catalog handle."""
+        segments = split_catalog_path(catalog_path)
+        length, handle = self._cached_prefix(segments)
+        for length in range(length + 1, len(segments) + 1):
+            handle = await self.lookup(handle, segments[length - 1])
+            self.cache.set("/".join(segments[:length]), handle)
+        return handle
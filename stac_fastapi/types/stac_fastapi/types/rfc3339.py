@@ -1,16 +1,33 @@
 """rfc3339."""
 
+import functools
+import importlib.util
 import re
-from datetime import datetime, timezone
-from typing import Optional, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
 
-import iso8601
 from pystac.utils import datetime_to_str
 
+# Test for numpy, used for `datetime64` arrays where available
+if importlib.util.find_spec("numpy") is not None:
+    import numpy as np
+else:
+    np = None
+
 RFC33339_PATTERN = (
     r"^(\d\d\d\d)\-(\d\d)\-(\d\d)(T|t)(\d\d):(\d\d):(\d\d)([.]\d+)?"
     r"(Z|([-+])(\d\d):(\d\d))$"
 )
+_RFC3339_REGEX = re.compile(RFC33339_PATTERN, re.IGNORECASE)
+
+# Fixed offset time zones, keyed by their RFC 3339 representation
+_TIMEZONES: Dict[str, timezone] = {"Z": timezone.utc}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Item properties holding datetimes
+DATETIME_PROPERTIES = ("datetime", "start_datetime", "end_datetime")
 
 DateTimeType = Union[
     datetime,
@@ -23,7 +40,9 @@ DateTimeType = Union[
 def rfc3339_str_to_datetime(s: str) -> datetime:
     """Convert a string conforming to RFC 3339 to a :class:`datetime.datetime`.
 
-    Uses :meth:`iso8601.parse_date` under the hood.
+    The string is checked against `RFC33339_PATTERN` and its date and time parsed
+    with :meth:`datetime.datetime.fromisoformat`. Fractional seconds are truncated
+    to microseconds, `Z` gives UTC and other offsets fixed offset time zones.
 
     Args:
         s (str) : The string to convert to :class:`datetime.datetime`.
@@ -34,18 +53,28 @@ def rfc3339_str_to_datetime(s: str) -> datetime:
     Raises:
         ValueError: If the string is not a valid RFC 3339 string.
     """
-    # Uppercase the string
-    s = s.upper()
-
     # Match against RFC3339 regex.
-    result = re.match(RFC33339_PATTERN, s)
+    result = _RFC3339_REGEX.match(s)
     if not result:
         raise ValueError("Invalid RFC3339 datetime.")
 
-    # Parse with pyiso8601
-    return iso8601.parse_date(s)
+    fraction, offset = result.group(8, 9)
+    return datetime.fromisoformat(s[:19]).replace(
+        microsecond=int(fraction[1:7].ljust(6, "0")) if fraction else 0,
+        tzinfo=_timezone(offset.upper()),
+    )
+
 
+def _timezone(offset: str) -> timezone:
+    tz = _TIMEZONES.get(offset)
+    if tz is None:
+        delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[4:6]))
+        tz = timezone(-delta if offset[0] == "-" else delta, offset)
+        _TIMEZONES[offset] = tz
+    return tz
 
+
+@functools.lru_cache(maxsize=1024)
 def str_to_interval(interval: Optional[str]) -> Optional[DateTimeType]:
     """Extract a tuple of datetimes from an interval string.
 
@@ -54,6 +83,9 @@ def str_to_interval(interval: Optional[str]) -> Optional[DateTimeType]:
     form '1985-04-12T23:20:50.52Z/1986-04-12T23:20:50.52Z', and allow either the start
     or end (but not both) to be open-ended with '..' or ''.
 
+    Parsed intervals are cached, since the same intervals tend to be requested over
+    and over.
+
     Args:
         interval (str or None): The interval string to convert to a tuple of
         datetime.datetime objects, or None if no datetime is specified.
@@ -103,3 +135,143 @@ def now_in_utc() -> datetime:
 def now_to_rfc3339_str() -> str:
     """Return an RFC 3339 string representing now."""
     return datetime_to_str(now_in_utc())
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _map_distinct(
+    func: Callable[[T], R], values: Iterable[Optional[T]]
+) -> List[Optional[R]]:
+    """Apply `func` once per distinct value, `None` values being kept."""
+    memo: Dict[T, R] = {}
+    results: List[Optional[R]] = []
+    for value in values:
+        if value is None:
+            results.append(None)
+            continue
+        result = memo.get(value)
+        if result is None:
+            result = memo[value] = func(value)
+        results.append(result)
+    return results
+
+
+def datetime_to_epoch_us(dt: datetime) -> int:
+    """Return the microseconds since the epoch of a datetime, naive meaning UTC."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // _MICROSECOND
+
+
+def epoch_us_to_datetime(us: int) -> datetime:
+    """Return the UTC datetime of a number of microseconds since the epoch."""
+    return EPOCH + timedelta(microseconds=us)
+
+
+def rfc3339_str_to_epoch_us(s: str) -> int:
+    """Convert a string conforming to RFC 3339 to microseconds since the epoch."""
+    return datetime_to_epoch_us(rfc3339_str_to_datetime(s))
+
+
+def rfc3339_strs_to_datetimes(
+    values: Iterable[Optional[str]],
+) -> List[Optional[datetime]]:
+    """Convert a sequence of RFC 3339 strings to datetimes.
+
+    Each distinct string is parsed once; `None` values are kept.
+
+    Raises:
+        ValueError: If a string is not a valid RFC 3339 string.
+    """
+    return _map_distinct(rfc3339_str_to_datetime, values)
+
+
+def datetimes_to_rfc3339_strs(
+    values: Iterable[Optional[datetime]],
+) -> List[Optional[str]]:
+    """Convert a sequence of datetimes to RFC 3339 strings, as `datetime_to_str`.
+
+    `None` values are kept.
+    """
+    # not memoized: datetimes in different time zones compare equal
+    return [None if dt is None else datetime_to_str(dt) for dt in values]
+
+
+def rfc3339_strs_to_epoch_us(values: Iterable[Optional[str]]) -> List[Optional[int]]:
+    """Convert a sequence of RFC 3339 strings to microseconds since the epoch.
+
+    Integers sort and compare much faster than strings or aware datetimes, which
+    makes them suited to sorting and range filtering whole pages of items.
+
+    Raises:
+        ValueError: If a string is not a valid RFC 3339 string.
+    """
+    return _map_distinct(rfc3339_str_to_epoch_us, values)
+
+
+def epoch_us_to_rfc3339_strs(values: Iterable[Optional[int]]) -> List[Optional[str]]:
+    """Convert a sequence of microseconds since the epoch to RFC 3339 UTC strings."""
+    return _map_distinct(lambda us: datetime_to_str(epoch_us_to_datetime(us)), values)
+
+
+def item_datetime_ranges(
+    properties: Iterable[Dict[str, Any]]
+) -> List[Tuple[Optional[int], Optional[int]]]:
+    """Return the temporal extent of items, as microseconds since the epoch.
+
+    The extent of an item is given by its `start_datetime` and `end_datetime`
+    properties, each defaulting to `datetime`. Strings shared by several items are
+    parsed once.
+
+    Args:
+        properties: the `properties` of each item.
+
+    Returns:
+        A `(start, end)` tuple per item, `None` standing for an open end.
+    """
+    ranges: List[Tuple[Optional[str], Optional[str]]] = [
+        (
+            props.get("start_datetime") or props.get("datetime"),
+            props.get("end_datetime") or props.get("datetime"),
+        )
+        for props in properties
+    ]
+    epochs = rfc3339_strs_to_epoch_us(
+        value for start_end in ranges for value in start_end
+    )
+    return list(zip(epochs[::2], epochs[1::2]))
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for datetime64 arrays")
+
+
+def rfc3339_strs_to_datetime64(values: Iterable[Optional[str]]) -> "np.ndarray":
+    """Convert a sequence of RFC 3339 strings to a UTC `datetime64[us]` array.
+
+    `None` values become `NaT`. Requires numpy.
+
+    Raises:
+        ValueError: If a string is not a valid RFC 3339 string.
+    """
+    _require_numpy()
+    nat = np.iinfo(np.int64).min
+    epochs = [nat if us is None else us for us in rfc3339_strs_to_epoch_us(values)]
+    return np.array(epochs, dtype=np.int64).view("datetime64[us]")
+
+
+def datetime64_to_rfc3339_strs(array: "np.ndarray") -> List[Optional[str]]:
+    """Convert a `datetime64` array, in UTC, to RFC 3339 strings.
+
+    `NaT` values become `None`. Requires numpy.
+    """
+    _require_numpy()
+    array = np.asarray(array).astype("datetime64[us]")
+    epochs = array.view(np.int64).tolist()
+    nat = np.isnat(array).tolist()
+    return epoch_us_to_rfc3339_strs(
+        None if missing else us for us, missing in zip(epochs, nat)
+    )
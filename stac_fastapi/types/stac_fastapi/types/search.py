@@ -22,7 +22,7 @@ from geojson_pydantic.geometries import (
     Polygon,
     _GeometryBase,
 )
-from pydantic import BaseModel, ConstrainedInt, Field, validator
+from pydantic import BaseModel, ConstrainedInt, Field, PrivateAttr, validator
 from pydantic.errors import NumberNotGtError
 from pydantic.validators import int_validator
 from stac_pydantic.api import Search
@@ -30,6 +30,7 @@ from stac_pydantic.shared import BBox
 from stac_pydantic.utils import AutoValueEnum
 
 from stac_fastapi.types.rfc3339 import DateTimeType, str_to_interval
+from stac_fastapi.types.spatial import SpatialPredicate, compile_spatial_filter
 
 # Be careful: https://github.com/samuelcolvin/pydantic/issues/1423#issuecomment-642797287
 NumType = Union[float, int]
@@ -85,6 +86,20 @@ def str2list(x: str) -> Optional[List]:
         return x.split(",")
 
 
+def _compiled_spatial_filter(search: BaseModel) -> Optional[SpatialPredicate]:
+    """Compile the spatial filter of a search, reused while `bbox` and `intersects`
+    are not reassigned."""
+    cached = search._spatial_predicate
+    if (
+        cached is None
+        or cached[0] is not search.bbox
+        or cached[1] is not search.intersects
+    ):
+        predicate = compile_spatial_filter(search.bbox, search.intersects)
+        cached = search._spatial_predicate = (search.bbox, search.intersects, predicate)
+    return cached[2]
+
+
 def str2bbox(x: str) -> Optional[BBox]:
     """Convert string to BBox based on , delimiter."""
     if x:
@@ -157,6 +172,7 @@ class BaseSearchPostRequest(Search):
     ]
     datetime: Optional[DateTimeType]
     limit: Optional[Limit] = Field(default=10)
+    _spatial_predicate: Optional[tuple] = PrivateAttr(default=None)
 
     @property
     def start_date(self) -> Optional[datetime]:
@@ -237,6 +253,11 @@ class BaseSearchPostRequest(Search):
             return self.intersects
         return
 
+    @property
+    def spatial_predicate(self) -> Optional[SpatialPredicate]:
+        """Return the spatial filter compiled for evaluation in Python, if any."""
+        return _compiled_spatial_filter(self)
+
 
 class BaseCatalogSearchPostRequest(Search):
     """Search model for searching items in a specific catalog (same as BaseSearchPostRequest excluding catalogs)."""
@@ -257,6 +278,7 @@ class BaseCatalogSearchPostRequest(Search):
     ] = None
     datetime: Optional[DateTimeType] = None
     limit: Optional[Limit] = 10
+    _spatial_predicate: Optional[tuple] = PrivateAttr(default=None)
 
     @property
     def start_date(self) -> Optional[datetime]:
@@ -337,6 +359,11 @@ class BaseCatalogSearchPostRequest(Search):
             return self.intersects
         return
 
+    @property
+    def spatial_predicate(self) -> Optional[SpatialPredicate]:
+        """Return the spatial filter compiled for evaluation in Python, if any."""
+        return _compiled_spatial_filter(self)
+
 
 @attr.s
 class CatalogSearchPostRequest(APIRequest):
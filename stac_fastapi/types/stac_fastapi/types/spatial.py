@@ -0,0 +1,350 @@
+"""Evaluation of `bbox` and `intersects` spatial filters.
+
+Geometries are compared in planar longitude/latitude coordinates. Boundaries are
+part of the geometries, so touching geometries intersect.
+"""
+
+import importlib.util
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import attr
+from pydantic import BaseModel
+
+# Test for numpy, used to filter arrays of bboxes where available
+if importlib.util.find_spec("numpy") is not None:
+    import numpy as np
+else:
+    np = None
+
+Coordinate = Tuple[float, float]
+Segment = Tuple[Coordinate, Coordinate]
+Ring = List[Coordinate]
+Envelope = Tuple[float, float, float, float]
+Geometry = Union[Dict[str, Any], BaseModel]
+
+
+def bbox_envelopes(bbox: Sequence[float]) -> Tuple[Envelope, ...]:
+    """Return the `(minx, miny, maxx, maxy)` envelopes covered by a STAC bbox.
+
+    A bbox whose west edge is east of its east edge crosses the antimeridian and
+    is split in two envelopes. 3D bboxes are flattened.
+    """
+    if len(bbox) == 6:
+        west, south, _, east, north, _ = bbox
+    else:
+        west, south, east, north = bbox
+    if west > east:
+        return ((west, south, 180.0, north), (-180.0, south, east, north))
+    return ((west, south, east, north),)
+
+
+def _envelopes_overlap(a: Envelope, b: Envelope) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _contains_envelope(outer: Envelope, inner: Envelope) -> bool:
+    return (
+        outer[0] <= inner[0]
+        and outer[1] <= inner[1]
+        and inner[2] <= outer[2]
+        and inner[3] <= outer[3]
+    )
+
+
+def _geometry_dict(geometry: Geometry) -> Dict[str, Any]:
+    if isinstance(geometry, BaseModel):
+        return geometry.dict(exclude_none=True)
+    return geometry
+
+
+@attr.s(frozen=True)
+class _Parts:
+    """Points, lines and polygons of a geometry, flattened."""
+
+    points: Tuple[Coordinate, ...] = attr.ib()
+    lines: Tuple[Tuple[Coordinate, ...], ...] = attr.ib()
+    polygons: Tuple[Tuple[Ring, ...], ...] = attr.ib()
+
+    @classmethod
+    def from_geometry(cls, geometry: Geometry) -> "_Parts":
+        """Flatten a GeoJSON geometry."""
+        points: List[Coordinate] = []
+        lines: List[Tuple[Coordinate, ...]] = []
+        polygons: List[Tuple[Ring, ...]] = []
+        _flatten(_geometry_dict(geometry), points, lines, polygons)
+        return cls(tuple(points), tuple(lines), tuple(polygons))
+
+    def vertices(self) -> Iterable[Coordinate]:
+        """Iterate all the coordinates."""
+        yield from self.points
+        for line in self.lines:
+            yield from line
+        for polygon in self.polygons:
+            for ring in polygon:
+                yield from ring
+
+    def segments(self) -> List[Segment]:
+        """Return the segments of the lines and polygon rings."""
+        segments = []
+        for path in [*self.lines, *(ring for p in self.polygons for ring in p)]:
+            segments.extend(zip(path, path[1:]))
+        return segments
+
+    def envelope(self) -> Optional[Envelope]:
+        """Return the envelope of the coordinates, or None if empty."""
+        xs, ys = [], []
+        for x, y in self.vertices():
+            xs.append(x)
+            ys.append(y)
+        if not xs:
+            return None
+        return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _coordinate(position: Sequence[float]) -> Coordinate:
+    return (float(position[0]), float(position[1]))
+
+
+def _flatten(geometry: Dict[str, Any], points, lines, polygons) -> None:
+    geometry_type = geometry["type"]
+    coordinates = geometry.get("coordinates")
+    if geometry_type == "Point":
+        points.append(_coordinate(coordinates))
+    elif geometry_type == "MultiPoint":
+        points.extend(_coordinate(c) for c in coordinates)
+    elif geometry_type == "LineString":
+        lines.append(tuple(_coordinate(c) for c in coordinates))
+    elif geometry_type == "MultiLineString":
+        lines.extend(tuple(_coordinate(c) for c in line) for line in coordinates)
+    elif geometry_type == "Polygon":
+        polygons.append(tuple([_coordinate(c) for c in ring] for ring in coordinates))
+    elif geometry_type == "MultiPolygon":
+        polygons.extend(
+            tuple([_coordinate(c) for c in ring] for ring in polygon)
+            for polygon in coordinates
+        )
+    elif geometry_type == "GeometryCollection":
+        for member in geometry["geometries"]:
+            _flatten(_geometry_dict(member), points, lines, polygons)
+    else:
+        raise ValueError(f"Unsupported geometry type {geometry_type}")
+
+
+def geometry_envelope(geometry: Geometry) -> Optional[Envelope]:
+    """Return the `(minx, miny, maxx, maxy)` envelope of a GeoJSON geometry."""
+    return _Parts.from_geometry(geometry).envelope()
+
+
+def _orientation(a: Coordinate, b: Coordinate, c: Coordinate) -> float:
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _on_segment(p: Coordinate, a: Coordinate, b: Coordinate) -> bool:
+    return (
+        _orientation(a, b, p) == 0
+        and min(a[0], b[0]) <= p[0] <= max(a[0], b[0])
+        and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+    )
+
+
+def _segments_intersect(s: Segment, t: Segment) -> bool:
+    (a, b), (c, d) = s, t
+    d1, d2 = _orientation(c, d, a), _orientation(c, d, b)
+    d3, d4 = _orientation(a, b, c), _orientation(a, b, d)
+    if ((d1 > 0 > d2) or (d1 < 0 < d2)) and ((d3 > 0 > d4) or (d3 < 0 < d4)):
+        return True
+    return (
+        _on_segment(a, c, d)
+        or _on_segment(b, c, d)
+        or _on_segment(c, a, b)
+        or _on_segment(d, a, b)
+    )
+
+
+def _in_ring(p: Coordinate, ring: Ring) -> Optional[bool]:
+    """Return whether `p` is inside `ring`, or None if on its boundary."""
+    x, y = p
+    inside = False
+    for a, b in zip(ring, ring[1:]):
+        if _on_segment(p, a, b):
+            return None
+        if (a[1] > y) != (b[1] > y):
+            if x < a[0] + (y - a[1]) * (b[0] - a[0]) / (b[1] - a[1]):
+                inside = not inside
+    return inside
+
+
+def _in_polygon(p: Coordinate, polygon: Tuple[Ring, ...]) -> bool:
+    """Return whether `p` is in `polygon`, boundary included."""
+    exterior, *holes = polygon
+    inside = _in_ring(p, exterior)
+    if inside is None:
+        return True
+    if not inside:
+        return False
+    for hole in holes:
+        in_hole = _in_ring(p, hole)
+        if in_hole is None:
+            return True
+        if in_hole:
+            return False
+    return True
+
+
+def _covers_point(parts: _Parts, p: Coordinate) -> bool:
+    return (
+        p in parts.points
+        or any(
+            _on_segment(p, a, b) for line in parts.lines for a, b in zip(line, line[1:])
+        )
+        or any(_in_polygon(p, polygon) for polygon in parts.polygons)
+    )
+
+
+def _bbox_polygon(envelope: Envelope) -> Dict[str, Any]:
+    minx, miny, maxx, maxy = envelope
+    return {
+        "type": "Polygon",
+        "coordinates": [
+            [[minx, miny], [maxx, miny], [maxx, maxy], [minx, maxy], [minx, miny]]
+        ],
+    }
+
+
+@attr.s(frozen=True)
+class SpatialPredicate:
+    """A spatial filter, compiled for repeated evaluation.
+
+    Items are first tested against the envelopes of the filter, then against its
+    exact geometry.
+
+    Attributes:
+        envelopes: envelopes of the filter, two for bboxes crossing the antimeridian.
+        rectangular: whether the filter is its envelopes (a `bbox` filter), so
+            that items within an envelope match without exact test.
+        parts: exact geometry of the filter, its envelopes if not given.
+    """
+
+    envelopes: Tuple[Envelope, ...] = attr.ib()
+    rectangular: bool = attr.ib(default=False)
+    _parts: _Parts = attr.ib(repr=False)
+    _segments: List[Segment] = attr.ib(init=False, repr=False, eq=False)
+
+    @_parts.default
+    def _parts_default(self) -> _Parts:
+        return _Parts.from_geometry(
+            {
+                "type": "GeometryCollection",
+                "geometries": [_bbox_polygon(e) for e in self.envelopes],
+            }
+        )
+
+    @_segments.default
+    def _segments_default(self) -> List[Segment]:
+        return self._parts.segments()
+
+    @classmethod
+    def from_bbox(cls, bbox: Sequence[float]) -> "SpatialPredicate":
+        """Compile a `bbox` filter."""
+        return cls(bbox_envelopes(bbox), rectangular=True)
+
+    @classmethod
+    def from_geometry(cls, geometry: Geometry) -> "SpatialPredicate":
+        """Compile an `intersects` filter."""
+        parts = _Parts.from_geometry(geometry)
+        envelope = parts.envelope()
+        return cls((envelope,) if envelope else (), parts=parts)
+
+    def intersects_bbox(self, bbox: Sequence[float]) -> bool:
+        """Whether an item bbox overlaps the envelopes of the filter."""
+        return any(
+            _envelopes_overlap(envelope, item_envelope)
+            for envelope in self.envelopes
+            for item_envelope in bbox_envelopes(bbox)
+        )
+
+    def intersects(
+        self, geometry: Optional[Geometry], bbox: Optional[Sequence[float]] = None
+    ) -> bool:
+        """Whether an item geometry intersects the filter.
+
+        Args:
+            geometry: the item geometry; items without geometry never match.
+            bbox: the item bbox, computed from `geometry` if not given.
+        """
+        if geometry is None:
+            return False
+        parts = _Parts.from_geometry(geometry)
+        item_envelopes = (
+            bbox_envelopes(bbox) if bbox is not None else (parts.envelope(),)
+        )
+        if item_envelopes == (None,):
+            return False
+        overlapping = [
+            envelope
+            for envelope in self.envelopes
+            if any(_envelopes_overlap(envelope, e) for e in item_envelopes)
+        ]
+        if not overlapping:
+            return False
+        if self.rectangular and any(
+            _contains_envelope(envelope, e)
+            for envelope in overlapping
+            for e in item_envelopes
+        ):
+            return True
+        return self._intersects_parts(parts)
+
+    def _intersects_parts(self, parts: _Parts) -> bool:
+        item_segments = parts.segments()
+        if any(
+            _segments_intersect(s, t) for s in self._segments for t in item_segments
+        ):
+            return True
+        if any(_covers_point(self._parts, p) for p in parts.vertices()):
+            return True
+        return any(_covers_point(parts, p) for p in self._parts.vertices())
+
+    def __call__(self, item: Dict[str, Any]) -> bool:
+        """Whether a STAC item matches the filter."""
+        return self.intersects(item.get("geometry"), item.get("bbox"))
+
+    def filter_bboxes(self, bboxes: Any) -> Any:
+        """Test many item bboxes against the envelopes of the filter at once.
+
+        Args:
+            bboxes: an `(n, 4)` array of `(minx, miny, maxx, maxy)` item bboxes, with
+                `minx > maxx` for bboxes crossing the antimeridian.
+
+        Returns:
+            An array of `n` booleans with numpy, a list otherwise.
+        """
+        if np is None:
+            return [self.intersects_bbox(bbox) for bbox in bboxes]
+        bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        minx, miny, maxx, maxy = bboxes.T
+        crossing = minx > maxx
+        result = np.zeros(len(bboxes), dtype=bool)
+        for qminx, qminy, qmaxx, qmaxy in self.envelopes:
+            overlap_x = np.where(
+                crossing,
+                (qmaxx >= minx) | (qminx <= maxx),
+                (minx <= qmaxx) & (qminx <= maxx),
+            )
+            result |= overlap_x & (miny <= qmaxy) & (qminy <= maxy)
+        return result
+
+
+def compile_spatial_filter(
+    bbox: Optional[Sequence[float]] = None, intersects: Optional[Geometry] = None
+) -> Optional[SpatialPredicate]:
+    """Compile the `bbox` or `intersects` parameter of a search.
+
+    Returns:
+        The predicate, or None if the search has no spatial filter.
+    """
+    if bbox:
+        return SpatialPredicate.from_bbox(bbox)
+    if intersects:
+        return SpatialPredicate.from_geometry(intersects)
+    return None
@@ -81,7 +81,8 @@ class ItemCollection(TypedDict, total=False):
     type: Literal["FeatureCollection"]
     features: List[Item]
     links: List[Dict[str, Any]]
-    context: Optional[Dict[str, int]]
+    numberMatched: int
+    context: Optional[Dict[str, Any]]
 
 
 class Collections(TypedDict, total=False):
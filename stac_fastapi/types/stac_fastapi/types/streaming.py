@@ -0,0 +1,32 @@
+"""Streaming response types."""
+
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, Union
+
+import attr
+
+from stac_fastapi.types.stac import Item
+
+
+@attr.s
+class StreamingItemCollection:
+    """An ItemCollection whose features are produced lazily.
+
+    Clients may return this from `item_collection` and the search methods instead of
+    a fully materialized `ItemCollection`. The API then writes the FeatureCollection
+    incrementally, so memory usage does not grow with the number of features.
+
+    Attributes:
+        features: iterable or async iterable of STAC items.
+        header: members written before `features` (e.g. `context`).
+        footer: members written after `features` (e.g. `links`). May be a callable
+            returning the members, in which case it is evaluated once every feature
+            has been written, e.g. to build a `next` link from the last item.
+    """
+
+    features: Union[Iterable[Item], AsyncIterable[Item]] = attr.ib()
+    header: Dict[str, Any] = attr.ib(factory=dict)
+    footer: Union[Dict[str, Any], Callable[[], Dict[str, Any]]] = attr.ib(factory=dict)
+
+    def get_footer(self) -> Dict[str, Any]:
+        """Return the footer members."""
+        return self.footer() if callable(self.footer) else self.footer
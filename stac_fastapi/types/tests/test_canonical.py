@@ -0,0 +1,127 @@
+import attr
+import pytest
+
+from stac_fastapi.types.canonical import canonical_search, search_hash
+from stac_fastapi.types.search import (
+    BaseCatalogSearchGetRequest,
+    BaseCatalogSearchPostRequest,
+    BaseSearchGetRequest,
+    BaseSearchPostRequest,
+    CatalogSearchPostRequest,
+)
+
+
+@attr.s
+class SearchGetRequest(BaseSearchGetRequest):
+    sortby: str = attr.ib(default=None)
+    fields: str = attr.ib(default=None)
+    query: str = attr.ib(default=None)
+
+
+def test_get_and_post_are_equivalent():
+    get = BaseSearchGetRequest(
+        collections="b,a",
+        ids="2,1,2",
+        bbox="-10,-5,10,5",
+        datetime="2020-01-01T01:00:00+01:00/..",
+        limit=5,
+    )
+    post = BaseSearchPostRequest(
+        collections=["a", "b"],
+        ids=["1", "2"],
+        bbox=[-10.0, -5.0, 10.0, 5.0],
+        datetime="2020-01-01T00:00:00Z/..",
+        limit=5,
+    )
+    assert canonical_search(get) == canonical_search(post)
+    assert canonical_search(get) == {
+        "collections": ["a", "b"],
+        "ids": ["1", "2"],
+        "bbox": [-10.0, -5.0, 10.0, 5.0],
+        "datetime": ["2020-01-01T00:00:00Z", ".."],
+        "limit": 5,
+    }
+    assert search_hash(get) == search_hash(post)
+
+
+def test_catalog_search_get_and_post_are_equivalent():
+    get = BaseCatalogSearchGetRequest(catalog_path="cat/sub", collections="a")
+    post = CatalogSearchPostRequest(
+        catalog_path="cat/sub",
+        search_request=BaseCatalogSearchPostRequest(collections=["a"]),
+    )
+    assert canonical_search(get) == {
+        "catalog_path": "cat/sub",
+        "collections": ["a"],
+        "limit": 10,
+    }
+    assert search_hash(get) == search_hash(post)
+
+
+def test_intersects():
+    geometry = {"type": "Point", "coordinates": [1, 2]}
+    post = BaseSearchPostRequest(intersects=geometry)
+    assert canonical_search(post)["intersects"] == {
+        "type": "Point",
+        "coordinates": [1.0, 2.0],
+    }
+    assert search_hash(post) == search_hash({"intersects": geometry, "limit": 10})
+
+
+def test_extensions():
+    get = SearchGetRequest(
+        sortby="-datetime,+id",
+        fields="id,-properties",
+        query='{"eo:cloud_cover":{"lt":10}}',
+    )
+    params = {
+        "limit": 10,
+        "sortby": [
+            {"field": "datetime", "direction": "desc"},
+            {"field": "id", "direction": "asc"},
+        ],
+        "fields": {"include": {"id"}, "exclude": {"properties"}},
+        "query": {"eo:cloud_cover": {"lt": 10}},
+    }
+    assert search_hash(get) == search_hash(params)
+    assert canonical_search(get)["sortby"] == [["datetime", "desc"], ["id", "asc"]]
+
+
+def test_sortby_order_is_significant():
+    assert search_hash({"sortby": "id,datetime"}) != search_hash(
+        {"sortby": "datetime,id"}
+    )
+
+
+def test_empty_parameters_are_dropped():
+    assert (
+        canonical_search(
+            {
+                "collections": [],
+                "fields": {"include": set(), "exclude": set()},
+                "ids": None,
+            }
+        )
+        == {}
+    )
+    assert canonical_search({"filter-lang": "cql2-json"}) == {}
+    assert canonical_search({"filter": {"op": "="}, "filter-lang": "cql2-json"}) == {
+        "filter": {"op": "="},
+        "filter_lang": "cql2-json",
+    }
+
+
+@pytest.mark.parametrize(
+    "first,second",
+    [
+        ({"limit": 10}, {"limit": 11}),
+        ({"collections": ["a"]}, {"ids": ["a"]}),
+        ({"token": "a"}, {"token": "b"}),
+    ],
+)
+def test_different_searches(first, second):
+    assert search_hash(first) != search_hash(second)
+
+
+def test_hash_is_128_bits():
+    assert len(search_hash({})) == 32
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from stac_fastapi.types.errors import InvalidQueryParameter
+from stac_fastapi.types.fanout import CatalogCursor, decode_token, encode_token
+from stac_fastapi.types.memory import AsyncInMemoryCoreClient, InMemoryCoreClient
+
+SORTBY = ["-datetime", "+id"]
+
+# datetimes repeat within and across catalogs, so that ids break ties
+CATALOGS = {
+    catalog: [
+        {
+            "id": f"{catalog}-{n:02d}",
+            "properties": {"datetime": f"2020-01-{n % 9 + 1:02d}T00:00:00Z"},
+        }
+        for n in range(size)
+    ]
+    for catalog, size in [("a", 13), ("b", 0), ("c/d", 7), ("e", 21)]
+}
+
+
+def _sorted(items):
+    items = sorted(items, key=lambda item: item["id"])
+    return sorted(items, key=lambda item: item["properties"]["datetime"], reverse=True)
+
+
+EXPECTED = [item["id"] for item in _sorted(sum(CATALOGS.values(), []))]
+
+
+def _page(catalog, limit, token):
+    """Sorted items of a catalog, paginated with offset tokens."""
+    offset = int(token or 0)
+    items = _sorted(CATALOGS[catalog])
+    end = offset + limit
+    return items[offset:end], str(end) if end < len(items) else None
+
+
+async def _async_page(catalog, limit, token):
+    await asyncio.sleep(0)
+    return _page(catalog, limit, token)
+
+
+def _search_all(fan_out_search, limit):
+    ids, token, pages = [], None, 0
+    while True:
+        features, token = fan_out_search(token)
+        assert len(features) <= limit
+        ids.extend(feature["id"] for feature in features)
+        pages += 1
+        if token is None:
+            return ids, pages
+
+
+@pytest.mark.parametrize("limit", [1, 4, 10, 41, 100])
+def test_fan_out_search(limit):
+    client = InMemoryCoreClient()
+    ids, pages = _search_all(
+        lambda token: client.fan_out_search(
+            _page, list(CATALOGS), limit=limit, token=token, sortby=SORTBY
+        ),
+        limit,
+    )
+    assert ids == EXPECTED
+    assert pages == max(1, -(-len(EXPECTED) // limit))
+
+
+@pytest.mark.parametrize("limit", [3, 50])
+def test_async_fan_out_search(limit):
+    client = AsyncInMemoryCoreClient()
+    sortby = [{"field": "properties.datetime", "direction": "desc"}, "id"]
+    ids, _ = _search_all(
+        lambda token: asyncio.run(
+            client.fan_out_search(
+                _async_page, list(CATALOGS), limit=limit, token=token, sortby=sortby
+            )
+        ),
+        limit,
+    )
+    assert ids == EXPECTED
+
+
+def test_deep_fan_out_search_pages_are_bounded():
+    # items of both catalogs interleave, so that pages only use up part of the
+    # sub-search pages
+    items = {
+        "even": [{"id": f"{2 * n:04d}", "properties": {}} for n in range(400)],
+        "odd": [{"id": f"{2 * n + 1:04d}", "properties": {}} for n in range(100)],
+    }
+    calls = []
+
+    def search(catalog, limit, token):
+        calls.append(limit)
+        offset = int(token or 0)
+        end = offset + limit
+        page = items[catalog][offset:end]
+        return page, str(end) if end < len(items[catalog]) else None
+
+    client = InMemoryCoreClient()
+    ids, token, pages = [], None, 0
+    while True:
+        calls.clear()
+        features, token = client.fan_out_search(
+            search, list(items), limit=5, token=token, sortby=["id"]
+        )
+        # at most the current and next page of each catalog are searched
+        assert calls and set(calls) == {5} and len(calls) <= 2 * len(items)
+        ids.extend(feature["id"] for feature in features)
+        pages += 1
+        if token is None:
+            break
+    assert ids == sorted(item["id"] for item in sum(items.values(), []))
+    assert pages == 100
+
+
+def test_fan_out_search_without_sortby():
+    client = InMemoryCoreClient()
+    features, token = client.fan_out_search(_page, ["c/d", "a"], limit=10)
+    assert [f["id"] for f in features] == [
+        item["id"] for item in _sorted(CATALOGS["c/d"]) + _sorted(CATALOGS["a"])[:3]
+    ]
+    assert decode_token(token, ["c/d", "a"]) == [CatalogCursor("a", None, 3)]
+    assert client.fan_out_search(_page, [], limit=10) == ([], None)
+
+
+def test_fan_out_search_errors():
+    async def failing(catalog, limit, token):
+        if catalog == "b":
+            raise ValueError(catalog)
+        await asyncio.sleep(10)
+
+    with pytest.raises(ValueError):
+        asyncio.run(AsyncInMemoryCoreClient().fan_out_search(failing, ["a", "b"]))
+
+
+def test_token():
+    cursors = [CatalogCursor("a/b", "x", 2), CatalogCursor("c")]
+    token = encode_token(cursors)
+    assert decode_token(token, ["c", "a/b"]) == cursors
+    assert encode_token([]) is None
+    for invalid in ["x", encode_token([CatalogCursor("other")]), token[:-2]]:
+        with pytest.raises(InvalidQueryParameter):
+            decode_token(invalid, ["c", "a/b"])
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from stac_fastapi.types.indexes import MAX_TIME, MIN_TIME, STRTree, TemporalIndex
+
+
+def _overlaps(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+@pytest.mark.parametrize("count", [0, 1, 15, 16, 17, 1000])
+def test_str_tree(count):
+    rng = random.Random(count)
+    envelopes = []
+    for _ in range(count):
+        x, y = rng.uniform(-180, 170), rng.uniform(-90, 80)
+        envelopes.append((x, y, x + rng.uniform(0, 10), y + rng.uniform(0, 10)))
+    tree = STRTree([(envelope, n) for n, envelope in enumerate(envelopes)])
+    assert len(tree) == count
+
+    for query in [(-180, -90, 180, 90), (0, 0, 20, 20), (-50, -50, -49, -49)]:
+        expected = [n for n, e in enumerate(envelopes) if _overlaps(e, query)]
+        assert sorted(tree.query(query)) == expected
+
+
+def test_str_tree_points():
+    tree = STRTree([((x, x, x, x), x) for x in range(100)], node_capacity=4)
+    assert sorted(tree.query((10, 10, 12, 12))) == [10, 11, 12]
+    assert tree.query((200, 200, 300, 300)) == []
+
+
+def test_temporal_index():
+    index = TemporalIndex(
+        [
+            ((0, 0), "instant"),
+            ((5, 100), "long"),
+            ((10, 20), "short"),
+            ((MIN_TIME, 3), "open start"),
+            ((50, MAX_TIME), "open end"),
+        ]
+    )
+    assert len(index) == 5
+    assert sorted(index.query(0, 0)) == ["instant", "open start"]
+    assert sorted(index.query(15, 15)) == ["long", "short"]
+    assert sorted(index.query(60, 70)) == ["long", "open end"]
+    assert sorted(index.query(101)) == ["open end"]
+    assert sorted(index.query(end=4)) == ["instant", "open start"]
+    assert len(index.query()) == 5
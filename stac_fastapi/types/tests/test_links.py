@@ -0,0 +1,72 @@
+import pytest
+
+from stac_fastapi.types.links import (
+    CatalogLinks,
+    CollectionLinks,
+    ItemLinks,
+    LinkTemplates,
+    resolve_features_links,
+    resolve_links,
+)
+
+BASE_URLS = ["http://testserver/", "http://testserver/api/v1/", "https://test:8080/"]
+CATALOG_PATHS = ["cat", "cat/sub", "cat/sub/subsub"]
+
+
+@pytest.mark.parametrize("base_url", BASE_URLS)
+@pytest.mark.parametrize("catalog_path", CATALOG_PATHS)
+def test_catalog_links(base_url, catalog_path):
+    templates = LinkTemplates(base_url)
+    assert (
+        templates.catalog_links(catalog_path)
+        == CatalogLinks(base_url, catalog_path).create_links()
+    )
+
+
+@pytest.mark.parametrize("base_url", BASE_URLS)
+@pytest.mark.parametrize("catalog_path", CATALOG_PATHS)
+def test_collection_links(base_url, catalog_path):
+    templates = LinkTemplates(base_url)
+    assert (
+        templates.collection_links(catalog_path, "col")
+        == CollectionLinks(catalog_path, "col", base_url).create_links()
+    )
+
+
+@pytest.mark.parametrize("base_url", BASE_URLS)
+def test_items_links(base_url):
+    items = [
+        (catalog_path, f"col_{n % 2}", f"item_{n}")
+        for catalog_path in CATALOG_PATHS
+        for n in range(4)
+    ]
+    assert LinkTemplates(base_url).items_links(items) == [
+        ItemLinks(catalog_path, collection_id, base_url, item_id).create_links()
+        for catalog_path, collection_id, item_id in items
+    ]
+    assert LinkTemplates(base_url).item_links(*items[0]) == (
+        ItemLinks(items[0][0], items[0][1], base_url, items[0][2]).create_links()
+    )
+
+
+def _stored_links(n: int):
+    return [
+        {"rel": "self", "href": f"http://stored/items/{n}"},
+        {"rel": "license", "href": "https://stored/license.html"},
+        {"rel": "derived_from", "href": f"other/{n % 2}"},
+        {"rel": "root", "href": "/"},
+        {"rel": "alternate", "href": "http://stored/alternate?f=html"},
+    ]
+
+
+@pytest.mark.parametrize("base_url", BASE_URLS)
+def test_resolve_features_links(base_url):
+    features = [{"id": n, "links": _stored_links(n)} for n in range(4)]
+    features.append({"id": "no-links"})
+    expected = [resolve_links(_stored_links(n), base_url) for n in range(4)]
+
+    links = [feature["links"] for feature in features[:-1]]
+    resolve_features_links(features, base_url)
+    assert [feature["links"] for feature in features[:-1]] == expected
+    assert all(a is b for a, b in zip(links, (f["links"] for f in features)))
+    assert features[-1] == {"id": "no-links"}
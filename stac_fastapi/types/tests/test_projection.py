@@ -0,0 +1,141 @@
+import pytest
+
+from stac_fastapi.types.projection import compile_fields, split_fields
+
+ITEM = {
+    "id": "item",
+    "type": "Feature",
+    "geometry": {"type": "Point", "coordinates": [0, 0]},
+    "properties": {
+        "datetime": "2020-01-01T00:00:00Z",
+        "eo:cloud_cover": 10,
+        "view": {"azimuth": 1, "incidence": {"min": 2, "max": 3}},
+    },
+    "assets": {"data": {"href": "data.tif"}, "thumbnail": {"href": "thumb.png"}},
+}
+
+
+@pytest.mark.parametrize(
+    "include,exclude,expected",
+    [
+        ([], [], ITEM),
+        (["id"], [], {"id": "item"}),
+        (
+            ["id", "properties.view.incidence.max", "assets.data.href"],
+            [],
+            {
+                "id": "item",
+                "properties": {"view": {"incidence": {"max": 3}}},
+                "assets": {"data": {"href": "data.tif"}},
+            },
+        ),
+        (
+            [],
+            ["geometry", "properties.view.incidence", "assets"],
+            {
+                "id": "item",
+                "type": "Feature",
+                "properties": {
+                    "datetime": "2020-01-01T00:00:00Z",
+                    "eo:cloud_cover": 10,
+                    "view": {"azimuth": 1},
+                },
+            },
+        ),
+        # the most specific path wins
+        (
+            ["properties"],
+            ["properties.view"],
+            {
+                "properties": {
+                    "datetime": "2020-01-01T00:00:00Z",
+                    "eo:cloud_cover": 10,
+                }
+            },
+        ),
+        (
+            ["properties.datetime", "id"],
+            ["properties"],
+            {"id": "item", "properties": {"datetime": "2020-01-01T00:00:00Z"}},
+        ),
+        # a field both included and excluded is excluded
+        (["id", "geometry"], ["geometry"], {"id": "item"}),
+        # a path covers the paths below it, missing fields are skipped
+        (
+            ["properties", "properties.view.azimuth", "missing.field"],
+            [],
+            {"properties": ITEM["properties"]},
+        ),
+        (["id.nested"], [], {}),
+    ],
+)
+def test_projection(include, exclude, expected):
+    assert compile_fields(include, exclude)(ITEM) == expected
+
+
+def test_default_includes():
+    projection = compile_fields(
+        ["assets.data"], ["id"], default_includes={"id", "type"}
+    )
+    assert projection(ITEM) == {
+        "type": "Feature",
+        "assets": {"data": ITEM["assets"]["data"]},
+    }
+    assert projection is compile_fields({"assets.data "}, {"id"}, ["type", "id"])
+
+
+def test_projection_shares_unprojected_values():
+    projected = compile_fields(["properties.view", "assets"])(ITEM)
+    assert projected["assets"] is ITEM["assets"]
+    assert projected["properties"] is not ITEM["properties"]
+    assert ITEM["properties"]["datetime"]
+
+
+def test_pydantic_fields():
+    projection = compile_fields(["id", "properties.view.incidence.max"], ["assets"])
+    assert projection.pydantic_fields == {
+        "include": {"id": ..., "properties": {"view": {"incidence": {"max": ...}}}},
+        "exclude": {"assets": ...},
+    }
+
+
+def test_pydantic_fields_most_specific_wins():
+    projection = compile_fields(["properties.a"], ["properties"])
+    assert projection.pydantic_fields == {
+        "include": {"properties": {"a": ...}},
+        "exclude": {},
+    }
+    assert projection({"properties": {"a": 1, "b": 2}}) == {"properties": {"a": 1}}
+
+
+def test_split_fields():
+    assert split_fields(["id", "+properties.datetime", "-assets"]) == (
+        {"id", "properties.datetime"},
+        {"assets"},
+    )
+
+
+def test_fetched_fields():
+    projection = compile_fields(
+        ["id", "properties.datetime", "properties.view.azimuth", "geometry"],
+        ["geometry", "properties.view"],
+        ["type"],
+    )
+    assert projection.columns == {"id", "properties", "type"}
+    assert projection.excluded_columns == {"geometry"}
+    assert projection.paths == (
+        ("id",),
+        ("properties", "datetime"),
+        ("properties", "view", "azimuth"),
+        ("type",),
+    )
+    assert projection.includes("properties.view")
+    assert not projection.includes("properties.eo:cloud_cover")
+    assert not projection.includes("geometry")
+
+    projection = compile_fields(exclude=["assets", "properties.view"])
+    assert projection.columns is None
+    assert projection.excluded_columns == {"assets"}
+    assert projection.paths == ()
+    assert projection.includes("properties.datetime")
+    assert not projection.includes("properties.view.azimuth")
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from stac_fastapi.types.errors import NotFoundError
+from stac_fastapi.types.resolver import AsyncCatalogPathResolver, CatalogPathResolver
+
+CATALOGS = {None: {"cat1": 1}, 1: {"cat2": 2, "cat3": 3}, 2: {"cat4": 4, "cat5": 5}}
+
+
+@pytest.fixture
+def lookups():
+    return []
+
+
+@pytest.fixture
+def resolver(lookups) -> CatalogPathResolver:
+    def lookup(parent, catalog_id):
+        lookups.append(catalog_id)
+        try:
+            return CATALOGS[parent][catalog_id]
+        except KeyError:
+            raise NotFoundError(catalog_id)
+
+    return CatalogPathResolver(lookup)
+
+
+def test_resolve_reuses_cached_prefixes(resolver, lookups):
+    assert resolver.resolve("cat1/cat2/cat4") == 4
+    assert lookups == ["cat1", "cat2", "cat4"]
+
+    assert resolver.resolve("/cat1/cat2/cat4/") == 4
+    assert resolver.resolve("cat1/cat2/cat5") == 5
+    assert resolver.resolve("cat1/cat3") == 3
+    assert lookups == ["cat1", "cat2", "cat4", "cat5", "cat3"]
+    assert resolver.peek("cat1/cat2") == 2
+
+
+def test_resolve_not_found(resolver, lookups):
+    with pytest.raises(NotFoundError):
+        resolver.resolve("cat1/missing/cat4")
+    with pytest.raises(NotFoundError):
+        resolver.resolve("cat1/missing")
+    assert lookups == ["cat1", "missing", "missing"]
+
+
+def test_invalidate_nested_paths(resolver, lookups):
+    resolver.resolve("cat1/cat2/cat4")
+    resolver.resolve("cat1/cat3")
+    resolver.invalidate("cat1/cat2")
+
+    assert resolver.peek("cat1/cat2/cat4") is None
+    assert resolver.peek("cat1/cat3") == 3
+    assert resolver.resolve("cat1/cat2/cat4") == 4
+    assert lookups == ["cat1", "cat2", "cat4", "cat3", "cat2", "cat4"]
+
+    resolver.invalidate()
+    assert len(resolver.cache) == 0
+
+
+def test_resolve_without_cache(lookups):
+    resolver = CatalogPathResolver(lambda parent, catalog_id: lookups.append(1), ttl=0)
+    resolver.resolve("cat1/cat2")
+    resolver.resolve("cat1/cat2")
+    assert len(lookups) == 4
+
+
+def test_async_resolver():
+    lookups = []
+
+    async def lookup(parent, catalog_id):
+        lookups.append(catalog_id)
+        return CATALOGS[parent][catalog_id]
+
+    resolver = AsyncCatalogPathResolver(lookup)
+    assert asyncio.run(resolver.resolve("cat1/cat2")) == 2
+    assert asyncio.run(resolver.resolve("cat1/cat2/cat5")) == 5
+    assert lookups == ["cat1", "cat2", "cat5"]
@@ -1,11 +1,20 @@
-from datetime import timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
 from stac_fastapi.types.rfc3339 import (
+    datetime64_to_rfc3339_strs,
+    datetime_to_epoch_us,
+    datetimes_to_rfc3339_strs,
+    epoch_us_to_datetime,
+    epoch_us_to_rfc3339_strs,
+    item_datetime_ranges,
     now_in_utc,
     now_to_rfc3339_str,
     rfc3339_str_to_datetime,
+    rfc3339_strs_to_datetime64,
+    rfc3339_strs_to_datetimes,
+    rfc3339_strs_to_epoch_us,
     str_to_interval,
 )
 
@@ -110,3 +119,109 @@ def test_str_to_interval_with_none():
     assert (
         str_to_interval(None) is None
     ), "str_to_interval should return None when input is None"
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        (
+            "2020-07-23T00:00:00.012345678Z",
+            datetime(2020, 7, 23, 0, 0, 0, 12345, tzinfo=timezone.utc),
+        ),
+        (
+            "1985-04-12t23:20:50.5z",
+            datetime(1985, 4, 12, 23, 20, 50, 500000, tzinfo=timezone.utc),
+        ),
+        (
+            "1937-01-01T12:00:27.87+01:00",
+            datetime(
+                1937, 1, 1, 12, 0, 27, 870000, tzinfo=timezone(timedelta(hours=1))
+            ),
+        ),
+        (
+            "1996-12-19T16:39:57-08:30",
+            datetime(
+                1996,
+                12,
+                19,
+                16,
+                39,
+                57,
+                tzinfo=timezone(-timedelta(hours=8, minutes=30)),
+            ),
+        ),
+    ],
+)
+def test_parse_str_to_datetime_values(test_input, expected):
+    parsed = rfc3339_str_to_datetime(test_input)
+    assert parsed == expected
+    assert parsed.utcoffset() == expected.utcoffset()
+    if parsed.utcoffset():
+        # fixed offsets are named after their representation
+        assert parsed.tzname() == test_input[-6:]
+    else:
+        assert parsed.tzinfo is timezone.utc
+
+
+def test_str_to_interval_is_cached():
+    interval = "1985-04-12T23:20:50.52Z/1986-04-12T23:20:50.52Z"
+    assert str_to_interval(interval) is str_to_interval(interval)
+
+
+def test_batch_conversions():
+    values = valid_datetimes + [None]
+    datetimes = rfc3339_strs_to_datetimes(values)
+    assert datetimes == [rfc3339_str_to_datetime(v) for v in valid_datetimes] + [None]
+
+    epochs = rfc3339_strs_to_epoch_us(values)
+    assert epochs[-1] is None
+    assert [epoch_us_to_datetime(us) for us in epochs[:-1]] == datetimes[:-1]
+    assert sorted(epochs[:-1]) == [
+        datetime_to_epoch_us(dt) for dt in sorted(datetimes[:-1])
+    ]
+
+    # formatting round trips, in UTC for epochs
+    assert rfc3339_strs_to_datetimes(datetimes_to_rfc3339_strs(datetimes)) == datetimes
+    assert rfc3339_strs_to_epoch_us(epoch_us_to_rfc3339_strs(epochs)) == epochs
+    assert epoch_us_to_rfc3339_strs([0]) == ["1970-01-01T00:00:00Z"]
+
+
+def test_batch_conversions_keep_offsets():
+    values = ["2020-01-01T01:00:00+01:00", "2020-01-01T00:00:00Z"]
+    assert datetimes_to_rfc3339_strs(rfc3339_strs_to_datetimes(values)) == values
+
+
+def test_batch_conversions_invalid():
+    with pytest.raises(ValueError):
+        rfc3339_strs_to_epoch_us(valid_datetimes + invalid_datetimes[:1])
+
+
+def test_item_datetime_ranges():
+    ranges = item_datetime_ranges(
+        [
+            {"datetime": "2020-01-01T00:00:00Z"},
+            {
+                "datetime": None,
+                "start_datetime": "2020-01-01T00:00:00Z",
+                "end_datetime": "2020-01-02T00:00:00Z",
+            },
+            {"datetime": None, "start_datetime": "2020-01-01T00:00:00Z"},
+        ]
+    )
+    start = datetime_to_epoch_us(datetime(2020, 1, 1, tzinfo=timezone.utc))
+    day = 24 * 3600 * 10**6
+    assert ranges == [(start, start), (start, start + day), (start, None)]
+
+
+def test_datetime64_conversions():
+    np = pytest.importorskip("numpy")
+    values = ["2020-01-01T00:00:00.5Z", None, "2020-01-01T01:00:00+01:00"]
+    array = rfc3339_strs_to_datetime64(values)
+    assert array.dtype == np.dtype("datetime64[us]")
+    assert np.isnat(array[1])
+    assert array[2] == np.datetime64("2020-01-01T00:00:00", "us")
+    assert datetime64_to_rfc3339_strs(array) == [
+        "2020-01-01T00:00:00.500000Z",
+        None,
+        "2020-01-01T00:00:00Z",
+    ]
@@ -0,0 +1,144 @@
+import pytest
+
+from stac_fastapi.types.search import BaseSearchPostRequest
+from stac_fastapi.types.spatial import (
+    SpatialPredicate,
+    bbox_envelopes,
+    compile_spatial_filter,
+)
+
+SQUARE = {
+    "type": "Polygon",
+    "coordinates": [[[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]],
+}
+SQUARE_WITH_HOLE = {
+    "type": "Polygon",
+    "coordinates": [
+        [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+        [[2, 2], [8, 2], [8, 8], [2, 8], [2, 2]],
+    ],
+}
+
+
+def _point(x, y):
+    return {"type": "Point", "coordinates": [x, y]}
+
+
+def _item(geometry, bbox=None):
+    return {"type": "Feature", "geometry": geometry, "bbox": bbox}
+
+
+def test_bbox_envelopes():
+    assert bbox_envelopes([0, 1, 2, 3]) == ((0, 1, 2, 3),)
+    assert bbox_envelopes([0, 1, -5, 2, 3, 5]) == ((0, 1, 2, 3),)
+    assert bbox_envelopes([170, -10, -170, 10]) == (
+        (170, -10, 180.0, 10),
+        (-180.0, -10, -170, 10),
+    )
+
+
+@pytest.mark.parametrize(
+    "geometry,expected",
+    [
+        (_point(5, 5), True),
+        (_point(10, 5), True),  # on the boundary
+        (_point(11, 5), False),
+        ({"type": "LineString", "coordinates": [[-5, 5], [15, 5]]}, True),
+        ({"type": "LineString", "coordinates": [[-5, 11], [15, 11]]}, False),
+        # diagonal line whose bbox overlaps the square, but not the line itself
+        ({"type": "LineString", "coordinates": [[-5, 9], [1, 15]]}, False),
+        ({"type": "MultiPoint", "coordinates": [[20, 20], [1, 1]]}, True),
+        (
+            {
+                "type": "Polygon",
+                "coordinates": [[[-1, -1], [11, -1], [11, 11], [-1, 11], [-1, -1]]],
+            },
+            True,
+        ),
+        (
+            {
+                "type": "GeometryCollection",
+                "geometries": [_point(20, 20), _point(3, 3)],
+            },
+            True,
+        ),
+        (None, False),
+    ],
+)
+def test_intersects(geometry, expected):
+    predicate = SpatialPredicate.from_geometry(SQUARE)
+    assert predicate.intersects(geometry) is expected
+    assert predicate(_item(geometry)) is expected
+
+
+def test_intersects_holes():
+    predicate = SpatialPredicate.from_geometry(SQUARE_WITH_HOLE)
+    assert not predicate.intersects(_point(5, 5))
+    assert predicate.intersects(_point(1, 1))
+    assert predicate.intersects(_point(2, 5))
+
+
+def test_bbox_prerejection():
+    predicate = SpatialPredicate.from_geometry(SQUARE)
+    # the item bbox is trusted, and does not overlap the square
+    assert not predicate.intersects(_point(5, 5), bbox=[20, 20, 30, 30])
+    assert predicate.intersects_bbox([5, 5, 20, 20])
+    assert not predicate.intersects_bbox([11, 11, 20, 20])
+
+
+def test_antimeridian_bbox():
+    predicate = compile_spatial_filter(bbox=[170, -10, -170, 10])
+    assert predicate.intersects(_point(175, 0))
+    assert predicate.intersects(_point(-175, 0))
+    assert not predicate.intersects(_point(0, 0))
+    assert predicate.intersects_bbox([-179, -1, -178, 1])
+    # item bbox crossing the antimeridian
+    assert predicate.intersects_bbox([179, -1, -179, 1])
+    assert not compile_spatial_filter(bbox=[0, 0, 10, 10]).intersects_bbox(
+        [179, -1, -179, 1]
+    )
+
+
+def test_filter_bboxes():
+    predicate = compile_spatial_filter(bbox=[170, -10, -170, 10])
+    bboxes = [
+        [175, 0, 176, 1],
+        [-176, 0, -175, 1],
+        [0, 0, 1, 1],
+        [179, 0, -179, 1],
+        [175, 20, 176, 21],
+    ]
+    expected = [True, True, False, True, False]
+    assert list(predicate.filter_bboxes(bboxes)) == expected
+
+
+def test_filter_bboxes_numpy():
+    np = pytest.importorskip("numpy")
+    predicate = compile_spatial_filter(intersects=SQUARE)
+    bboxes = np.array([[5, 5, 6, 6], [20, 20, 21, 21], [-179, 5, 1, 6]])
+    assert predicate.filter_bboxes(bboxes).tolist() == [True, False, True]
+
+
+def test_search_request_spatial_predicate():
+    assert BaseSearchPostRequest().spatial_predicate is None
+    search = BaseSearchPostRequest(intersects=SQUARE)
+    assert search.spatial_predicate(_item(_point(5, 5)))
+    search = BaseSearchPostRequest(bbox=[0, 0, 10, 10])
+    assert search.spatial_predicate.rectangular
+    assert not search.spatial_predicate(_item(_point(20, 20), [20, 20, 20, 20]))
+
+
+def test_search_request_spatial_predicate_cached():
+    search = BaseSearchPostRequest(bbox=[0, 0, 10, 10])
+    predicate = search.spatial_predicate
+    assert search.spatial_predicate is predicate
+    assert "_spatial_predicate" not in search.dict()
+    search.bbox = [20, 20, 30, 30]
+    assert search.spatial_predicate is not predicate
+    assert search.spatial_predicate(_item(_point(25, 25)))
+
+
+def test_predicate_without_parts():
+    predicate = SpatialPredicate(bbox_envelopes([0, 0, 10, 10]))
+    assert predicate(_item(_point(5, 5)))
+    assert not predicate(_item(_point(20, 20)))